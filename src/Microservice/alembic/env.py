@@ -23,10 +23,17 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from shared.database.dbContext import Base
-from shared.database.models import CrudExample  
+from shared.database.models import CrudExample, DatasetProfile, DimensionCube, DimensionCubeCell
+from shared.constants.constants import DATASET_TABLE_PREFIX
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Dataset tables and their indexes are created at runtime; autogenerate must not drop them
+    table_name = object.table.name if type_ == "index" else name
+    return not (reflected and str(table_name).startswith(DATASET_TABLE_PREFIX))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,6 +58,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -72,7 +80,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
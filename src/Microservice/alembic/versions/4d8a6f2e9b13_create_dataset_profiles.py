@@ -0,0 +1,39 @@
+"""Create the datasetProfiles table that stores mergeable dataset profiles
+
+Revision ID: 4d8a6f2e9b13
+Revises: 7e2b91c4d5a3
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d8a6f2e9b13'
+down_revision = '7e2b91c4d5a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "datasetProfiles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("options", sa.String(), nullable=False),
+        sa.Column("profile", sa.LargeBinary(), nullable=False),
+        sa.Column("total_records", sa.BigInteger(), nullable=False),
+        sa.Column("upload_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_datasetProfiles_id"), "datasetProfiles", ["id"], unique=False)
+    op.create_index(op.f("ix_datasetProfiles_name"), "datasetProfiles", ["name"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_datasetProfiles_name"), table_name="datasetProfiles")
+    op.drop_index(op.f("ix_datasetProfiles_id"), table_name="datasetProfiles")
+    op.drop_table("datasetProfiles")
@@ -0,0 +1,35 @@
+"""Index crudExamples on its keyset pagination key (created_at, id)
+
+Revision ID: 5f0d3b8c2e61
+Revises: b7c3e5a1d820
+Create Date: 2026-10-17 10:00:00.000000
+
+Cursor pages seek on the row (created_at, id), so created_at becomes NOT NULL:
+a NULL sort key would drop rows out of the row comparison. Existing NULLs are
+backfilled from updated_at, or the migration time when that is NULL too
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f0d3b8c2e61'
+down_revision = 'b7c3e5a1d820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('UPDATE "crudExamples" SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL')
+    op.alter_column(
+        "crudExamples", "created_at", existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text("now()"), nullable=False)
+    op.execute('CREATE INDEX IF NOT EXISTS "ix_crudExamples_created_at_id" ON "crudExamples" (created_at, id)')
+
+
+def downgrade() -> None:
+    op.drop_index("ix_crudExamples_created_at_id", table_name="crudExamples", if_exists=True)
+    op.alter_column(
+        "crudExamples", "created_at", existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text("now()"), nullable=True)
@@ -0,0 +1,42 @@
+"""Create the crudExamples table
+
+Revision ID: 7e2b91c4d5a3
+Revises:
+Create Date: 2026-10-17 08:00:00.000000
+
+The root of the migration history. Databases created earlier from an autogenerated
+"Initial migration" already have this table; mark them with
+`alembic stamp --purge 7e2b91c4d5a3` before upgrading
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2b91c4d5a3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crudExamples",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("isActive", sa.Boolean(), nullable=False),
+        sa.Column("status", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_crudExamples_id"), "crudExamples", ["id"], unique=False)
+    op.create_index(op.f("ix_crudExamples_name"), "crudExamples", ["name"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_crudExamples_name"), table_name="crudExamples")
+    op.drop_index(op.f("ix_crudExamples_id"), table_name="crudExamples")
+    op.drop_table("crudExamples")
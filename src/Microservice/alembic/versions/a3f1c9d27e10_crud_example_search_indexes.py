@@ -0,0 +1,44 @@
+"""Index crud example search with pg_trgm and a generated tsvector
+
+Revision ID: a3f1c9d27e10
+Revises: 5f0d3b8c2e61
+Create Date: 2026-10-17 11:00:00.000000
+
+Substring searches (name/description ILIKE '%term%') are served by trigram GIN
+indexes, relevance searches by a GIN index on a generated, weighted tsvector.
+The statements are idempotent so the revision also applies to a database whose
+tables were created by create_all
+
+"""
+from alembic import op
+
+from shared.constants.constants import CRUD_EXAMPLE_SEARCH_CONFIG
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c9d27e10'
+down_revision = '5f0d3b8c2e61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        'ALTER TABLE "crudExamples" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+        f"setweight(to_tsvector('{CRUD_EXAMPLE_SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{CRUD_EXAMPLE_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.execute('CREATE INDEX IF NOT EXISTS "ix_crudExamples_name_trgm" ON "crudExamples" USING gin (name gin_trgm_ops)')
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS "ix_crudExamples_description_trgm" ON "crudExamples" USING gin (description gin_trgm_ops)')
+    op.execute('CREATE INDEX IF NOT EXISTS "ix_crudExamples_search_vector" ON "crudExamples" USING gin (search_vector)')
+
+
+def downgrade() -> None:
+    op.drop_index("ix_crudExamples_search_vector", table_name="crudExamples", if_exists=True)
+    op.drop_index("ix_crudExamples_description_trgm", table_name="crudExamples", if_exists=True)
+    op.drop_index("ix_crudExamples_name_trgm", table_name="crudExamples", if_exists=True)
+    op.execute('ALTER TABLE "crudExamples" DROP COLUMN IF EXISTS search_vector')
+    # pg_trgm is left installed; other objects may depend on it
@@ -0,0 +1,58 @@
+"""Create the dimensionCubes and dimensionCubeCells tables
+
+Revision ID: b7c3e5a1d820
+Revises: 4d8a6f2e9b13
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e5a1d820'
+down_revision = '4d8a6f2e9b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dimensionCubes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("total_records", sa.BigInteger(), nullable=False),
+        sa.Column("upload_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_dimensionCubes_id"), "dimensionCubes", ["id"], unique=False)
+    op.create_index(op.f("ix_dimensionCubes_name"), "dimensionCubes", ["name"], unique=True)
+
+    op.create_table(
+        "dimensionCubeCells",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("cube_id", sa.Integer(), nullable=False),
+        sa.Column("offerName", sa.String(), nullable=False),
+        sa.Column("zone", sa.String(), nullable=False),
+        sa.Column("requestType", sa.String(), nullable=False),
+        sa.Column("mccmnc", sa.String(), nullable=False),
+        sa.Column("record_count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["cube_id"], ["dimensionCubes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cube_id", "offerName", "zone", "requestType", "mccmnc", name="uq_dimensionCubeCells_cell"),
+    )
+    op.create_index("ix_dimensionCubeCells_zone", "dimensionCubeCells", ["cube_id", "zone"], unique=False)
+    op.create_index("ix_dimensionCubeCells_requestType", "dimensionCubeCells", ["cube_id", "requestType"], unique=False)
+    op.create_index("ix_dimensionCubeCells_mccmnc", "dimensionCubeCells", ["cube_id", "mccmnc"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dimensionCubeCells_mccmnc", table_name="dimensionCubeCells")
+    op.drop_index("ix_dimensionCubeCells_requestType", table_name="dimensionCubeCells")
+    op.drop_index("ix_dimensionCubeCells_zone", table_name="dimensionCubeCells")
+    op.drop_table("dimensionCubeCells")
+    op.drop_index(op.f("ix_dimensionCubes_name"), table_name="dimensionCubes")
+    op.drop_index(op.f("ix_dimensionCubes_id"), table_name="dimensionCubes")
+    op.drop_table("dimensionCubes")
@@ -0,0 +1,26 @@
+"""Add the externalId natural key that crud example bulk upserts conflict on
+
+Revision ID: c52e8b4f1a07
+Revises: a3f1c9d27e10
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e8b4f1a07'
+down_revision = 'a3f1c9d27e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("crudExamples", sa.Column("externalId", sa.String(), nullable=True))
+    op.create_unique_constraint("uq_crudExamples_externalId", "crudExamples", ["externalId"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_crudExamples_externalId", "crudExamples", type_="unique")
+    op.drop_column("crudExamples", "externalId")
@@ -1,11 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from shared.utils import get_logger
 from app.repository.crud_example_repository import CrudExampleRepository
+from app.repository.keyset import InvalidCursorError
+from app.services.crud_example_cache import CrudExampleCache, get_crud_example_cache
 from app.services.crud_example_service import CrudExampleService
-from app.schemas.crudExample import CrudExampleResponse, CrudExampleCreate, CrudExampleUpdate
-from sqlalchemy.orm import Session
-from shared.database.dbContext import get_db
+from app.core.config import settings
+from app.schemas.crudExample import (
+    CrudExampleResponse, CrudExampleCreate, CrudExampleUpdate, CrudExampleBulkCreate, CrudExampleBulkUpsert,
+    CrudExampleBulkUpdate, CrudExampleBulkDelete, CrudExampleBulkResponse, CrudExampleCacheStats
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.database.dbContext import get_async_db
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -16,25 +23,74 @@ def get_crud_example_repository() -> CrudExampleRepository:
     return CrudExampleRepository()
 
 def get_crud_example_service(
-    crud_example_repository: CrudExampleRepository = Depends(get_crud_example_repository)
+    crud_example_repository: CrudExampleRepository = Depends(get_crud_example_repository),
+    cache: CrudExampleCache = Depends(get_crud_example_cache)
     ) -> CrudExampleService:
-    """Get CrudExampleService instance with injected repository"""
-    return CrudExampleService(crud_example_repository)
+    """Get CrudExampleService instance with injected repository and cache"""
+    return CrudExampleService(crud_example_repository, cache)
+
+# asyncpg binds at most 32767 parameters per statement; 5000 rows of the upsert's 6 columns stay below it
+BULK_BATCH_SIZE_QUERY = Query(None, ge=1, le=5000, description="Rows per statement, defaults to CRUD_BULK_BATCH_SIZE")
+
+def _check_bulk_size(count: int) -> None:
+    """Reject bulk requests above the configured item limit with 413"""
+    if count > settings.CRUD_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"A bulk request takes at most {settings.CRUD_BULK_MAX_ITEMS} items, got {count}")
 
 @router.get("/search", response_model=List[CrudExampleResponse])
 async def search_crud_examples(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of examples to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of examples to return"),
     isActive: Optional[bool] = Query(None, description="Filter by active status"),
     status: Optional[int] = Query(None, description="Filter by status code"),
     search: Optional[str] = Query(None, description="Filter by search term"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Continue after the page that returned this X-Next-Cursor"),
+    rank: bool = Query(False, description="Match search as words instead of a substring and order by relevance"),
+    db: AsyncSession = Depends(get_async_db),
     crud_example_service: CrudExampleService = Depends(get_crud_example_service)
 ):
     """
     Get all crud examples with optional filtering and pagination
+
+    Pages are read by keyset on (created_at, id) unless skip is given: the first page and every
+    cursor page set X-Next-Cursor while more rows follow, and stay fast however deep they go.
+    Relevance-ranked searches are paged by skip
     """
-    logger.info(f"Fetching crud examples: skip={skip}, limit={limit}, isActive={isActive}, status={status}, search={search}")
+    logger.info(f"Fetching crud examples: skip={skip}, limit={limit}, isActive={isActive}, status={status}, search={search}, cursor={cursor}, rank={rank}")
+    if rank:
+        if not search:
+            raise HTTPException(status_code=400, detail="rank requires a search term")
+        if cursor:
+            raise HTTPException(status_code=400, detail="Ranked searches are paged by skip, not cursor")
+        return await crud_example_service.search_crud_examples_ranked(
+            db=db,
+            search=search,
+            skip=skip,
+            limit=limit,
+            isActive=isActive,
+            status=status
+        )
+
+    if skip == 0:
+        try:
+            crud_examples, next_cursor = await crud_example_service.search_crud_examples_page(
+                db=db,
+                limit=limit,
+                cursor=cursor,
+                isActive=isActive,
+                status=status,
+                search=search
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return crud_examples
+
+    if cursor:
+        raise HTTPException(status_code=400, detail="skip and cursor cannot be combined")
     return await crud_example_service.search_crud_examples(
         db=db,
         skip=skip,
@@ -44,10 +100,19 @@ async def search_crud_examples(
         search=search
     )
 
+@router.get("/cache", response_model=CrudExampleCacheStats)
+async def get_crud_example_cache_stats(
+    cache: CrudExampleCache = Depends(get_crud_example_cache)
+):
+    """
+    Get hit ratio, eviction and invalidation counters of the crud example cache
+    """
+    return CrudExampleCacheStats(**cache.stats())
+
 @router.get("/{example_id}", response_model=CrudExampleResponse)
 async def get_crud_example_detail(
     example_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     crud_example_service: CrudExampleService = Depends(get_crud_example_service)
 ):
     """
@@ -68,34 +133,41 @@ async def get_crud_example_detail(
 @router.post("/", response_model=CrudExampleResponse, status_code=201)
 async def create_crud_example(
     example_data: CrudExampleCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     crud_example_service: CrudExampleService = Depends(get_crud_example_service)
 ):
     """
     Create a new crud example
     """
     logger.info(f"Creating new crud example: {example_data.name}")
-    return await crud_example_service.create_crud_example(
-        db=db,
-        crud_example_data=example_data
-    )
+    try:
+        return await crud_example_service.create_crud_example(
+            db=db,
+            crud_example_data=example_data
+        )
+    except IntegrityError as e:
+        # externalId is unique
+        raise HTTPException(status_code=409, detail=str(e.orig))
 
 @router.put("/", response_model=CrudExampleResponse)
 async def update_crud_example(
     example_id: int,
     example_data: CrudExampleUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     crud_example_service: CrudExampleService = Depends(get_crud_example_service)
 ):
     """
     Update an existing crud example
     """
     logger.info(f"Updating crud example: id={example_id}")
-    updated_example = await crud_example_service.update_crud_example(
-        db=db,
-        example_id=example_id,
-        crud_example_update=example_data
-    )
+    try:
+        updated_example = await crud_example_service.update_crud_example(
+            db=db,
+            example_id=example_id,
+            crud_example_update=example_data
+        )
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=str(e.orig))
     if not updated_example:
         logger.warning(f"Crud example not found for update: id={example_id}")
         raise HTTPException(status_code=400, detail="Crud example not found")
@@ -104,7 +176,7 @@ async def update_crud_example(
 @router.delete("/{example_id}", status_code=204)
 async def delete_crud_example(
     example_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     crud_example_service: CrudExampleService = Depends(get_crud_example_service)
 ):
     """
@@ -118,4 +190,86 @@ async def delete_crud_example(
     if not success:
         logger.warning(f"Crud example not found for deletion: id={example_id}")
         raise HTTPException(status_code=400, detail="Crud example not found")
-    return
\ No newline at end of file
+    return
+
+@router.post("/bulk", response_model=CrudExampleBulkResponse)
+async def bulk_create_crud_examples(
+    request: CrudExampleBulkCreate,
+    batch_size: Optional[int] = BULK_BATCH_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    crud_example_service: CrudExampleService = Depends(get_crud_example_service)
+):
+    """
+    Create many crud examples in one transaction, reporting each item's outcome
+    """
+    _check_bulk_size(len(request.items))
+    logger.info(f"Bulk creating crud examples: items={len(request.items)}, batch_size={batch_size}")
+    try:
+        return await crud_example_service.bulk_create_crud_examples(
+            db=db,
+            crud_examples_data=request.items,
+            batch_size=batch_size
+        )
+    except IntegrityError as e:
+        # An externalId taken by a concurrent request after the existence check
+        raise HTTPException(status_code=409, detail=str(e.orig))
+
+@router.put("/bulk", response_model=CrudExampleBulkResponse)
+async def bulk_upsert_crud_examples(
+    request: CrudExampleBulkUpsert,
+    batch_size: Optional[int] = BULK_BATCH_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    crud_example_service: CrudExampleService = Depends(get_crud_example_service)
+):
+    """
+    Insert crud examples or update the ones whose externalId exists, in one transaction
+    """
+    _check_bulk_size(len(request.items))
+    logger.info(f"Bulk upserting crud examples: items={len(request.items)}, batch_size={batch_size}")
+    return await crud_example_service.bulk_upsert_crud_examples(
+        db=db,
+        crud_examples_data=request.items,
+        batch_size=batch_size
+    )
+
+@router.patch("/bulk", response_model=CrudExampleBulkResponse)
+async def bulk_update_crud_examples(
+    request: CrudExampleBulkUpdate,
+    batch_size: Optional[int] = BULK_BATCH_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    crud_example_service: CrudExampleService = Depends(get_crud_example_service)
+):
+    """
+    Apply the same changes to many crud examples in one transaction
+    """
+    _check_bulk_size(len(request.ids))
+    logger.info(f"Bulk updating crud examples: ids={len(request.ids)}, batch_size={batch_size}")
+    try:
+        return await crud_example_service.bulk_update_crud_examples(
+            db=db,
+            example_ids=request.ids,
+            crud_example_update=request.changes,
+            batch_size=batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=str(e.orig))
+
+@router.post("/bulk/delete", response_model=CrudExampleBulkResponse)
+async def bulk_delete_crud_examples(
+    request: CrudExampleBulkDelete,
+    batch_size: Optional[int] = BULK_BATCH_SIZE_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+    crud_example_service: CrudExampleService = Depends(get_crud_example_service)
+):
+    """
+    Delete many crud examples in one transaction
+    """
+    _check_bulk_size(len(request.ids))
+    logger.info(f"Bulk deleting crud examples: ids={len(request.ids)}, batch_size={batch_size}")
+    return await crud_example_service.bulk_delete_crud_examples(
+        db=db,
+        example_ids=request.ids,
+        batch_size=batch_size
+    )
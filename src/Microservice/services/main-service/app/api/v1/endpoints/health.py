@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends
-from app.schemas.health import HealthResponse
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.config import settings
+from app.schemas.health import DatabasePoolStats, HealthResponse
 from app.services.health_service import HealthService
 
 router = APIRouter()
@@ -9,4 +11,13 @@ async def health_check(health_service: HealthService = Depends(HealthService)):
     """
     Health check endpoint
     """
-    return await health_service.get_health_status()
\ No newline at end of file
+    return await health_service.get_health_status()
+
+@router.get("/database/pool", response_model=List[DatabasePoolStats], include_in_schema=False)
+async def database_pool_stats(health_service: HealthService = Depends(HealthService)):
+    """
+    Internal endpoint with live connection pool statistics, enabled by ENABLE_METRICS
+    """
+    if not settings.ENABLE_METRICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return await health_service.get_database_pool_stats()
\ No newline at end of file
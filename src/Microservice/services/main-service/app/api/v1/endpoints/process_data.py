@@ -1,26 +1,419 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from fastapi.responses import PlainTextResponse
-from typing import Optional
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import nullcontext
+from typing import Dict, List, Literal, Optional, Tuple
 import os
-from shared.constants.constants import VALID_FILE_TYPES
+from sqlalchemy.orm import Session
+from shared.constants.constants import CUBE_DIMENSIONS, VALID_FILE_TYPES
+from shared.database.dbContext import get_db
 
-from app.services.handle_file_service import HandleFileService
+from app.schemas.dataSummary import DataSummaryCacheStats, DataSummaryJobResponse, DataSummaryOptions
+from app.schemas.dimensionCube import DimensionCubeSliceResponse
+from app.services.handle_file_service import HandleFileService, UploadTooLargeError
+from app.services.batch_profile_service import BatchInputError, BatchProfileService, file_type_of
+from app.services.columnar_reader import UnknownColumnsError
+from app.services.compressed_reader import DecompressionLimitError
+from app.services.excel_reader import EXCEL_FILE_TYPES, UnknownSheetsError
+from app.services.summary_renderers import SUMMARY_MEDIA_TYPES
+from app.services.summary_stream import STREAM_MEDIA_TYPES, SummaryStream
+from app.repository.dataset_profile_repository import DatasetProfileRepository
+from app.services.dataset_profile_service import DatasetProfileConflictError, DatasetProfileFormatError, DatasetProfileService
+from app.repository.dimension_cube_repository import DimensionCubeRepository
+from app.repository.dataset_table_repository import DatasetTableRepository
+from app.services.dataset_table_loader import (
+    DatasetTableConflictError,
+    DatasetTableLoader,
+    DatasetTableLoadError,
+    TableLoadStats,
+)
+from app.services.dimension_cube import DimensionCubeAccumulator
+from app.services.dimension_cube_service import DimensionCubeService
+from app.services.data_summary_cache import (
+    DataSummaryCache,
+    build_cache_key,
+    get_data_summary_cache,
+)
+from app.services.data_summary_job_service import (
+    DataSummaryJobManager,
+    DataSummaryJobQueueFullError,
+    get_data_summary_job_manager,
+)
 
 router = APIRouter()
 
-@router.post("/", response_class=PlainTextResponse)
+def get_batch_profile_service() -> BatchProfileService:
+    """Get BatchProfileService instance"""
+    return BatchProfileService()
+
+def get_dataset_profile_service() -> DatasetProfileService:
+    """Get DatasetProfileService instance with its repositories"""
+    return DatasetProfileService(DatasetProfileRepository(), DatasetTableRepository())
+
+def get_dimension_cube_service() -> DimensionCubeService:
+    """Get DimensionCubeService instance with its repository"""
+    return DimensionCubeService(DimensionCubeRepository())
+
+def get_data_summary_options(
+    mode: Literal["exact", "approximate", "sample"] = Query("exact", description="Exact statistics, fixed-memory sketches, or a quick preview from a sample"),
+    hll_precision: Optional[int] = Query(None, ge=4, le=18, description="HyperLogLog register bits (approximate mode)"),
+    top_k_capacity: Optional[int] = Query(None, ge=10, description="Space-Saving capacity (approximate mode)"),
+    tdigest_compression: Optional[int] = Query(None, ge=10, le=1000, description="t-digest compression (approximate mode)"),
+    sample_size: Optional[int] = Query(None, ge=100, le=1000000, description="Rows drawn at random beyond the head (sample mode)"),
+    infer_dtypes: Optional[bool] = Query(None, description="Read with inferred categorical, downcast and datetime dtypes"),
+    columns: Optional[List[str]] = Query(None, description="Only load and profile these columns"),
+    sheets: Optional[List[str]] = Query(None, description="Excel sheets to profile in parallel, or * for all"),
+) -> DataSummaryOptions:
+    """Build summary options from query parameters, falling back to configured defaults"""
+    overrides = {
+        "hll_precision": hll_precision,
+        "top_k_capacity": top_k_capacity,
+        "tdigest_compression": tdigest_compression,
+        "sample_size": sample_size,
+        "infer_dtypes": infer_dtypes,
+        "columns": columns,
+        "sheets": sheets,
+    }
+    return DataSummaryOptions(mode=mode, **{key: value for key, value in overrides.items() if value is not None})
+
+def validate_file_type(file: UploadFile, options: DataSummaryOptions) -> str:
+    """Return the upload's extension, rejecting unsupported file types and options"""
+    file_extension = file_type_of(file.filename)
+
+    if file_extension not in VALID_FILE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Only {', '.join(VALID_FILE_TYPES)} files are allowed")
+
+    if options.sheets and file_extension not in EXCEL_FILE_TYPES:
+        raise HTTPException(status_code=400, detail="The sheets option only applies to Excel files")
+
+    return file_extension
+
+async def render_dataset(
+    handleFileService: HandleFileService,
+    accumulator,
+    output_format: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Finish a dataset's cumulative (or a single upload's) profile and render it in the requested format"""
+    profile = await run_in_threadpool(accumulator.finalize)
+    data_summary = await run_in_threadpool(handleFileService.render_profile, profile, output_format)
+    return Response(data_summary, media_type=SUMMARY_MEDIA_TYPES[output_format], headers=headers)
+
+def load_headers(load_stats: TableLoadStats) -> Dict[str, str]:
+    """Report where an upload was bulk-loaded and how fast"""
+    return {
+        "X-Dataset-Table": load_stats.table,
+        "X-Dataset-Load-Rows": str(load_stats.rows),
+        "X-Dataset-Load-Seconds": f"{load_stats.seconds:.3f}",
+        "X-Dataset-Load-Rows-Per-Second": f"{load_stats.rows_per_second:.0f}",
+        "X-Dataset-Load-Bytes-Per-Second": f"{load_stats.bytes_per_second:.0f}",
+        "X-Dataset-Index-Seconds": f"{load_stats.index_seconds:.3f}",
+        "X-Dataset-Load-Coerced-Values": str(load_stats.coerced_values),
+    }
+
+async def spool_upload(handleFileService: HandleFileService, file: UploadFile, file_extension: str) -> Tuple[str, str]:
+    """Spool an upload to disk, rejecting it with 413 once it passes the size limit"""
+    try:
+        return await handleFileService.spool_upload(file, file_extension)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+def get_summary_format(
+    request: Request,
+    format: Optional[Literal["text", "json", "msgpack"]] = Query(None, description="Summary format; overrides the Accept header"),
+) -> str:
+    """Pick the summary format from the query parameter, then the Accept header, defaulting to text"""
+    if format is not None:
+        return format
+    accept = request.headers.get("accept", "")
+    if "application/json" in accept:
+        return "json"
+    if "application/msgpack" in accept or "application/x-msgpack" in accept:
+        return "msgpack"
+    return "text"
+
+SUMMARY_RESPONSES = {
+    200: {"content": {media_type: {} for media_type in SUMMARY_MEDIA_TYPES.values()}},
+}
+
+@router.post("/", response_class=PlainTextResponse, responses=SUMMARY_RESPONSES)
 async def process_data(
     file: UploadFile = File(...), 
-    handleFileService: HandleFileService = Depends(HandleFileService)
-) -> Optional[str]:
-    file_extension = os.path.splitext(file.filename)[1].lower()
+    options: DataSummaryOptions = Depends(get_data_summary_options),
+    output_format: str = Depends(get_summary_format),
+    dataset: Optional[str] = Query(None, min_length=1, max_length=200, description="Merge this upload into a named dataset profile and return its cumulative summary"),
+    cube: Optional[str] = Query(None, min_length=1, max_length=200, description="Also add this upload's record counts per known dimension to a named dimension cube"),
+    load: bool = Query(False, description="Also bulk-load the upload's rows into the dataset's Postgres table with COPY"),
+    stream: Optional[Literal["text", "sse"]] = Query(None, description="Stream the preview, progress and each section as they are ready, as chunked text or Server-Sent Events"),
+    handleFileService: HandleFileService = Depends(HandleFileService),
+    datasetProfileService: DatasetProfileService = Depends(get_dataset_profile_service),
+    dimensionCubeService: DimensionCubeService = Depends(get_dimension_cube_service),
+    job_manager: DataSummaryJobManager = Depends(get_data_summary_job_manager),
+    cache: DataSummaryCache = Depends(get_data_summary_cache),
+    db: Session = Depends(get_db)
+) -> Response:
+    file_extension = validate_file_type(file, options)
+    if (dataset or cube) and options.sheets:
+        raise HTTPException(status_code=400, detail="The sheets option cannot be combined with a dataset or cube")
+    if (dataset or cube) and options.mode == "sample":
+        raise HTTPException(status_code=400, detail="Sample mode cannot be combined with a dataset or cube")
+    if load and not dataset:
+        raise HTTPException(status_code=400, detail="The load option requires a dataset")
+    if stream and (dataset or cube or options.sheets or options.mode == "sample"):
+        raise HTTPException(status_code=400, detail="Streaming only applies to a single-sheet exact or approximate summary")
+    path, content_digest = await spool_upload(handleFileService, file, file_extension)
+    headers = {}
 
-    if file_extension not in VALID_FILE_TYPES:
-        raise HTTPException(status_code=400, detail="Only .csv, .xlsx, .xls files are allowed")
+    if stream:
+        # The stream owns the spooled file from here on, and bypasses the cache
+        summary_stream = SummaryStream(path, file_extension, options, stream, job_manager)
+        summary_stream.start()
+        return StreamingResponse(
+            summary_stream.iterate(),
+            media_type=STREAM_MEDIA_TYPES[stream],
+            # Ask proxies such as nginx to pass each piece on instead of buffering the response
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
-    data_summary = await handleFileService.generate_data_summary(file, file_extension)
+    if dataset or cube:
+        # Uploads with side effects are always profiled, never answered from the cache
+        dimension_cube = DimensionCubeAccumulator() if cube else None
+        table_loader = DatasetTableLoader(db, dataset) if load else None
+        try:
+            if load:
+                # Rows are committed by the load, so an incompatible dataset must be rejected first
+                await datasetProfileService.ensure_compatible(db, dataset, options)
+            increment = await run_in_threadpool(
+                handleFileService.build_data_accumulator, path, file_extension, options,
+                table_loader=table_loader, cube=dimension_cube)
+            if table_loader is not None:
+                headers.update(load_headers(await run_in_threadpool(table_loader.finish)))
+            # Merge the dataset first so a conflicting upload is rejected before the cube counts it
+            merged = await datasetProfileService.append_to_dataset(db, dataset, increment, options) if dataset else increment
+            if cube:
+                await dimensionCubeService.append_to_cube(db, cube, dimension_cube)
+        except UnknownColumnsError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except DatasetTableLoadError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except DecompressionLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except (DatasetProfileConflictError, DatasetTableConflictError) as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        finally:
+            os.remove(path)
+        return await render_dataset(handleFileService, merged, output_format, headers)
+
+    try:
+        cache_key = None
+        if cache.enabled:
+            cache_key = build_cache_key(content_digest, file_extension, options, output_format)
+            data_summary = await run_in_threadpool(cache.get, cache_key)
+            headers["X-Data-Summary-Cache-Key"] = cache_key
+            headers["X-Data-Summary-Cache"] = "hit" if data_summary is not None else "miss"
+            if data_summary is not None:
+                return Response(data_summary, media_type=SUMMARY_MEDIA_TYPES[output_format], headers=headers)
+
+        try:
+            # Sheets become pool tasks, so they wait for a job slot like a background job would
+            async with job_manager.slot() if options.sheets else nullcontext() as executor:
+                data_summary = await handleFileService.summarize_path(
+                    path, file_extension, options, executor=executor, output_format=output_format)
+        except (UnknownColumnsError, UnknownSheetsError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except DecompressionLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        os.remove(path)
 
     if data_summary is None:
         raise HTTPException(status_code=400, detail="Error occurred while generating data summary")
 
-    return data_summary
+    if cache_key is not None:
+        await run_in_threadpool(cache.put, cache_key, data_summary)
+
+    return Response(data_summary, media_type=SUMMARY_MEDIA_TYPES[output_format], headers=headers)
+
+
+@router.post("/batch", response_class=PlainTextResponse, responses=SUMMARY_RESPONSES)
+async def process_data_batch(
+    files: List[UploadFile] = File(...),
+    options: DataSummaryOptions = Depends(get_data_summary_options),
+    output_format: str = Depends(get_summary_format),
+    batchProfileService: BatchProfileService = Depends(get_batch_profile_service),
+    job_manager: DataSummaryJobManager = Depends(get_data_summary_job_manager)
+) -> Response:
+    """
+    Profile several files, or the members of one .zip/.tar archive, in parallel on the worker pool
+    """
+    if options.sheets:
+        raise HTTPException(status_code=400, detail="The sheets option is not supported for batches")
+    if options.mode == "sample":
+        raise HTTPException(status_code=400, detail="Sample mode is not supported for batches")
+
+    try:
+        data_summary = await batchProfileService.summarize_batch(
+            files, options, job_manager=job_manager, output_format=output_format)
+    except (BatchInputError, UnknownColumnsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (UploadTooLargeError, DecompressionLimitError) as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    return Response(data_summary, media_type=SUMMARY_MEDIA_TYPES[output_format])
+
+
+@router.post("/jobs", response_model=DataSummaryJobResponse, status_code=202)
+async def create_data_summary_job(
+    file: UploadFile = File(...),
+    options: DataSummaryOptions = Depends(get_data_summary_options),
+    handleFileService: HandleFileService = Depends(HandleFileService),
+    job_manager: DataSummaryJobManager = Depends(get_data_summary_job_manager),
+    cache: DataSummaryCache = Depends(get_data_summary_cache)
+):
+    """
+    Queue a data summary to run in the background process pool
+    """
+    file_extension = validate_file_type(file, options)
+    path, content_digest = await spool_upload(handleFileService, file, file_extension)
+
+    cache_key = None
+    if cache.enabled:
+        cache_key = build_cache_key(content_digest, file_extension, options)
+        data_summary = await run_in_threadpool(cache.get, cache_key)
+        if data_summary is not None:
+            os.remove(path)
+            job = job_manager.record_cached(
+                file_extension, file.filename, options, cache_key, data_summary.decode("utf-8"))
+            return DataSummaryJobResponse.model_validate(job)
+
+    try:
+        job = job_manager.submit(path, file_extension, file.filename, options, cache_key=cache_key)
+    except DataSummaryJobQueueFullError as e:
+        os.remove(path)
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return DataSummaryJobResponse.model_validate(job)
+
+@router.get("/jobs/{job_id}", response_model=DataSummaryJobResponse)
+async def get_data_summary_job(
+    job_id: str,
+    job_manager: DataSummaryJobManager = Depends(get_data_summary_job_manager)
+):
+    """
+    Get the status of a data summary job, including its result once completed
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Data summary job not found")
+    return DataSummaryJobResponse.model_validate(job)
+
+@router.delete("/jobs/{job_id}", response_model=DataSummaryJobResponse)
+async def cancel_data_summary_job(
+    job_id: str,
+    job_manager: DataSummaryJobManager = Depends(get_data_summary_job_manager)
+):
+    """
+    Cancel a queued or running data summary job
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Data summary job not found")
+    return DataSummaryJobResponse.model_validate(job)
+
+@router.get("/cache", response_model=DataSummaryCacheStats)
+async def get_data_summary_cache_stats(
+    cache: DataSummaryCache = Depends(get_data_summary_cache)
+):
+    """
+    Get hit and miss counters and the size of the data summary cache
+    """
+    return DataSummaryCacheStats(**cache.stats())
+
+@router.delete("/cache", status_code=204)
+async def clear_data_summary_cache(
+    cache: DataSummaryCache = Depends(get_data_summary_cache)
+):
+    """
+    Remove every cached data summary
+    """
+    await run_in_threadpool(cache.clear)
+
+@router.delete("/cache/{cache_key}", status_code=204)
+async def purge_data_summary_cache_entry(
+    cache_key: str,
+    cache: DataSummaryCache = Depends(get_data_summary_cache)
+):
+    """
+    Remove one cached data summary by its key
+    """
+    if not await run_in_threadpool(cache.purge, cache_key):
+        raise HTTPException(status_code=404, detail="Data summary cache entry not found")
+
+@router.get("/datasets/{name}", response_class=PlainTextResponse, responses=SUMMARY_RESPONSES)
+async def get_dataset_summary(
+    name: str,
+    output_format: str = Depends(get_summary_format),
+    handleFileService: HandleFileService = Depends(HandleFileService),
+    datasetProfileService: DatasetProfileService = Depends(get_dataset_profile_service),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Get the cumulative summary of every upload merged into a dataset
+    """
+    try:
+        accumulator = await datasetProfileService.get_dataset_profile(db, name)
+    except DatasetProfileFormatError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if accumulator is None:
+        raise HTTPException(status_code=404, detail="Dataset profile not found")
+    return await render_dataset(handleFileService, accumulator, output_format)
+
+@router.delete("/datasets/{name}", status_code=204)
+async def delete_dataset_profile(
+    name: str,
+    datasetProfileService: DatasetProfileService = Depends(get_dataset_profile_service),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a dataset's cumulative profile and the table its rows were loaded into
+    """
+    if not await datasetProfileService.delete_dataset_profile(db, name):
+        raise HTTPException(status_code=404, detail="Dataset profile not found")
+
+@router.get("/cubes/{name}", response_model=DimensionCubeSliceResponse)
+async def slice_dimension_cube(
+    name: str,
+    group_by: List[str] = Query(..., description=f"Dimensions to group counts by: {', '.join(CUBE_DIMENSIONS)}"),
+    offerName: Optional[List[str]] = Query(None, description="Only count these offer names"),
+    zone: Optional[List[str]] = Query(None, description="Only count these zones"),
+    requestType: Optional[List[str]] = Query(None, description="Only count these request types"),
+    mccmnc: Optional[List[str]] = Query(None, description="Only count these MCC/MNC codes"),
+    limit: int = Query(1000, ge=1, le=100000, description="Maximum number of groups returned, largest first"),
+    dimensionCubeService: DimensionCubeService = Depends(get_dimension_cube_service),
+    db: Session = Depends(get_db)
+):
+    """
+    Slice a dimension cube: record counts grouped by some dimensions and filtered on others
+    """
+    unknown = [dimension for dimension in group_by if dimension not in CUBE_DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dimensions: {unknown}")
+    selected = {"offerName": offerName, "zone": zone, "requestType": requestType, "mccmnc": mccmnc}
+    filters = {dimension: values for dimension, values in selected.items() if values}
+
+    cube_slice = await dimensionCubeService.slice_cube(db, name, list(dict.fromkeys(group_by)), filters, limit)
+    if cube_slice is None:
+        raise HTTPException(status_code=404, detail="Dimension cube not found")
+    return cube_slice
+
+@router.delete("/cubes/{name}", status_code=204)
+async def delete_dimension_cube(
+    name: str,
+    dimensionCubeService: DimensionCubeService = Depends(get_dimension_cube_service),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a dimension cube and all of its cells
+    """
+    if not await dimensionCubeService.delete_dimension_cube(db, name):
+        raise HTTPException(status_code=404, detail="Dimension cube not found")
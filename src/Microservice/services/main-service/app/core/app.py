@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.upload_limit import MaxUploadSizeMiddleware
 from app.api.v1.route import api_router
 
 def create_application(lifespan=None) -> FastAPI:
@@ -26,6 +27,13 @@ def create_application(lifespan=None) -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Refuse oversized data uploads before they are written to disk
+    application.add_middleware(
+        MaxUploadSizeMiddleware,
+        max_bytes=settings.MAX_UPLOAD_BYTES,
+        path_prefix=f"{settings.API_V1_STR}/process-data",
+    )
+    
     # Include API routes
     application.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -23,11 +23,70 @@ class Settings(BaseSettings):
     
     # Database configuration (if needed later)
     DATABASE_URL: Optional[str] = None
+    # Connection pool, applied to the sync and async engines separately (each holds up to size + overflow)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection before failing
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout so restarts and idle drops are survived
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced, -1 keeps them forever
+    DB_ECHO: bool = False  # log every SQL statement
+    # Postgres per-connection limits in milliseconds, 0 keeps the server default
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_LOCK_TIMEOUT_MS: int = 0
+    # Crud example bulk endpoints: rows per INSERT/UPDATE/DELETE statement (overridable per request) and per request
+    CRUD_BULK_BATCH_SIZE: int = 1000
+    CRUD_BULK_MAX_ITEMS: int = 100000
+    # Crud example lookup/search cache: in-process LRU entries (0 disables it) and TTL, plus an optional shared Redis tier
+    CRUD_EXAMPLE_CACHE_MAX_ENTRIES: int = 10000
+    CRUD_EXAMPLE_CACHE_TTL_SECONDS: float = 60.0
+    CRUD_EXAMPLE_CACHE_REDIS_URL: Optional[str] = None
     
     # Logging configuration
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
+    # Data processing configuration
+    CSV_CHUNK_SIZE: int = 50000
+    # "calamine" parses whole sheets in Rust; "openpyxl" streams .xlsx rows in CSV_CHUNK_SIZE chunks
+    EXCEL_ENGINE: Literal["calamine", "openpyxl"] = "calamine"
+    # Dtype inference pre-pass: sample size and the distinct/non-null ratio below which strings become categoricals
+    DTYPE_INFERENCE_SAMPLE_ROWS: int = 10000
+    DTYPE_CATEGORICAL_MAX_RATIO: float = 0.5
+    # Datetime formats inferred per column layout, kept so repeat uploads skip format inference
+    DATETIME_FORMAT_CACHE_SIZE: int = 256
+
+    # Sample mode: leading rows always read, and rows drawn at random from the rest (overridable per request)
+    SAMPLE_HEAD_ROWS: int = 1000
+    SAMPLE_MODE_ROWS: int = 10000
+
+    # Exact mode: distinct values one column's frequency table may hold before that column
+    # switches to the approximate sketches (overridable per request), 0 removes the bound
+    EXACT_MAX_DISTINCT_VALUES: int = 1000000
+
+    # Approximate profiling defaults (overridable per request)
+    APPROX_HLL_PRECISION: int = 14
+    APPROX_TOP_K_CAPACITY: int = 1000
+    APPROX_TDIGEST_COMPRESSION: int = 100
+    APPROX_FREQUENCY_SAMPLE_SIZE: int = 1024
+
+    # Background data summary jobs
+    DATA_SUMMARY_WORKERS: Optional[int] = None  # defaults to the number of CPUs
+    DATA_SUMMARY_MAX_CONCURRENT_JOBS: Optional[int] = None  # defaults to the number of workers
+    DATA_SUMMARY_MAX_QUEUED_JOBS: int = 20
+    DATA_SUMMARY_JOB_RETENTION: int = 100
+    UPLOAD_SPOOL_DIR: Optional[str] = None  # defaults to the system temp directory
+    MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024 * 1024  # per request and per spooled file, 0 disables the limit
+    MAX_DECOMPRESSED_BYTES: int = 50 * 1024 * 1024 * 1024  # per compressed upload once expanded, 0 disables the limit
+
+    # Batch profiling limits, applied to uploaded files and archive members alike
+    BATCH_MAX_FILES: int = 500
+    BATCH_MAX_EXTRACTED_BYTES: int = 10 * 1024 * 1024 * 1024
+
+    # Data summary cache, keyed by a hash of the uploaded bytes and report options
+    DATA_SUMMARY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # in-process LRU budget, 0 disables it
+    DATA_SUMMARY_CACHE_DIR: Optional[str] = None  # on-disk tier, disabled when unset
+    DATA_SUMMARY_CACHE_DISK_MAX_BYTES: int = 1024 * 1024 * 1024  # on-disk budget, least recently used go first, 0 removes it
+
     # Feature flags
     ENABLE_DOCS: bool = False
     ENABLE_METRICS: bool = False
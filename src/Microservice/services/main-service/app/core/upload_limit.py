@@ -0,0 +1,60 @@
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class _UploadTooLarge(Exception):
+    pass
+
+
+class MaxUploadSizeMiddleware:
+    """
+    Reject request bodies over a byte limit with 413 before they are spooled
+
+    A declared Content-Length is checked up front; chunked bodies are counted
+    as they stream in and cut off as soon as they cross the limit
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefix: str = "/"):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.max_bytes or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    raise _UploadTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            # The body parser turns the abort into its own error response; drop it in favour of 413
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _UploadTooLarge:
+            pass
+        if rejected:
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = PlainTextResponse(
+            f"Upload exceeds the maximum size of {self.max_bytes} bytes", status_code=413)
+        await response(scope, receive, send)
@@ -0,0 +1,288 @@
+from shared.utils.logger import get_logger
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Iterator, Sequence, Tuple
+from shared.database.dbContext import Base
+from sqlalchemy import delete, func, insert, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from abc import ABC
+from app.repository.keyset import keyset_statement, split_page
+
+logger = get_logger(__name__)
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+def iter_batches(items: Sequence[Any], batch_size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+class AsyncBaseRepository(Generic[ModelType], ABC):
+    """
+    Base repository class with common database operations on an AsyncSession
+    """
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    def _apply_filters(self, statement, filters: Optional[Dict[str, Any]]):
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    statement = statement.where(getattr(self.model, field) == value)
+        return statement
+
+    async def get_by_id(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """
+        Get a single record by ID
+        """
+        try:
+            result = await db.get(self.model, id)
+            if result:
+                logger.debug(f"Found {self.model.__name__} with ID: {id}")
+            else:
+                logger.debug(f"No {self.model.__name__} found with ID: {id}")
+            return result
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in get_by_id: {str(e)}")
+            raise
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Any] = None
+    ) -> List[ModelType]:
+        """
+        Get multiple records with optional filtering and pagination
+        """
+        try:
+            statement = self._apply_filters(select(self.model), filters)
+
+            # Apply ordering
+            if order_by is not None:
+                statement = statement.order_by(order_by)
+
+            # Apply pagination
+            results = (await db.scalars(statement.offset(skip).limit(limit))).all()
+            logger.debug(f"Retrieved {len(results)} {self.model.__name__} records")
+            return list(results)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in get_multi: {str(e)}")
+            raise
+
+    def keyset_columns(self) -> List[Any]:
+        """
+        Sort key for cursor pagination: newest first, the primary key breaking ties
+
+        A nullable created_at is left out, since NULL keys fall out of the row comparison
+        """
+        if hasattr(self.model, "created_at") and not self.model.created_at.nullable:
+            return [self.model.created_at, self.model.id]
+        return [self.model.id]
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Get the page of records after a cursor and the cursor of the next page, if any
+        """
+        try:
+            columns = self.keyset_columns()
+            statement = keyset_statement(self._apply_filters(select(self.model), filters), columns, cursor, limit)
+            results, next_cursor = split_page((await db.scalars(statement)).all(), columns, limit)
+            logger.debug(f"Retrieved a page of {len(results)} {self.model.__name__} records")
+            return results, next_cursor
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in get_page: {str(e)}")
+            raise
+
+    async def create(self, db: AsyncSession, obj_in: Dict[str, Any]) -> ModelType:
+        """
+        Create a new record
+        """
+        try:
+            db_obj = self.model(**obj_in)
+            db.add(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+            logger.info(f"Created {self.model.__name__} with ID: {db_obj.id}")
+            return db_obj
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in create: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> List[ModelType]:
+        """
+        Insert many records with one INSERT ... RETURNING per batch, all in one transaction
+        The records come back in the order of the rows
+        """
+        try:
+            created = []
+            statement = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+            for batch in iter_batches(rows, batch_size):
+                created.extend((await db.scalars(statement, list(batch))).all())
+            await db.commit()
+            logger.info(f"Bulk created {len(created)} {self.model.__name__} records")
+            return created
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in bulk_create: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def bulk_upsert(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]],
+        conflict_columns: List[str],
+        update_columns: List[str],
+        batch_size: int = 1000
+    ) -> List[Tuple[ModelType, bool]]:
+        """
+        Insert or update many records keyed on a unique key with INSERT ... ON CONFLICT DO UPDATE,
+        one statement per batch and all in one transaction
+        Returns each record with whether it was inserted; a batch must not repeat a key
+        """
+        try:
+            results = []
+            for batch in iter_batches(rows, batch_size):
+                statement = pg_insert(self.model).values(list(batch))
+                statement = statement.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={column: statement.excluded[column] for column in update_columns},
+                ).returning(self.model, literal_column("xmax = 0").label("inserted"))
+                # xmax is only set on a row version that replaced another, i.e. by the DO UPDATE branch
+                result = await db.execute(statement, execution_options={"populate_existing": True})
+                results.extend((record, inserted) for record, inserted in result)
+            await db.commit()
+            logger.info(f"Bulk upserted {len(results)} {self.model.__name__} records")
+            return results
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in bulk_upsert: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def update(
+        self,
+        db: AsyncSession,
+        db_obj: ModelType,
+        obj_in: Dict[str, Any]
+    ) -> ModelType:
+        """
+        Update an existing record
+        """
+        try:
+            for field, value in obj_in.items():
+                if hasattr(db_obj, field):
+                    setattr(db_obj, field, value)
+
+            await db.commit()
+            await db.refresh(db_obj)
+            logger.info(f"Updated {self.model.__name__} with ID: {db_obj.id}")
+            return db_obj
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in update: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        ids: List[Any],
+        obj_in: Dict[str, Any],
+        batch_size: int = 1000
+    ) -> List[ModelType]:
+        """
+        Apply the same changes to every record in an ID list with one UPDATE ... RETURNING per batch,
+        all in one transaction; IDs that match no record are simply absent from the result
+        """
+        try:
+            updated = []
+            for batch in iter_batches(ids, batch_size):
+                statement = update(self.model).where(self.model.id.in_(batch)).values(**obj_in).returning(self.model)
+                updated.extend((await db.scalars(statement, execution_options={"populate_existing": True})).all())
+            await db.commit()
+            logger.info(f"Bulk updated {len(updated)} {self.model.__name__} records")
+            return updated
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in bulk_update: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def bulk_delete(self, db: AsyncSession, ids: List[Any], batch_size: int = 1000) -> List[Any]:
+        """
+        Delete the records in an ID list with one DELETE ... RETURNING per batch, all in one transaction
+        Returns the IDs that were deleted
+        """
+        try:
+            deleted = []
+            for batch in iter_batches(ids, batch_size):
+                statement = delete(self.model).where(self.model.id.in_(batch)).returning(self.model.id)
+                deleted.extend((await db.scalars(statement)).all())
+            await db.commit()
+            logger.info(f"Bulk deleted {len(deleted)} {self.model.__name__} records")
+            return deleted
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in bulk_delete: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def delete(self, db: AsyncSession, id: Any) -> bool:
+        """
+        Delete a record by ID
+        """
+        try:
+            obj = await db.get(self.model, id)
+            if obj:
+                await db.delete(obj)
+                await db.commit()
+                logger.info(f"Deleted {self.model.__name__} with ID: {id}")
+                return True
+            else:
+                logger.warning(f"No {self.model.__name__} found with ID: {id} for deletion")
+                return False
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in delete: {str(e)}")
+            await db.rollback()
+            raise
+
+    async def count(self, db: AsyncSession, filters: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count records with optional filtering
+        """
+        try:
+            statement = self._apply_filters(select(func.count()).select_from(self.model), filters)
+            count = await db.scalar(statement)
+            logger.debug(f"Counted {count} {self.model.__name__} records")
+            return count
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in count: {str(e)}")
+            raise
+
+    async def exists(self, db: AsyncSession, id: Any) -> bool:
+        """
+        Check if a record exists by ID
+        """
+        try:
+            exists = await db.scalar(select(self.model.id).where(self.model.id == id)) is not None
+            logger.debug(f"{self.model.__name__} with ID {id} exists: {exists}")
+            return exists
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in exists: {str(e)}")
+            raise
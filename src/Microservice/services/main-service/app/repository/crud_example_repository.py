@@ -1,22 +1,53 @@
 from shared.utils.logger import get_logger
-from app.repository.base import BaseRepository
+from app.repository.async_base import AsyncBaseRepository, iter_batches
 from shared.database.models import CrudExample
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import and_, or_, func, desc, select, literal_column
 from app.schemas.crudExample import CrudExampleCreate, CrudExampleUpdate
 from shared.utils import utc_now
+from shared.constants.constants import CRUD_EXAMPLE_SEARCH_CONFIG
+from app.repository.keyset import keyset_statement, split_page
 
 logger = get_logger(__name__)
 
-class CrudExampleRepository(BaseRepository[CrudExample]):
+class CrudExampleRepository(AsyncBaseRepository[CrudExample]):
 
     def __init__(self):
         super().__init__(CrudExample)
     
-    def search_crud_example(
+    def _search_query(
         self,
-        db: Session,
+        isActive: Optional[bool] = None,
+        status: Optional[int] = None,
+        search: Optional[str] = None
+    ):
+        query = select(CrudExample)
+
+        # Apply isActive filter
+        if isActive is not None:
+            query = query.where(CrudExample.isActive == isActive)
+            logger.debug(f"Applied isActive filter: {isActive}")
+
+        # Apply status filter
+        if status is not None:
+            query = query.where(CrudExample.status == status)
+            logger.debug(f"Applied status filter: {status}")
+
+        # Apply search filter; substring matches are served by the pg_trgm indexes for terms of 3+ characters
+        if search:
+            search_filter = or_(
+                CrudExample.name.ilike(f"%{search}%"),
+                CrudExample.description.ilike(f"%{search}%")
+            )
+            query = query.where(search_filter)
+            logger.debug(f"Applied search filter: {search}")
+
+        return query
+
+    async def search_crud_example(
+        self,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         isActive: Optional[bool] = None,
@@ -24,32 +55,14 @@ class CrudExampleRepository(BaseRepository[CrudExample]):
         search: Optional[str] = None
     ) -> List[CrudExample]:
         """
-        Get crud examples with optional filtering and search
+        Get crud examples with optional filtering and search, paged by offset
         """
         try:
-            query = db.query(CrudExample)
-            
-            # Apply isActive filter
-            if isActive is not None:
-                query = query.filter(CrudExample.isActive == isActive)
-                logger.debug(f"Applied isActive filter: {isActive}")
-
-            # Apply status filter
-            if status is not None:
-                query = query.filter(CrudExample.status == status)
-                logger.debug(f"Applied status filter: {status}")
-
-            # Apply search filter
-            if search:
-                search_filter = or_(
-                    CrudExample.name.ilike(f"%{search}%"),
-                    CrudExample.description.ilike(f"%{search}%")
-                )
-                query = query.filter(search_filter)
-                logger.debug(f"Applied search filter: {search}")
-            
-            # Apply ordering and pagination
-            crud_examples = query.order_by(desc(CrudExample.created_at)).offset(skip).limit(limit).all()
+            query = self._search_query(isActive, status, search)
+
+            # Apply ordering and pagination; same order as the keyset pages, so both modes agree
+            crud_examples = (await db.scalars(
+                query.order_by(desc(CrudExample.created_at), desc(CrudExample.id)).offset(skip).limit(limit))).all()
 
             logger.info(f"Retrieved {len(crud_examples)} crud examples with filters")
             return crud_examples
@@ -58,9 +71,61 @@ class CrudExampleRepository(BaseRepository[CrudExample]):
             logger.error(f"Error getting crud examples with filters: {str(e)}")
             raise
 
-    def create_crud_example(
+    async def search_crud_example_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        isActive: Optional[bool] = None,
+        status: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[CrudExample], Optional[str]]:
+        """
+        Get the page of crud examples after a cursor on (created_at, id) and the next page's cursor
+        """
+        try:
+            columns = self.keyset_columns()
+            query = keyset_statement(self._search_query(isActive, status, search), columns, cursor, limit)
+            crud_examples, next_cursor = split_page((await db.scalars(query)).all(), columns, limit)
+
+            logger.info(f"Retrieved a page of {len(crud_examples)} crud examples with filters")
+            return crud_examples, next_cursor
+
+        except Exception as e:
+            logger.error(f"Error getting a page of crud examples with filters: {str(e)}")
+            raise
+
+    async def search_crud_example_ranked(
+        self,
+        db: AsyncSession,
+        search: str,
+        skip: int = 0,
+        limit: int = 100,
+        isActive: Optional[bool] = None,
+        status: Optional[int] = None
+    ) -> List[CrudExample]:
+        """
+        Get crud examples whose words match a web-style search query, most relevant first
+        """
+        try:
+            # The config must be the one the generated search_vector was built with to hit its GIN index
+            tsquery = func.websearch_to_tsquery(literal_column(f"'{CRUD_EXAMPLE_SEARCH_CONFIG}'::regconfig"), search)
+            query = self._search_query(isActive, status).where(CrudExample.search_vector.op("@@")(tsquery))
+            rank = func.ts_rank_cd(CrudExample.search_vector, tsquery)
+
+            crud_examples = (await db.scalars(
+                query.order_by(desc(rank), desc(CrudExample.created_at), desc(CrudExample.id)).offset(skip).limit(limit))).all()
+
+            logger.info(f"Retrieved {len(crud_examples)} crud examples ranked for: {search}")
+            return crud_examples
+
+        except Exception as e:
+            logger.error(f"Error getting ranked crud examples: {str(e)}")
+            raise
+
+    async def create_crud_example(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         crud_example_data: CrudExampleCreate
     ) -> CrudExample:
         """
@@ -71,18 +136,108 @@ class CrudExampleRepository(BaseRepository[CrudExample]):
                 "name": crud_example_data.name,
                 "description": crud_example_data.description,
                 "isActive": crud_example_data.isActive,
-                "status": crud_example_data.status
+                "status": crud_example_data.status,
+                "externalId": crud_example_data.externalId
             }
               
-            return self.create(db, crud_example_dict)
+            return await self.create(db, crud_example_dict)
 
         except Exception as e:
             logger.error(f"Error creating crud example: {str(e)}")
             raise
     
-    def update_crud_example(
+    async def get_existing_external_ids(
+        self,
+        db: AsyncSession,
+        external_ids: List[str],
+        batch_size: int = 1000
+    ) -> Set[str]:
+        """
+        The external IDs in the list that already belong to a crud example
+        """
+        try:
+            existing = set()
+            for batch in iter_batches(external_ids, batch_size):
+                existing.update((await db.scalars(
+                    select(CrudExample.externalId).where(CrudExample.externalId.in_(batch)))).all())
+            return existing
+        except Exception as e:
+            logger.error(f"Error getting existing external IDs: {str(e)}")
+            raise
+
+    async def bulk_create_crud_examples(
+        self,
+        db: AsyncSession,
+        crud_examples_data: List[CrudExampleCreate],
+        batch_size: int = 1000
+    ) -> List[CrudExample]:
+        """
+        Create many crud examples in one transaction, returned in the order given
+        """
+        try:
+            rows = [data.model_dump(include={"name", "description", "isActive", "status", "externalId"})
+                    for data in crud_examples_data]
+            return await self.bulk_create(db, rows, batch_size)
+        except Exception as e:
+            logger.error(f"Error bulk creating crud examples: {str(e)}")
+            raise
+
+    async def bulk_upsert_crud_examples(
+        self,
+        db: AsyncSession,
+        crud_examples_data: List[CrudExampleCreate],
+        batch_size: int = 1000
+    ) -> List[Tuple[CrudExample, bool]]:
+        """
+        Insert crud examples or update the ones whose externalId exists, in one transaction
+        """
+        try:
+            now = utc_now()
+            rows = [{**data.model_dump(include={"name", "description", "isActive", "status", "externalId"}),
+                     "updated_at": now} for data in crud_examples_data]
+            return await self.bulk_upsert(
+                db, rows, conflict_columns=["externalId"],
+                update_columns=["name", "description", "isActive", "status", "updated_at"], batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Error bulk upserting crud examples: {str(e)}")
+            raise
+
+    async def bulk_update_crud_examples(
+        self,
+        db: AsyncSession,
+        crud_example_ids: List[int],
+        crud_example_update: CrudExampleUpdate,
+        batch_size: int = 1000
+    ) -> List[CrudExample]:
+        """
+        Apply the same update to many crud examples in one transaction
+        """
+        try:
+            update_data = crud_example_update.model_dump(exclude_unset=True)
+            update_data["updated_at"] = utc_now()
+            return await self.bulk_update(db, crud_example_ids, update_data, batch_size)
+        except Exception as e:
+            logger.error(f"Error bulk updating crud examples: {str(e)}")
+            raise
+
+    async def bulk_delete_crud_examples(
+        self,
+        db: AsyncSession,
+        crud_example_ids: List[int],
+        batch_size: int = 1000
+    ) -> List[int]:
+        """
+        Delete many crud examples in one transaction, returning the IDs that existed
+        """
+        try:
+            return await self.bulk_delete(db, crud_example_ids, batch_size)
+        except Exception as e:
+            logger.error(f"Error bulk deleting crud examples: {str(e)}")
+            raise
+
+    async def update_crud_example(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         crud_example_id: int, 
         crud_example_update: CrudExampleUpdate
     ) -> Optional[CrudExample]:
@@ -90,7 +245,7 @@ class CrudExampleRepository(BaseRepository[CrudExample]):
         Update an existing crud example
         """
         try:
-            crud_example = self.get_by_id(db, crud_example_id)
+            crud_example = await self.get_by_id(db, crud_example_id)
             if not crud_example:
                 return None
             
@@ -100,33 +255,33 @@ class CrudExampleRepository(BaseRepository[CrudExample]):
             # Add updated_at timestamp
             update_data["updated_at"] = utc_now()
 
-            return self.update(db, crud_example, update_data)
+            return await self.update(db, crud_example, update_data)
             
         except Exception as e:
             logger.error(f"Error updating crud example {crud_example_id}: {str(e)}")
             raise
     
-    def delete_crud_example_by_id(
+    async def delete_crud_example_by_id(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         crud_example_id: int) -> bool:
         """
         Delete a crud example by ID
         """
         try:
-            return self.delete(db, crud_example_id)
+            return await self.delete(db, crud_example_id)
         except Exception as e:
             logger.error(f"Error deleting a crud example by ID: {str(e)}")
-            db.rollback()
+            await db.rollback()
             raise
     
-    def get_total_record(self, db: Session) -> int:
+    async def get_total_record(self, db: AsyncSession) -> int:
         """
         Get total record count
         """
         try:
             # Get total count
-            total = db.query(func.count(CrudExample.id)).scalar()
+            total = await db.scalar(select(func.count(CrudExample.id)))
             return total
         except Exception as e:
             logger.error(f"Error getting total record count: {str(e)}")
@@ -0,0 +1,84 @@
+from shared.utils.logger import get_logger
+from app.repository.base import BaseRepository
+from shared.database.models import DatasetProfile
+from sqlalchemy.orm import Session
+from typing import Optional
+from shared.utils import utc_now
+
+logger = get_logger(__name__)
+
+class DatasetProfileRepository(BaseRepository[DatasetProfile]):
+
+    def __init__(self):
+        super().__init__(DatasetProfile)
+
+    def get_by_name(self, db: Session, name: str, for_update: bool = False) -> Optional[DatasetProfile]:
+        """
+        Get a dataset profile by name, optionally locking the row until the transaction ends
+        """
+        try:
+            query = db.query(DatasetProfile).filter(DatasetProfile.name == name)
+            if for_update:
+                query = query.with_for_update()
+            return query.first()
+        except Exception as e:
+            logger.error(f"Error getting dataset profile {name}: {str(e)}")
+            raise
+
+    def create_dataset_profile(
+        self,
+        db: Session,
+        name: str,
+        options: str,
+        profile: bytes,
+        total_records: int
+    ) -> DatasetProfile:
+        """
+        Create a dataset profile from its first upload
+        """
+        try:
+            return self.create(db, {
+                "name": name,
+                "options": options,
+                "profile": profile,
+                "total_records": total_records,
+                "upload_count": 1
+            })
+        except Exception as e:
+            logger.error(f"Error creating dataset profile {name}: {str(e)}")
+            raise
+
+    def update_dataset_profile(
+        self,
+        db: Session,
+        dataset_profile: DatasetProfile,
+        profile: bytes,
+        total_records: int
+    ) -> DatasetProfile:
+        """
+        Replace the stored profile with one that has another upload merged in
+        """
+        try:
+            return self.update(db, dataset_profile, {
+                "profile": profile,
+                "total_records": total_records,
+                "upload_count": dataset_profile.upload_count + 1,
+                "updated_at": utc_now()
+            })
+        except Exception as e:
+            logger.error(f"Error updating dataset profile {dataset_profile.name}: {str(e)}")
+            raise
+
+    def delete_dataset_profile_by_name(self, db: Session, name: str) -> bool:
+        """
+        Delete a dataset profile by name
+        """
+        try:
+            dataset_profile = self.get_by_name(db, name)
+            if not dataset_profile:
+                return False
+            return self.delete(db, dataset_profile.id)
+        except Exception as e:
+            logger.error(f"Error deleting dataset profile {name}: {str(e)}")
+            db.rollback()
+            raise
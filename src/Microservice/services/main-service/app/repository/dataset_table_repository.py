@@ -0,0 +1,115 @@
+from shared.utils.logger import get_logger
+from shared.constants.constants import DATASET_TABLE_PREFIX
+from sqlalchemy import Column, Index, MetaData, Table, inspect, text
+from sqlalchemy.orm import Session
+from typing import IO, List, Optional, Sequence
+import hashlib
+import re
+
+logger = get_logger(__name__)
+
+# Postgres truncates identifiers beyond 63 bytes, so long dataset names are shortened and hashed
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def dataset_table_name(dataset: str) -> str:
+    """
+    Name of the table holding a dataset's loaded rows; distinct dataset names never share a table
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", dataset.lower()).strip("_")
+    digest = hashlib.sha256(dataset.encode("utf-8")).hexdigest()[:8]
+    return f"{DATASET_TABLE_PREFIX}{slug[:MAX_IDENTIFIER_LENGTH - len(DATASET_TABLE_PREFIX) - 10]}_{digest}"
+
+
+class DatasetTableRepository:
+    """
+    Repository for the per-dataset tables that uploaded rows are bulk-loaded into
+    """
+
+    def lock_table(self, db: Session, name: str) -> None:
+        """
+        Hold a transaction-scoped advisory lock on a dataset table's name, so concurrent loads
+        cannot both find it missing and race to create it; the lock goes with the transaction
+        """
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        try:
+            key = int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True)
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+        except Exception as e:
+            logger.error(f"Error locking dataset table {name}: {str(e)}")
+            raise
+
+    def get_table(self, db: Session, name: str) -> Optional[Table]:
+        """
+        Reflect a dataset table, or None when it does not exist yet
+        """
+        try:
+            connection = db.connection()
+            if not inspect(connection).has_table(name):
+                return None
+            return Table(name, MetaData(), autoload_with=connection)
+        except Exception as e:
+            logger.error(f"Error reflecting dataset table {name}: {str(e)}")
+            raise
+
+    def create_table(self, db: Session, name: str, columns: Sequence[Column]) -> Table:
+        """
+        Create a dataset table without indexes, inside the session's transaction
+        """
+        try:
+            table = Table(name, MetaData(), *columns)
+            table.create(db.connection())
+            return table
+        except Exception as e:
+            logger.error(f"Error creating dataset table {name}: {str(e)}")
+            raise
+
+    def copy_rows(self, db: Session, table: Table, columns: Sequence[str], rows: IO[str]) -> None:
+        """
+        Stream CSV rows into the table with COPY FROM STDIN, inside the session's transaction
+        """
+        try:
+            preparer = db.get_bind().dialect.identifier_preparer
+            column_list = ", ".join(preparer.quote(column) for column in columns)
+            statement = f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+            with db.connection().connection.cursor() as cursor:
+                cursor.copy_expert(statement, rows)
+        except Exception as e:
+            logger.error(f"Error copying rows into dataset table {table.name}: {str(e)}")
+            raise
+
+    def create_indexes(self, db: Session, table: Table, columns: Sequence[str]) -> List[str]:
+        """
+        Index the given columns; called once the rows are in, so the load never maintains them row by row
+        """
+        try:
+            # Index builds scale with the table, so the configured statement timeout does not apply to them
+            db.execute(text("SET LOCAL statement_timeout = 0"))
+            names = []
+            for column in columns:
+                digest = hashlib.sha256(f"{table.name}.{column}".encode("utf-8")).hexdigest()[:8]
+                index = Index(f"ix_{table.name[:MAX_IDENTIFIER_LENGTH - 12]}_{digest}", table.c[column])
+                index.create(db.connection())
+                names.append(index.name)
+            return names
+        except Exception as e:
+            logger.error(f"Error indexing dataset table {table.name}: {str(e)}")
+            raise
+
+    def drop_table(self, db: Session, name: str) -> bool:
+        """
+        Drop a dataset table and commit, returning whether it existed
+        """
+        try:
+            table = self.get_table(db, name)
+            if table is None:
+                return False
+            table.drop(db.connection())
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error dropping dataset table {name}: {str(e)}")
+            db.rollback()
+            raise
+
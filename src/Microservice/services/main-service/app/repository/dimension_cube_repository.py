@@ -0,0 +1,106 @@
+from shared.utils.logger import get_logger
+from shared.constants.constants import CUBE_DIMENSIONS
+from app.repository.base import BaseRepository
+from shared.database.models import DimensionCube, DimensionCubeCell
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from shared.utils import utc_now
+
+logger = get_logger(__name__)
+
+# Cells sent per INSERT ... ON CONFLICT statement
+CELL_UPSERT_BATCH_SIZE = 5000
+
+class DimensionCubeRepository(BaseRepository[DimensionCube]):
+
+    def __init__(self):
+        super().__init__(DimensionCube)
+
+    def get_by_name(self, db: Session, name: str) -> Optional[DimensionCube]:
+        """
+        Get a dimension cube by name
+        """
+        try:
+            return db.query(DimensionCube).filter(DimensionCube.name == name).first()
+        except Exception as e:
+            logger.error(f"Error getting dimension cube {name}: {str(e)}")
+            raise
+
+    def create_dimension_cube(self, db: Session, name: str) -> DimensionCube:
+        """
+        Create an empty dimension cube
+        """
+        try:
+            return self.create(db, {"name": name, "total_records": 0, "upload_count": 0})
+        except Exception as e:
+            logger.error(f"Error creating dimension cube {name}: {str(e)}")
+            raise
+
+    def add_cells(self, db: Session, cube: DimensionCube, cells: List[Dict[str, Any]], total_records: int) -> None:
+        """
+        Add an upload's cell counts to the cube in one transaction, summing into existing cells
+        """
+        try:
+            # Every upload locks the cells it touches in the unique key's order, so two uploads into
+            # the same cube wait on each other instead of each holding a row the other one needs
+            cells = sorted(cells, key=lambda cell: tuple(cell.get(dimension, "") for dimension in CUBE_DIMENSIONS))
+            for start in range(0, len(cells), CELL_UPSERT_BATCH_SIZE):
+                batch = [{**cell, "cube_id": cube.id} for cell in cells[start:start + CELL_UPSERT_BATCH_SIZE]]
+                statement = insert(DimensionCubeCell).values(batch)
+                db.execute(statement.on_conflict_do_update(
+                    constraint="uq_dimensionCubeCells_cell",
+                    set_={"record_count": DimensionCubeCell.record_count + statement.excluded.record_count},
+                ))
+            # Incremented in SQL so concurrent uploads into the same cube never lose counts
+            db.query(DimensionCube).filter(DimensionCube.id == cube.id).update({
+                DimensionCube.total_records: DimensionCube.total_records + total_records,
+                DimensionCube.upload_count: DimensionCube.upload_count + 1,
+                DimensionCube.updated_at: utc_now(),
+            }, synchronize_session=False)
+            db.commit()
+            db.refresh(cube)
+        except Exception as e:
+            logger.error(f"Error adding cells to dimension cube {cube.name}: {str(e)}")
+            db.rollback()
+            raise
+
+    def slice_cells(
+        self,
+        db: Session,
+        cube: DimensionCube,
+        group_by: Sequence[str],
+        filters: Dict[str, List[str]],
+        limit: int
+    ) -> List[Tuple]:
+        """
+        Sum record counts per combination of the group-by dimensions among cells matching the filters
+        """
+        try:
+            dimensions = [getattr(DimensionCubeCell, dimension) for dimension in group_by]
+            record_count = func.sum(DimensionCubeCell.record_count)
+            query = db.query(*dimensions, record_count).filter(DimensionCubeCell.cube_id == cube.id)
+            for dimension, values in filters.items():
+                query = query.filter(getattr(DimensionCubeCell, dimension).in_(values))
+            if dimensions:
+                query = query.group_by(*dimensions)
+            return query.order_by(record_count.desc()).limit(limit).all()
+        except Exception as e:
+            logger.error(f"Error slicing dimension cube {cube.name}: {str(e)}")
+            raise
+
+    def delete_dimension_cube_by_name(self, db: Session, name: str) -> bool:
+        """
+        Delete a dimension cube and its cells by name
+        """
+        try:
+            cube = self.get_by_name(db, name)
+            if not cube:
+                return False
+            db.query(DimensionCubeCell).filter(DimensionCubeCell.cube_id == cube.id).delete(synchronize_session=False)
+            return self.delete(db, cube.id)
+        except Exception as e:
+            logger.error(f"Error deleting dimension cube {name}: {str(e)}")
+            db.rollback()
+            raise
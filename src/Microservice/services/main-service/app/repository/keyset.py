@@ -0,0 +1,72 @@
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import InstrumentedAttribute
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor was not produced by encode_cursor for the same ordering
+    """
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque, URL-safe cursor holding the sort key of the last row of a page
+    """
+    plain = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(plain, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """
+    Sort key values of a cursor, converted back to the Python types of the key columns
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if isinstance(values, list) and len(values) == len(columns):
+            return [
+                datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+                for column, value in zip(columns, values)
+            ]
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        pass
+    raise InvalidCursorError("Invalid pagination cursor")
+
+
+def keyset_statement(
+    statement: Select,
+    columns: Sequence[InstrumentedAttribute],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True
+) -> Select:
+    """
+    Order by the key columns and start after the cursor's row, fetching one extra row
+    to tell whether another page follows
+
+    The row comparison lets Postgres seek straight to the cursor in a composite index
+    on the key columns, however deep the page
+    """
+    if cursor:
+        key = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, columns))
+        statement = statement.where(key < values if descending else key > values)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    return statement.order_by(*ordering).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], columns: Sequence[InstrumentedAttribute], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim the extra row fetched by keyset_statement and build the cursor of the next page, if any
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor([getattr(last, column.key) for column in columns])
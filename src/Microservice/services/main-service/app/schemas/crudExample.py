@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 
 class CrudExampleBase(BaseModel):
@@ -10,6 +10,7 @@ class CrudExampleBase(BaseModel):
     description: Optional[str] = Field(None, max_length=1000, description="Crud Example description")
     isActive: bool = Field(False, description="Crud Example Is Active")
     status: int = Field(0, description="Crud Example status")
+    externalId: Optional[str] = Field(None, min_length=1, max_length=200, description="Key of the record in the system it was imported from")
 
 class CrudExampleCreate(CrudExampleBase):
     """
@@ -45,6 +46,7 @@ class CrudExampleUpdate(CrudExampleBase):
     description: Optional[str] = Field(None, max_length=1000, description="Crud Example description")
     isActive: Optional[bool] = Field(None, description="Crud Example Is Active")
     status: Optional[int] = Field(None, description="Crud Example status")
+    externalId: Optional[str] = Field(None, min_length=1, max_length=200, description="Key of the record in the system it was imported from")
 
     @field_validator('name')
     def name_must_not_be_empty(cls, v):
@@ -89,3 +91,70 @@ class CrudExampleResponse(CrudExampleBase):
                 "updated_at": "2023-12-01T10:00:00Z"
             }
         }
+
+class CrudExampleBulkCreate(BaseModel):
+    """
+    Schema for creating many crud examples in one request
+    """
+    items: List[CrudExampleCreate] = Field(..., min_length=1, description="Crud examples to create")
+
+class CrudExampleBulkUpsert(BaseModel):
+    """
+    Schema for inserting or updating many crud examples keyed on externalId
+    """
+    items: List[CrudExampleCreate] = Field(..., min_length=1, description="Crud examples to insert or update")
+
+    @field_validator('items')
+    def items_must_have_external_id(cls, v):
+        missing = [index for index, item in enumerate(v) if item.externalId is None]
+        if missing:
+            raise ValueError(f'externalId is required to upsert, missing on items {missing[:10]}')
+        return v
+
+class CrudExampleBulkUpdate(BaseModel):
+    """
+    Schema for applying the same changes to many crud examples
+    """
+    ids: List[int] = Field(..., min_length=1, description="IDs of the crud examples to update")
+    changes: CrudExampleUpdate = Field(..., description="Fields to set on every listed crud example")
+
+class CrudExampleBulkDelete(BaseModel):
+    """
+    Schema for deleting many crud examples
+    """
+    ids: List[int] = Field(..., min_length=1, description="IDs of the crud examples to delete")
+
+class CrudExampleBulkItemResult(BaseModel):
+    """
+    Outcome of one item of a bulk request, in request order
+    """
+    index: int = Field(..., description="Position of the item in the request")
+    status: Literal["created", "updated", "deleted", "not_found", "duplicate", "conflict"] = Field(
+        ..., description="What happened to the item")
+    id: Optional[int] = Field(None, description="Crud Example ID")
+    item: Optional[CrudExampleResponse] = Field(None, description="The crud example as stored, for created and updated items")
+    error: Optional[str] = Field(None, description="Why the item was skipped")
+
+class CrudExampleBulkResponse(BaseModel):
+    """
+    Schema for bulk request responses
+    """
+    counts: Dict[str, int] = Field(..., description="Number of items per status")
+    results: List[CrudExampleBulkItemResult] = Field(..., description="One result per requested item")
+
+class CrudExampleCacheStats(BaseModel):
+    """
+    Response schema for crud example cache statistics
+    """
+    hits: int = Field(..., description="Lookups answered from either tier")
+    backend_hits: int = Field(..., description="Lookups answered from the shared backend")
+    misses: int = Field(..., description="Lookups that went to the database")
+    hit_ratio: float = Field(..., description="Hits over lookups")
+    evictions: int = Field(..., description="Entries dropped to stay within max_entries")
+    expirations: int = Field(..., description="Entries found past their TTL")
+    invalidations: int = Field(..., description="Writes that dropped records and cached searches")
+    backend_errors: int = Field(..., description="Failed shared backend calls, served as misses")
+    entries: int = Field(..., description="Entries held in process")
+    max_entries: int = Field(..., description="In-process entry budget")
+    ttl_seconds: float = Field(..., description="Lifetime of an entry")
+    backend: Optional[str] = Field(None, description="Shared backend class, if one is configured")
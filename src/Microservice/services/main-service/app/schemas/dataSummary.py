@@ -0,0 +1,75 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from app.core.config import settings
+
+class DataSummaryOptions(BaseModel):
+    """
+    Options that control how a data summary is computed
+    """
+    mode: Literal["exact", "approximate", "sample"] = Field("exact", description="Exact statistics, fixed-memory sketches, or a quick preview from a sample")
+    exact_max_distinct: int = Field(settings.EXACT_MAX_DISTINCT_VALUES, ge=0, description="Distinct values a column may count exactly before it falls back to sketches (exact mode), 0 for no limit")
+    hll_precision: int = Field(settings.APPROX_HLL_PRECISION, ge=4, le=18, description="HyperLogLog register bits for distinct counts")
+    top_k_capacity: int = Field(settings.APPROX_TOP_K_CAPACITY, ge=10, description="Space-Saving capacity for most common values")
+    tdigest_compression: int = Field(settings.APPROX_TDIGEST_COMPRESSION, ge=10, le=1000, description="t-digest compression for quantiles")
+    frequency_sample_size: int = Field(settings.APPROX_FREQUENCY_SAMPLE_SIZE, ge=16, description="Distinct values sampled for the median frequency")
+    sample_size: int = Field(settings.SAMPLE_MODE_ROWS, ge=100, le=1000000, description="Rows drawn at random beyond the head (sample mode)")
+    infer_dtypes: bool = Field(True, description="Sample the file first and read it with categorical, downcast and datetime dtypes")
+    columns: Optional[List[str]] = Field(None, description="Only load and profile these columns (all columns when omitted)")
+    sheets: Optional[List[str]] = Field(None, description="Excel sheets to profile in parallel, or \"*\" for all (first sheet when omitted)")
+
+
+class DataSummaryJobStatus(str, Enum):
+    """
+    Lifecycle states of a background data summary job
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class DataSummaryJobResponse(BaseModel):
+    """
+    Response schema for background data summary jobs
+    """
+    id: str = Field(..., description="Job ID")
+    status: DataSummaryJobStatus = Field(..., description="Current job status")
+    filename: Optional[str] = Field(None, description="Name of the uploaded file")
+    created_at: datetime = Field(..., description="Submission timestamp")
+    started_at: Optional[datetime] = Field(None, description="Processing start timestamp")
+    finished_at: Optional[datetime] = Field(None, description="Processing end timestamp")
+    result: Optional[str] = Field(None, description="Data summary, once completed")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    cache_key: Optional[str] = Field(None, description="Content-addressed key of the summary in the cache")
+    cached: bool = Field(False, description="Whether the summary was served from the cache")
+
+    class Config:
+        from_attributes = True
+        json_schema_extra = {
+            "example": {
+                "id": "3f6c1f0e9a4b4c4f8d2e7a1b5c9d0e12",
+                "status": "running",
+                "filename": "usage.csv",
+                "created_at": "2023-12-01T10:00:00Z",
+                "started_at": "2023-12-01T10:00:01Z",
+                "finished_at": None,
+                "result": None,
+                "error": None,
+                "cache_key": "9b74c9897bac770ffc029102a200c5de3b1a8c4d6e2f0a7b5c3d1e9f8a6b4c2d",
+                "cached": False
+            }
+        }
+
+class DataSummaryCacheStats(BaseModel):
+    """
+    Response schema for data summary cache statistics
+    """
+    hits: int = Field(..., description="Lookups answered from either tier")
+    disk_hits: int = Field(..., description="Lookups answered from the on-disk tier")
+    misses: int = Field(..., description="Lookups that required a full profile")
+    entries: int = Field(..., description="Summaries held in memory")
+    size_bytes: int = Field(..., description="Bytes held in memory")
+    max_bytes: int = Field(..., description="In-memory byte budget")
+    disk_enabled: bool = Field(..., description="Whether the on-disk tier is configured")
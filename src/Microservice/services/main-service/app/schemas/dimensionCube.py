@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+class DimensionCubeCellResponse(BaseModel):
+    """
+    Record count of one combination of the sliced dimensions
+    """
+    dimensions: Dict[str, str] = Field(..., description="Value of each group-by dimension ('' for blank)")
+    record_count: int = Field(..., description="Records with these dimension values")
+
+class DimensionCubeSliceResponse(BaseModel):
+    """
+    Response schema for a slice of a dimension cube
+    """
+    name: str = Field(..., description="Dimension cube name")
+    total_records: int = Field(..., description="Records aggregated into the cube across all uploads")
+    upload_count: int = Field(..., description="Uploads aggregated into the cube")
+    updated_at: datetime = Field(..., description="Time of the last upload")
+    group_by: List[str] = Field(..., description="Dimensions the counts are grouped by")
+    filters: Dict[str, List[str]] = Field(..., description="Dimension values the cells were restricted to")
+    cells: List[DimensionCubeCellResponse] = Field(..., description="Counts per group, largest first")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "usage-2023-12",
+                "total_records": 1250000,
+                "upload_count": 3,
+                "updated_at": "2023-12-01T10:00:00Z",
+                "group_by": ["zone", "requestType"],
+                "filters": {"mccmnc": ["310260"]},
+                "cells": [
+                    {"dimensions": {"zone": "EU", "requestType": "DATA"}, "record_count": 830211}
+                ]
+            }
+        }
@@ -10,6 +10,27 @@ class DatabaseStatus(BaseModel):
     response_time_ms: Optional[float] = Field(None, description="Database response time in milliseconds")
     error: Optional[str] = Field(None, description="Error message if connection failed")
 
+class DatabasePoolStats(BaseModel):
+    """
+    Occupancy and wait/hold times of one engine's connection pool
+    """
+    name: str = Field(..., description="Engine the pool belongs to (sync or async)")
+    pool_class: Optional[str] = Field(None, description="Pool implementation")
+    pool_size: int = Field(..., description="Connections kept open")
+    max_overflow: int = Field(..., description="Extra connections allowed beyond the pool size")
+    timeout_seconds: float = Field(..., description="How long a checkout waits before failing")
+    checked_out: int = Field(..., description="Connections in use now")
+    checked_in: int = Field(..., description="Idle connections in the pool now")
+    overflow: int = Field(..., description="Overflow connections open now")
+    peak_checked_out: int = Field(..., description="Most connections in use at once")
+    peak_overflow: int = Field(..., description="Most overflow connections open at once")
+    checkouts: int = Field(..., description="Successful checkouts")
+    timeouts: int = Field(..., description="Checkouts that gave up waiting")
+    wait_ms_mean: float = Field(..., description="Mean time spent waiting for a connection")
+    wait_ms_max: float = Field(..., description="Longest time spent waiting for a connection")
+    hold_ms_mean: float = Field(..., description="Mean time a connection was held before checkin")
+    hold_ms_max: float = Field(..., description="Longest time a connection was held before checkin")
+
 class HealthResponse(BaseModel):
     """
     Response schema for health check endpoint
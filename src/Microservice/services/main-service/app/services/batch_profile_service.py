@@ -0,0 +1,222 @@
+import asyncio
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from shared.utils import get_logger
+from shared.constants.constants import ARCHIVE_FILE_TYPES, COMPRESSED_CSV_FILE_TYPES, VALID_FILE_TYPES
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import DataProfileAccumulator
+from app.services.data_summary_job_service import DataSummaryJobManager
+from app.services.handle_file_service import SPOOL_COPY_BUFFER_SIZE, HandleFileService, SheetProfile
+from app.services.summary_renderers import encode_document, profile_document, sections_document
+
+logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+
+class BatchInputError(ValueError):
+    """
+    Raised when a batch upload cannot be turned into a set of profilable files
+    """
+
+
+@dataclass
+class BatchMember:
+    """
+    One file of a batch, spooled to disk under the batch directory
+    """
+    name: str
+    path: str
+    file_type: str
+
+
+def file_type_of(filename: str) -> str:
+    """
+    Return a file's type, keeping compound suffixes such as .tar.gz and .csv.gz whole
+    """
+    lowered = filename.lower()
+    for compound_type in ARCHIVE_FILE_TYPES + COMPRESSED_CSV_FILE_TYPES:
+        if lowered.endswith(compound_type):
+            return compound_type
+    return os.path.splitext(lowered)[1]
+
+
+def accumulate_file(
+    path: str,
+    file_type: str,
+    options: Optional[DataSummaryOptions] = None
+) -> Tuple[DataProfileAccumulator, float]:
+    """
+    Build and time the mergeable profile of one batch member (process pool entry point)
+    """
+    started = time.perf_counter()
+    accumulator = HandleFileService.build_data_accumulator(path, file_type, options)
+    return accumulator, time.perf_counter() - started
+
+
+class _ExtractionBudget:
+    """
+    Caps how many members and bytes an archive may expand into
+    """
+
+    def __init__(self, max_files: int, max_bytes: int):
+        self.files_left = max_files
+        self.bytes_left = max_bytes
+
+    def claim_file(self) -> None:
+        self.files_left -= 1
+        if self.files_left < 0:
+            raise BatchInputError("Batch contains too many files")
+
+    def copy(self, source, target) -> None:
+        # Count bytes actually written; archive headers can lie about sizes
+        while True:
+            block = source.read(SPOOL_COPY_BUFFER_SIZE)
+            if not block:
+                return
+            self.bytes_left -= len(block)
+            if self.bytes_left < 0:
+                raise BatchInputError("Batch expands beyond the extracted size limit")
+            target.write(block)
+
+
+class BatchProfileService:
+    """
+    Business logic for profiling several files, or one archive, as a single batch
+    """
+
+    def __init__(self, handle_file_service: HandleFileService = None):
+        self.handle_file_service = handle_file_service or HandleFileService()
+
+    async def spool_batch(self, files: List[UploadFile], directory: str) -> List[BatchMember]:
+        """
+        Spool uploads into the batch directory, expanding a single archive into its members
+        """
+        file_types = [file_type_of(file.filename or "") for file in files]
+
+        if len(files) == 1 and file_types[0] in ARCHIVE_FILE_TYPES:
+            archive_path, _ = await self.handle_file_service.spool_upload(files[0], file_types[0], directory)
+            members = await run_in_threadpool(self._extract_archive, archive_path, file_types[0], directory)
+            os.remove(archive_path)
+        else:
+            unsupported = [file.filename for file, file_type in zip(files, file_types) if file_type not in VALID_FILE_TYPES]
+            if unsupported:
+                raise BatchInputError(
+                    f"Unsupported files {unsupported}; upload {', '.join(VALID_FILE_TYPES)} files or a single archive")
+            if len(files) > settings.BATCH_MAX_FILES:
+                raise BatchInputError("Batch contains too many files")
+            members = []
+            for file, file_type in zip(files, file_types):
+                path, _ = await self.handle_file_service.spool_upload(file, file_type, directory)
+                members.append(BatchMember(file.filename, path, file_type))
+
+        if not members:
+            raise BatchInputError(f"Batch contains no {', '.join(VALID_FILE_TYPES)} files")
+        return members
+
+    @staticmethod
+    def _extract_archive(archive_path: str, archive_type: str, directory: str) -> List[BatchMember]:
+        """
+        Stream supported archive members to spool files; member paths are only used as labels
+        """
+        budget = _ExtractionBudget(settings.BATCH_MAX_FILES, settings.BATCH_MAX_EXTRACTED_BYTES)
+        members = []
+
+        def spool(name: str, source) -> None:
+            file_type = file_type_of(name)
+            if file_type not in VALID_FILE_TYPES:
+                logger.info(f"Skipping unsupported batch member {name}")
+                return
+            budget.claim_file()
+            handle, path = tempfile.mkstemp(prefix="batch-member-", suffix=file_type, dir=directory)
+            with os.fdopen(handle, "wb") as target:
+                budget.copy(source, target)
+            members.append(BatchMember(name, path, file_type))
+
+        try:
+            if archive_type == '.zip':
+                with zipfile.ZipFile(archive_path) as archive:
+                    for info in archive.infolist():
+                        if not info.is_dir():
+                            with archive.open(info) as source:
+                                spool(info.filename, source)
+            else:
+                with tarfile.open(archive_path) as archive:
+                    for info in archive:
+                        if info.isfile():
+                            spool(info.name, archive.extractfile(info))
+        except (zipfile.BadZipFile, tarfile.TarError) as e:
+            raise BatchInputError(f"Could not read archive: {str(e)}")
+
+        return members
+
+    async def summarize_batch(
+        self,
+        files: List[UploadFile],
+        options: Optional[DataSummaryOptions] = None,
+        job_manager: Optional[DataSummaryJobManager] = None,
+        output_format: str = "text"
+    ) -> bytes:
+        """
+        Profile every batch member in parallel and render per-file reports plus a merged report
+
+        With a job manager the members run on its pool while the batch holds one of its job
+        slots; without one they run on the default thread pool
+        """
+        options = options or DataSummaryOptions()
+        directory = tempfile.mkdtemp(prefix="data-summary-batch-", dir=settings.UPLOAD_SPOOL_DIR)
+        try:
+            members = await self.spool_batch(files, directory)
+            logger.info(f"Profiling batch of {len(members)} files")
+            loop = asyncio.get_running_loop()
+            # Spooling only waits on the upload, so the slot is taken for the profiling alone
+            async with job_manager.slot() if job_manager is not None else nullcontext() as executor:
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(executor, accumulate_file, member.path, member.file_type, options)
+                    for member in members
+                ))
+        finally:
+            await run_in_threadpool(shutil.rmtree, directory, True)
+
+        # Merging and rendering are pandas work too, so keep them off the event loop
+        return await run_in_threadpool(self.render_batch_summary, members, results, options, output_format)
+
+    @staticmethod
+    def render_batch_summary(
+        members: List[BatchMember],
+        results: List[Tuple[DataProfileAccumulator, float]],
+        options: DataSummaryOptions,
+        output_format: str = "text"
+    ) -> bytes:
+        """
+        Render per-file reports followed by one report merged from the per-file accumulators
+        """
+        # Finish every per-file profile before merging, since merging mutates accumulators in place
+        file_profiles = [
+            SheetProfile(member.name, accumulator.finalize(), seconds)
+            for member, (accumulator, seconds) in zip(members, results)
+        ]
+        merged = DataProfileAccumulator(options)
+        for accumulator, _ in results:
+            merged.merge(accumulator)
+
+        merged_profile = merged.finalize()
+        if output_format != "text":
+            return encode_document({
+                "files": sections_document(file_profiles, "file"),
+                "merged": profile_document(merged_profile),
+            }, output_format)
+
+        summary_lines = [f"\n📦 BATCH: {len(file_profiles)} files, {merged_profile.total_records} records"]
+        summary_lines.append(HandleFileService.render_sheet_summaries(file_profiles, label="file"))
+        summary_lines.append(f"\n{'=' * 60}\n🧮 MERGED ACROSS ALL FILES\n{'=' * 60}")
+        summary_lines.append(HandleFileService.render_summary(merged_profile))
+        return "\n".join(summary_lines).encode("utf-8")
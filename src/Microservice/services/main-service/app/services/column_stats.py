@@ -0,0 +1,597 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.datetime_parsing import (
+    DatetimeFormat,
+    datetime_format_cache,
+    infer_datetime_format,
+    is_time_like,
+    parse_datetimes,
+)
+from app.services.sketches import (
+    DistinctValueSample,
+    HyperLogLog,
+    SpaceSavingSketch,
+    TDigest,
+    describe_error_bounds,
+    hash_values,
+)
+
+PREVIEW_ROW_COUNT = 10
+SAMPLE_VALUE_COUNT = 3
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _merge_dtype(current: Optional[Any], new: Any) -> Any:
+    """
+    Resolve the dtype a column would have had if all chunks were read at once
+    """
+    if current is None or current == new:
+        return new
+    # Each chunk infers its own categories; the column is still categorical overall
+    if isinstance(current, pd.CategoricalDtype) and isinstance(new, pd.CategoricalDtype):
+        return pd.CategoricalDtype()
+    if (
+        pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(new)
+        and not pd.api.types.is_bool_dtype(current) and not pd.api.types.is_bool_dtype(new)
+    ):
+        try:
+            return np.promote_types(current, new)
+        except TypeError:
+            pass
+    return np.dtype(object)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+def _min_value(current: Any, new: Any) -> Any:
+    if _is_missing(new):
+        return current
+    if _is_missing(current):
+        return new
+    return min(current, new)
+
+
+def _max_value(current: Any, new: Any) -> Any:
+    if _is_missing(new):
+        return current
+    if _is_missing(current):
+        return new
+    return max(current, new)
+
+
+class ColumnAccumulator:
+    """
+    Mergeable per-column statistics folded chunk by chunk
+
+    The frequency table holds every distinct value, so its memory grows with the column's
+    cardinality; DataProfileAccumulator bounds it with the exact_max_distinct option
+    """
+
+    def __init__(self, name: Any, datetime_format: Optional[DatetimeFormat] = None):
+        self.name = name
+        self.dtype = None
+        self.non_null_count = 0
+        self.null_count = 0
+        self.value_counts = pd.Series(dtype="int64")
+        self.sample_values: List[str] = []
+        self.minimum = None
+        self.maximum = None
+        self.datetime_min = None
+        self.datetime_max = None
+        # Fixed format used for every chunk of a time-like column, and how many values it could not parse
+        self.datetime_format = datetime_format
+        self.datetime_failed_count = 0
+
+    @property
+    def is_time_like(self) -> bool:
+        return is_time_like(self.name)
+
+    def update(self, series: pd.Series) -> None:
+        """
+        Fold one chunk of the column into the accumulator
+
+        A single hash pass builds the chunk's frequency table in order of first
+        appearance; null count, samples, extremes and datetime range are then
+        derived from its (usually much smaller) index instead of rescanning rows
+        """
+        counts = series.value_counts(dropna=True, sort=False)
+        if isinstance(counts.index, pd.CategoricalIndex):
+            # Counted on the codes; drop categories absent from this chunk and keep plain values
+            counts = counts[counts > 0]
+            counts.index = counts.index.astype(counts.index.categories.dtype)
+        non_null_count = int(counts.sum())
+
+        # An all-null chunk is parsed as float64 and says nothing about the real dtype
+        if non_null_count:
+            self.dtype = _merge_dtype(self.dtype, series.dtype)
+
+        self.non_null_count += non_null_count
+        self.null_count += len(series) - non_null_count
+
+        if len(self.sample_values) < SAMPLE_VALUE_COUNT:
+            for value in counts.index[:SAMPLE_VALUE_COUNT * 2].astype(str):
+                if value not in self.sample_values:
+                    self.sample_values.append(value)
+                if len(self.sample_values) >= SAMPLE_VALUE_COUNT:
+                    break
+
+        self._add_counts(counts)
+
+        if counts.empty:
+            return
+        if pd.api.types.is_numeric_dtype(series):
+            self.minimum = _min_value(self.minimum, counts.index.min())
+            self.maximum = _max_value(self.maximum, counts.index.max())
+            if self.is_time_like and not pd.api.types.is_bool_dtype(series):
+                self._update_datetimes(counts, numeric=True)
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            self.datetime_min = _min_value(self.datetime_min, counts.index.min())
+            self.datetime_max = _max_value(self.datetime_max, counts.index.max())
+        elif self.is_time_like:
+            self._update_datetimes(counts, numeric=False)
+
+    def _update_datetimes(self, counts: pd.Series, numeric: bool) -> None:
+        """
+        Parse the chunk's distinct values with the column's fixed format, inferring it on first use
+        """
+        if self.datetime_format is None:
+            self.datetime_format = infer_datetime_format(counts.index)
+            if self.datetime_format is None:
+                # Numbers that are not epochs (durations, counters) are simply not timestamps
+                if not numeric:
+                    self.datetime_failed_count += int(counts.sum())
+                return
+
+        parsed, failed = parse_datetimes(counts.index, self.datetime_format)
+        if failed.all():
+            # A format carried over from another file or chunk may not fit this one
+            inferred = infer_datetime_format(counts.index)
+            if inferred is not None and inferred != self.datetime_format:
+                self.datetime_format = inferred
+                parsed, failed = parse_datetimes(counts.index, inferred)
+
+        self.datetime_failed_count += int(counts.to_numpy()[failed].sum())
+        parsed = parsed[~failed]
+        if not parsed.empty:
+            self.datetime_min = _min_value(self.datetime_min, parsed.min())
+            self.datetime_max = _max_value(self.datetime_max, parsed.max())
+
+    def merge(self, other: "ColumnAccumulator") -> None:
+        """
+        Merge another accumulator for the same column into this one
+        """
+        if other.dtype is not None:
+            self.dtype = _merge_dtype(self.dtype, other.dtype)
+        self.non_null_count += other.non_null_count
+        self.null_count += other.null_count
+        for value in other.sample_values:
+            if len(self.sample_values) >= SAMPLE_VALUE_COUNT:
+                break
+            if value not in self.sample_values:
+                self.sample_values.append(value)
+        self._merge_counts(other)
+        self.minimum = _min_value(self.minimum, other.minimum)
+        self.maximum = _max_value(self.maximum, other.maximum)
+        self.datetime_min = _min_value(self.datetime_min, other.datetime_min)
+        self.datetime_max = _max_value(self.datetime_max, other.datetime_max)
+        self.datetime_format = self.datetime_format or other.datetime_format
+        self.datetime_failed_count += other.datetime_failed_count
+
+    @property
+    def datetime_failed(self) -> bool:
+        return self.datetime_format is None and self.datetime_failed_count > 0
+
+    def _datetime_description(self) -> Optional[str]:
+        return self.datetime_format.describe() if self.datetime_format is not None else None
+
+    def _add_counts(self, counts: pd.Series) -> None:
+        # Keep first-appearance order so ties rank the same as a whole-file value_counts()
+        if self.value_counts.empty:
+            self.value_counts = counts
+        else:
+            self.value_counts = pd.concat([self.value_counts, counts]).groupby(level=0, sort=False).sum()
+
+    def _merge_counts(self, other: "ColumnAccumulator") -> None:
+        self._add_counts(other.value_counts)
+
+    def finalize(self) -> "ColumnStats":
+        """
+        Sort the frequency table once and derive every report figure from it
+        """
+        counts = self.value_counts.astype("int64").sort_values(ascending=False, kind="stable")
+        counts.index.name = self.name
+        counts.name = "count"
+
+        # Matches Series.is_unique, which counts NaN as a single value
+        is_unique = self.null_count <= 1 and (counts.empty or int(counts.iloc[0]) <= 1)
+
+        return ColumnStats(
+            name=self.name,
+            dtype=self.dtype,
+            non_null_count=self.non_null_count,
+            null_count=self.null_count,
+            sample_values=list(self.sample_values),
+            is_unique=is_unique,
+            value_counts=counts,
+            unique_count=int(counts.shape[0]),
+            median_frequency=counts.median(),
+            minimum=self.minimum,
+            maximum=self.maximum,
+            datetime_min=self.datetime_min,
+            datetime_max=self.datetime_max,
+            datetime_failed=self.datetime_failed,
+            datetime_format=self._datetime_description(),
+            datetime_failed_count=self.datetime_failed_count,
+        )
+
+
+class SketchColumnAccumulator(ColumnAccumulator):
+    """
+    Column accumulator that keeps fixed-size sketches instead of a full frequency table
+    """
+
+    def __init__(self, name: Any, options: DataSummaryOptions, datetime_format: Optional[DatetimeFormat] = None):
+        super().__init__(name, datetime_format)
+        self.distinct = HyperLogLog(options.hll_precision)
+        self.top_values = SpaceSavingSketch(options.top_k_capacity)
+        self.frequency_sample = DistinctValueSample(options.frequency_sample_size)
+        self.quantiles = TDigest(options.tdigest_compression)
+
+    @classmethod
+    def from_exact(cls, accumulator: ColumnAccumulator, options: DataSummaryOptions) -> "SketchColumnAccumulator":
+        """
+        Continue an exact column with sketches, seeded from its frequency table
+        """
+        sketch = cls(accumulator.name, options, accumulator.datetime_format)
+        for attribute, value in vars(accumulator).items():
+            if attribute != "value_counts":
+                setattr(sketch, attribute, copy.copy(value))
+        sketch._add_counts(accumulator.value_counts)
+        return sketch
+
+    def _add_counts(self, counts: pd.Series) -> None:
+        if counts.empty:
+            return
+        hashes = hash_values(counts.index)
+        self.distinct.update_hashes(hashes)
+        self.frequency_sample.update(hashes, counts.to_numpy())
+        self.top_values.update_counts(counts)
+        if pd.api.types.is_numeric_dtype(counts.index) and not pd.api.types.is_bool_dtype(counts.index):
+            self.quantiles.update(counts.index.to_numpy(), counts.to_numpy())
+
+    def _merge_counts(self, other: "SketchColumnAccumulator") -> None:
+        self.distinct.merge(other.distinct)
+        self.frequency_sample.merge(other.frequency_sample)
+        self.top_values.merge(other.top_values)
+        self.quantiles.merge(other.quantiles)
+
+    def finalize(self) -> "ColumnStats":
+        """
+        Report exact figures while every distinct value fits in the summary, estimates after that
+        """
+        if not self.top_values.is_saturated:
+            self.value_counts = self.top_values.counts
+            stats = super().finalize()
+        else:
+            counts = self.top_values.top(self.top_values.capacity)
+            counts.index.name = self.name
+            counts.name = "count"
+            guaranteed = counts - self.top_values.errors.loc[counts.index]
+            stats = ColumnStats(
+                name=self.name,
+                dtype=self.dtype,
+                non_null_count=self.non_null_count,
+                null_count=self.null_count,
+                sample_values=list(self.sample_values),
+                is_unique=self.null_count <= 1 and int(guaranteed.max()) <= 1,
+                value_counts=counts,
+                unique_count=min(int(round(self.distinct.estimate())), self.non_null_count),
+                median_frequency=self.frequency_sample.median_frequency(),
+                minimum=self.minimum,
+                maximum=self.maximum,
+                datetime_min=self.datetime_min,
+                datetime_max=self.datetime_max,
+                datetime_failed=self.datetime_failed,
+                datetime_format=self._datetime_description(),
+                datetime_failed_count=self.datetime_failed_count,
+                approximate=True,
+                distinct_error=self.distinct.relative_error,
+                frequency_error=self.top_values.error_bound,
+            )
+        if len(self.quantiles.means) and stats.is_numeric:
+            stats.quantiles = {q: self.quantiles.quantile(q) for q in QUANTILES}
+        return stats
+
+
+@dataclass
+class ColumnStats:
+    """
+    Final statistics of one column, shared by every report section
+    """
+    name: Any
+    dtype: Any
+    non_null_count: int
+    null_count: int
+    sample_values: List[str]
+    is_unique: bool
+    value_counts: pd.Series
+    unique_count: int
+    median_frequency: float
+    minimum: Any = None
+    maximum: Any = None
+    datetime_min: Any = None
+    datetime_max: Any = None
+    datetime_failed: bool = False
+    datetime_format: Optional[str] = None
+    datetime_failed_count: int = 0
+    approximate: bool = False
+    distinct_error: Optional[float] = None
+    frequency_error: int = 0
+    quantiles: Optional[Dict[float, float]] = None
+
+    @property
+    def is_numeric(self) -> bool:
+        return pd.api.types.is_numeric_dtype(self.dtype)
+
+    @property
+    def is_datetime_like(self) -> bool:
+        return pd.api.types.is_datetime64_any_dtype(self.dtype) or is_time_like(self.name)
+
+    def top_values(self, count: int) -> Dict[Any, int]:
+        return self.value_counts.head(count).to_dict()
+
+
+@dataclass
+class ColumnMetadata:
+    """
+    What a file's own metadata says about a column that was not loaded
+    """
+    name: Any
+    dtype: str
+    null_count: Optional[int] = None
+    minimum: Any = None
+    maximum: Any = None
+
+    def merge(self, other: "ColumnMetadata") -> None:
+        # A figure survives only if both files could answer it
+        if self.null_count is None or other.null_count is None:
+            self.null_count = None
+        else:
+            self.null_count += other.null_count
+        if self.minimum is None or other.minimum is None:
+            self.minimum = self.maximum = None
+        else:
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+
+
+@dataclass
+class MemoryFootprint:
+    """
+    Per-row DataFrame memory under default and inferred dtypes, measured on a sample
+    """
+    sample_rows: int
+    default_bytes_per_row: float
+    optimized_bytes_per_row: float
+    categorical_columns: List[str] = field(default_factory=list)
+    datetime_columns: List[str] = field(default_factory=list)
+
+    def merge(self, other: "MemoryFootprint", records: int, other_records: int) -> None:
+        """
+        Combine with the footprint of another file, weighting each by its record count
+        """
+        total = max(records + other_records, 1)
+        self.default_bytes_per_row = (
+            self.default_bytes_per_row * records + other.default_bytes_per_row * other_records) / total
+        self.optimized_bytes_per_row = (
+            self.optimized_bytes_per_row * records + other.optimized_bytes_per_row * other_records) / total
+        self.sample_rows += other.sample_rows
+        for column in other.categorical_columns:
+            if column not in self.categorical_columns:
+                self.categorical_columns.append(column)
+        for column in other.datetime_columns:
+            if column not in self.datetime_columns:
+                self.datetime_columns.append(column)
+
+
+@dataclass
+class SampleInfo:
+    """
+    How the rows behind a sample-mode profile were drawn from the file
+    """
+    head_rows: int
+    random_rows: int
+    method: str
+    total_records_estimated: bool = False
+
+
+@dataclass
+class CompressionInfo:
+    """
+    Sizes of a compressed upload on both sides and the time spent decompressing it
+    """
+    codec: str
+    compressed_bytes: int
+    uncompressed_bytes: int
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.uncompressed_bytes / self.compressed_bytes if self.compressed_bytes else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.uncompressed_bytes / self.seconds if self.seconds else 0.0
+
+    def merge(self, other: "CompressionInfo") -> None:
+        """
+        Combine with the figures of another compressed file
+        """
+        if other.codec != self.codec:
+            self.codec = "mixed"
+        self.compressed_bytes += other.compressed_bytes
+        self.uncompressed_bytes += other.uncompressed_bytes
+        self.seconds += other.seconds
+
+
+@dataclass
+class DataProfile:
+    """
+    Finished profile of a file, ready to be rendered
+    """
+    preview_rows: List[Tuple[Any, List[Any]]]
+    total_records: int
+    columns: List[ColumnStats] = field(default_factory=list)
+    error_bounds: List[Tuple[str, str]] = field(default_factory=list)
+    unloaded_columns: List[ColumnMetadata] = field(default_factory=list)
+    memory_footprint: Optional[MemoryFootprint] = None
+    sample: Optional[SampleInfo] = None
+    compression: Optional[CompressionInfo] = None
+
+    def column(self, name: Any) -> Optional[ColumnStats]:
+        for stats in self.columns:
+            if stats.name == name:
+                return stats
+        return None
+
+
+class DataProfileAccumulator:
+    """
+    Streaming profile of a tabular file built from mergeable column accumulators
+    """
+
+    def __init__(self, options: Optional[DataSummaryOptions] = None):
+        self.options = options or DataSummaryOptions()
+        self.preview_rows: List[Tuple[Any, List[Any]]] = []
+        self.total_records = 0
+        self.columns: Dict[Any, ColumnAccumulator] = {}
+        self.unloaded_columns: List[ColumnMetadata] = []
+        self.memory_footprint: Optional[MemoryFootprint] = None
+        self.compression: Optional[CompressionInfo] = None
+        # Column layout of the source, and the datetime formats known for it before profiling
+        self.schema_columns: Optional[List[Any]] = None
+        self.datetime_formats: Dict[Any, DatetimeFormat] = {}
+
+    def add_datetime_formats(self, formats: Dict[Any, DatetimeFormat]) -> None:
+        """
+        Record formats already inferred upstream, e.g. by dtype inference, so columns report them
+        """
+        for column, datetime_format in formats.items():
+            self.datetime_formats[column.strip() if isinstance(column, str) else column] = datetime_format
+
+    def _new_column(self, name: Any) -> ColumnAccumulator:
+        datetime_format = self.datetime_formats.get(name)
+        if self.options.mode == "approximate":
+            return SketchColumnAccumulator(name, self.options, datetime_format)
+        return ColumnAccumulator(name, datetime_format)
+
+    def _bound_column(self, column: Any) -> None:
+        """
+        Switch an exact column to sketches once its frequency table passes exact_max_distinct
+
+        Checked after every chunk, so a column's table peaks at the bound plus one chunk's distinct values
+        """
+        accumulator = self.columns[column]
+        limit = self.options.exact_max_distinct
+        if limit and not isinstance(accumulator, SketchColumnAccumulator) and len(accumulator.value_counts) > limit:
+            self.columns[column] = SketchColumnAccumulator.from_exact(accumulator, self.options)
+
+    @property
+    def has_sketch_columns(self) -> bool:
+        return any(isinstance(accumulator, SketchColumnAccumulator) for accumulator in self.columns.values())
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold one chunk of rows into the profile
+        """
+        if len(self.preview_rows) < PREVIEW_ROW_COUNT:
+            remaining = PREVIEW_ROW_COUNT - len(self.preview_rows)
+            for index, row in chunk.head(remaining).iterrows():
+                self.preview_rows.append((index, list(row)))
+
+        chunk = chunk.dropna(how='all')
+        chunk.columns = [column.strip() if isinstance(column, str) else column for column in chunk.columns]
+        self.total_records += len(chunk)
+
+        if self.schema_columns is None:
+            # Files with the same layout reuse the formats inferred for it last time
+            self.schema_columns = list(chunk.columns)
+            for column, datetime_format in datetime_format_cache.get(self.schema_columns).items():
+                self.datetime_formats.setdefault(column, datetime_format)
+
+        for column in chunk.columns:
+            if column not in self.columns:
+                self.columns[column] = self._new_column(column)
+            self.columns[column].update(chunk[column])
+            self._bound_column(column)
+
+    def merge(self, other: "DataProfileAccumulator") -> None:
+        """
+        Merge a profile of additional rows with the same layout into this one
+        """
+        for index, values in other.preview_rows:
+            if len(self.preview_rows) >= PREVIEW_ROW_COUNT:
+                break
+            self.preview_rows.append((index, values))
+        if self.memory_footprint is None:
+            self.memory_footprint = copy.deepcopy(other.memory_footprint)
+        elif other.memory_footprint is not None:
+            self.memory_footprint.merge(other.memory_footprint, self.total_records, other.total_records)
+        if self.compression is None:
+            self.compression = copy.deepcopy(other.compression)
+        elif other.compression is not None:
+            self.compression.merge(other.compression)
+        self.total_records += other.total_records
+        for column, accumulator in other.columns.items():
+            if column not in self.columns:
+                self.columns[column] = accumulator
+                continue
+            # An exact column merges into a sketched one by seeding sketches from its frequency table
+            current = self.columns[column]
+            if isinstance(accumulator, SketchColumnAccumulator) and not isinstance(current, SketchColumnAccumulator):
+                current = self.columns[column] = SketchColumnAccumulator.from_exact(current, self.options)
+            elif isinstance(current, SketchColumnAccumulator) and not isinstance(accumulator, SketchColumnAccumulator):
+                accumulator = SketchColumnAccumulator.from_exact(accumulator, self.options)
+            current.merge(accumulator)
+            self._bound_column(column)
+        known = {metadata.name: metadata for metadata in self.unloaded_columns}
+        for metadata in other.unloaded_columns:
+            if metadata.name in known:
+                known[metadata.name].merge(metadata)
+            else:
+                self.unloaded_columns.append(copy.deepcopy(metadata))
+
+    def finalize(self) -> DataProfile:
+        """
+        Finish the profile, keeping only columns that hold at least one value
+        """
+        if self.schema_columns is not None:
+            datetime_format_cache.put(self.schema_columns, {
+                str(column): accumulator.datetime_format
+                for column, accumulator in self.columns.items()
+                if accumulator.datetime_format is not None
+            })
+        return DataProfile(
+            preview_rows=list(self.preview_rows),
+            total_records=self.total_records,
+            columns=[
+                accumulator.finalize()
+                for accumulator in self.columns.values()
+                if accumulator.non_null_count > 0
+            ],
+            error_bounds=describe_error_bounds(
+                self.options.hll_precision,
+                self.options.top_k_capacity,
+                self.options.tdigest_compression,
+                self.options.frequency_sample_size,
+            ) if self.options.mode == "approximate" or self.has_sketch_columns else [],
+            unloaded_columns=list(self.unloaded_columns),
+            memory_footprint=self.memory_footprint,
+            compression=self.compression,
+        )
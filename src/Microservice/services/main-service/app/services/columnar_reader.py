@@ -0,0 +1,220 @@
+from typing import Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from app.services.column_stats import ColumnMetadata
+
+PARQUET_FILE_TYPES = ('.parquet',)
+ARROW_IPC_FILE_TYPES = ('.feather', '.arrow')
+# Sample mode decodes at most this many times the sample size from the chosen Parquet row groups
+PARQUET_SAMPLE_SCAN_FACTOR = 10
+PARQUET_SAMPLE_BATCH_ROWS = 65536
+
+
+class UnknownColumnsError(ValueError):
+    """
+    Raised when a caller asks for columns the file does not have
+    """
+
+
+def _open_ipc(path: str):
+    # Feather v2 is the Arrow IPC file format; fall back to the streaming format for .arrow streams
+    source = pa.memory_map(path, "r")
+    try:
+        return ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return ipc.open_stream(source)
+
+
+def _iter_ipc_batches(path: str) -> Iterator[pa.RecordBatch]:
+    reader = _open_ipc(path)
+    if isinstance(reader, ipc.RecordBatchFileReader):
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index)
+    else:
+        yield from reader
+
+
+def read_schema(path: str, file_type: str) -> pa.Schema:
+    if file_type in PARQUET_FILE_TYPES:
+        return pq.ParquetFile(path, memory_map=True).schema_arrow
+    return _open_ipc(path).schema
+
+
+def count_rows(path: str, file_type: str) -> Optional[int]:
+    """
+    Row count from file metadata, without decoding any data; None for Arrow IPC streams
+    """
+    if file_type in PARQUET_FILE_TYPES:
+        return pq.ParquetFile(path, memory_map=True).metadata.num_rows
+    reader = _open_ipc(path)
+    if not isinstance(reader, ipc.RecordBatchFileReader):
+        return None
+    return sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+
+
+def resolve_columns(schema: pa.Schema, columns: Optional[Sequence[str]]) -> List[str]:
+    """
+    Return the columns to load, checking a caller's projection against the schema
+    """
+    if not columns:
+        return list(schema.names)
+    missing = [column for column in columns if column not in schema.names]
+    if missing:
+        raise UnknownColumnsError(f"Unknown columns: {missing}")
+    return list(dict.fromkeys(columns))
+
+
+def iter_columnar_chunks(
+    path: str,
+    file_type: str,
+    columns: Sequence[str],
+    batch_size: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield memory-mapped record batches of the projected columns as DataFrames
+
+    Only the projected column chunks are decoded; Arrow buffers are mapped from
+    the file rather than read into memory, and converted batch by batch
+    """
+    if file_type in PARQUET_FILE_TYPES:
+        batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size, columns=list(columns))
+    else:
+        batches = (batch.select(list(columns)) for batch in _iter_ipc_batches(path))
+
+    offset = 0
+    for batch in batches:
+        frame = batch.to_pandas(split_blocks=True)
+        # Keep row numbers continuous across batches, as chunked read_csv does
+        frame.index = pd.RangeIndex(offset, offset + len(frame))
+        offset += len(frame)
+        yield frame
+
+
+def sample_columnar_rows(
+    path: str,
+    file_type: str,
+    columns: Sequence[str],
+    head_rows: int,
+    sample_rows: int,
+    seed: int = 0
+) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    Read the leading rows plus a random sample of the rest, returning both and the exact row count
+
+    Parquet decodes only randomly chosen row groups (so the sample is clustered by
+    row group), streamed and stopped once the sampled rows are taken; within a row
+    group larger than PARQUET_SAMPLE_SCAN_FACTOR samples, rows are drawn from its
+    leading part only. Arrow IPC files are memory-mapped, so only the sampled rows
+    are taken. The head rows are never drawn again
+    """
+    rng = np.random.default_rng(seed)
+    if file_type in PARQUET_FILE_TYPES:
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        total_rows = parquet_file.metadata.num_rows
+        head = next(parquet_file.iter_batches(batch_size=head_rows, columns=list(columns)), None)
+        head = head.to_pandas() if head is not None else pd.DataFrame(columns=list(columns))
+        if total_rows <= len(head):
+            return head, head.iloc[:0], total_rows
+        # Skip the first row group when there is a choice, since the head came from it
+        candidates = rng.permutation(range(1 if parquet_file.num_row_groups > 1 else 0, parquet_file.num_row_groups))
+        chosen, rows = [], 0
+        for row_group in candidates:
+            chosen.append(int(row_group))
+            rows += parquet_file.metadata.row_group(int(row_group)).num_rows
+            if rows >= sample_rows:
+                break
+        chosen.sort()
+        first_row = len(head) if chosen[0] == 0 else 0
+        population = min(rows - first_row, sample_rows * PARQUET_SAMPLE_SCAN_FACTOR)
+        indices = np.sort(first_row + rng.choice(population, min(sample_rows, population), replace=False))
+        batches = parquet_file.iter_batches(
+            batch_size=PARQUET_SAMPLE_BATCH_ROWS, row_groups=chosen, columns=list(columns))
+        sample = _take_streamed(batches, indices, head)
+    else:
+        table = _open_ipc(path).read_all().select(list(columns))
+        total_rows = table.num_rows
+        head = table.slice(0, head_rows).to_pandas()
+        population = table.num_rows - len(head)
+        indices = np.sort(len(head) + rng.choice(population, min(sample_rows, population), replace=False))
+        sample = table.take(pa.array(indices)).to_pandas()
+
+    sample.index = pd.RangeIndex(len(head), len(head) + len(sample))
+    return head, sample, total_rows
+
+
+def _take_streamed(batches: Iterator[pa.RecordBatch], indices: np.ndarray, head: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rows at the sorted indices of a batch stream, which is not read past the last of them
+    """
+    taken, offset = [], 0
+    if not len(indices):
+        return head.iloc[:0]
+    for batch in batches:
+        if offset > indices[-1]:
+            break
+        wanted = indices[(indices >= offset) & (indices < offset + batch.num_rows)] - offset
+        if len(wanted):
+            taken.append(batch.take(pa.array(wanted)))
+        offset += batch.num_rows
+    if not taken:
+        return head.iloc[:0]
+    return pa.Table.from_batches(taken).to_pandas()
+
+
+def read_column_metadata(path: str, file_type: str, columns: Sequence[str]) -> List[ColumnMetadata]:
+    """
+    Describe columns without decoding their values
+
+    Parquet answers null counts and min/max from row-group statistics in the
+    footer; Arrow IPC only records null counts in its batch headers
+    """
+    if not columns:
+        return []
+
+    if file_type in PARQUET_FILE_TYPES:
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        schema = parquet_file.schema_arrow
+        metadata = parquet_file.metadata
+        paths = [metadata.schema.column(index).path for index in range(metadata.num_columns)]
+        described = []
+        for name in columns:
+            column = ColumnMetadata(name=name, dtype=str(schema.field(name).type))
+            if name in paths:
+                _fold_row_group_statistics(column, metadata, paths.index(name))
+            described.append(column)
+        return described
+
+    reader_schema = read_schema(path, file_type)
+    described = {name: ColumnMetadata(name=name, dtype=str(reader_schema.field(name).type), null_count=0) for name in columns}
+    for batch in _iter_ipc_batches(path):
+        for name, column in described.items():
+            column.null_count += batch.column(name).null_count
+    return list(described.values())
+
+
+def _fold_row_group_statistics(column: ColumnMetadata, metadata: pq.FileMetaData, index: int) -> None:
+    # A figure is only reported when every row group carries it
+    null_count = 0
+    minimum = maximum = None
+    has_null_count = has_min_max = True
+    for row_group in range(metadata.num_row_groups):
+        statistics = metadata.row_group(row_group).column(index).statistics
+        if statistics is None:
+            return
+        if has_null_count and statistics.has_null_count:
+            null_count += statistics.null_count
+        else:
+            has_null_count = False
+        if has_min_max and statistics.has_min_max:
+            minimum = statistics.min if minimum is None else min(minimum, statistics.min)
+            maximum = statistics.max if maximum is None else max(maximum, statistics.max)
+        elif statistics.null_count != metadata.row_group(row_group).num_rows:
+            # All-null row groups legitimately have no min/max
+            has_min_max = False
+    column.null_count = null_count if has_null_count else None
+    if has_min_max:
+        column.minimum, column.maximum = minimum, maximum
@@ -0,0 +1,80 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import time
+from typing import BinaryIO
+import zstandard
+from app.services.column_stats import CompressionInfo
+
+# Codec per compressed CSV suffix; the spooled file stays compressed on disk
+COMPRESSION_CODECS = {
+    '.csv.gz': 'gzip',
+    '.csv.zst': 'zstd',
+    '.csv.bz2': 'bzip2',
+    '.csv.xz': 'xz',
+}
+
+
+class DecompressionLimitError(ValueError):
+    """
+    Raised when a compressed upload expands beyond the configured maximum size
+    """
+
+
+def _open_codec(codec: str, compressed: BinaryIO) -> BinaryIO:
+    # Every codec reads concatenated streams/frames, as produced by parallel compressors such as pigz and zstd -T
+    if codec == 'gzip':
+        return gzip.GzipFile(fileobj=compressed, mode="rb")
+    if codec == 'bzip2':
+        return bz2.BZ2File(compressed, mode="rb")
+    if codec == 'xz':
+        return lzma.LZMAFile(compressed, mode="rb")
+    return zstandard.ZstdDecompressor().stream_reader(compressed, read_across_frames=True)
+
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Binary stream over a compressed file that decompresses only as the parser pulls bytes,
+    so the uncompressed file is never held in memory or written to disk
+
+    Counts the bytes produced and the time spent producing them; compressed_handle's
+    position tells how much of the file on disk has been consumed
+    """
+
+    def __init__(self, path: str, file_type: str, max_bytes: int = 0):
+        super().__init__()
+        self.codec = COMPRESSION_CODECS[file_type]
+        self.max_bytes = max_bytes
+        self.compressed_bytes = os.path.getsize(path)
+        self.compressed_handle = open(path, "rb")
+        self._stream = _open_codec(self.codec, self.compressed_handle)
+        self.uncompressed_bytes = 0
+        self.seconds = 0.0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        started = time.perf_counter()
+        data = self._stream.read(len(buffer))
+        self.seconds += time.perf_counter() - started
+        self.uncompressed_bytes += len(data)
+        if self.max_bytes and self.uncompressed_bytes > self.max_bytes:
+            raise DecompressionLimitError(f"Upload expands beyond the maximum size of {self.max_bytes} bytes")
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+            self.compressed_handle.close()
+        super().close()
+
+    def info(self) -> CompressionInfo:
+        """
+        Sizes on both sides and decompression time for everything read so far
+        """
+        return CompressionInfo(self.codec, self.compressed_bytes, self.uncompressed_bytes, self.seconds)
+
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from shared.utils import get_logger
+from app.core.config import settings
+from app.schemas.crudExample import CrudExampleResponse
+
+logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+# Bump whenever CrudExampleResponse changes shape so a shared backend never serves stale payloads
+CACHE_FORMAT_VERSION = "1"
+
+CrudExamplePage = Tuple[List[CrudExampleResponse], Optional[str]]
+
+
+class CacheBackend(ABC):
+    """
+    Shared store behind the in-process tier, so every worker sees the same entries and search version
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Process-local stand-in for a shared backend, for tests and single-worker deployments
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._values[key] = (value, time.monotonic() + ttl_seconds if ttl_seconds > 0 else None)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._values.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self._values[key] = (str(value).encode("ascii"), None)
+        return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis as the shared backend; needs the optional redis package
+    """
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CRUD_EXAMPLE_CACHE_REDIS_URL is set but the redis package is not installed") from e
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.client.set(key, value, px=int(ttl_seconds * 1000) if ttl_seconds > 0 else None)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+
+class CrudExampleCache:
+    """
+    Read-through cache of crud example lookups and searches: an entry-bounded in-process LRU
+    with TTL in front of an optional shared backend
+
+    Writes drop the touched records and bump a search version that is part of every search key,
+    so all cached searches are invalidated at once without finding them. With a shared backend,
+    other workers' in-process copies of a record can lag a write by up to the TTL. Only the event
+    loop touches the in-process tier, so it needs no lock
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        ttl_seconds: float = 60.0,
+        backend: Optional[CacheBackend] = None,
+        namespace: str = "crudExamples"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.namespace = f"{namespace}:v{CACHE_FORMAT_VERSION}"
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._version = 0
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.backend is not None
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.backend_errors = 0
+
+    async def version(self) -> int:
+        """
+        Current search version; writes bump it
+        """
+        if self.backend is None:
+            return self._version
+        value = await self._call_backend("get", self._version_key())
+        return int(value) if value is not None else 0
+
+    async def get_item(self, example_id: int) -> Optional[CrudExampleResponse]:
+        key = self._item_key(example_id)
+        payload = await self._get(key)
+        if payload is None or isinstance(payload, CrudExampleResponse):
+            return payload
+        item = CrudExampleResponse.model_validate_json(payload)
+        self._store_local(key, item)
+        return item
+
+    async def put_item(self, item: CrudExampleResponse, version: int) -> None:
+        """
+        Cache a record read at the given search version, unless a write happened since the read
+        """
+        if await self.version() != version:
+            return
+        await self._put(self._item_key(item.id), item, item.model_dump_json().encode("utf-8"))
+
+    async def get_page(self, params: Dict[str, Any], version: int) -> Optional[CrudExamplePage]:
+        key = self._search_key(params, version)
+        payload = await self._get(key)
+        if payload is None or isinstance(payload, tuple):
+            return payload
+        page = json.loads(payload)
+        items = [CrudExampleResponse.model_validate(item) for item in page["items"]]
+        self._store_local(key, (items, page["next_cursor"]))
+        return items, page["next_cursor"]
+
+    async def put_page(self, params: Dict[str, Any], version: int, page: CrudExamplePage) -> None:
+        # A write since the read bumped the version, so this key is already unreachable
+        items, next_cursor = page
+        payload = json.dumps({"items": [item.model_dump(mode="json") for item in items], "next_cursor": next_cursor})
+        await self._put(self._search_key(params, version), (list(items), next_cursor), payload.encode("utf-8"))
+
+    async def invalidate(self, example_ids: Iterable[int] = ()) -> None:
+        """
+        Drop the given records and every cached search
+        """
+        keys = [self._item_key(example_id) for example_id in example_ids]
+        for key in keys:
+            self._entries.pop(key, None)
+        if self.backend is None:
+            self._version += 1
+        else:
+            await self._call_backend("delete", *keys)
+            await self._call_backend("incr", self._version_key())
+        self.invalidations += 1
+        logger.debug(f"Invalidated {len(keys)} crud example cache entries and the cached searches")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "backend_errors": self.backend_errors,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+        }
+
+    async def _get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+
+        if self.backend is not None:
+            payload = await self._call_backend("get", key)
+            if payload is not None:
+                self.hits += 1
+                self.backend_hits += 1
+                return payload
+        self.misses += 1
+        return None
+
+    async def _put(self, key: str, value: Any, payload: bytes) -> None:
+        self._store_local(key, value)
+        if self.backend is not None:
+            await self._call_backend("set", key, payload, self.ttl_seconds)
+
+    def _store_local(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _call_backend(self, method: str, *args) -> Any:
+        # An unreachable shared cache degrades to the in-process tier instead of failing requests
+        try:
+            return await getattr(self.backend, method)(*args)
+        except Exception as e:
+            self.backend_errors += 1
+            logger.error(f"Crud example cache backend {method} failed: {str(e)}")
+            return None
+
+    def _item_key(self, example_id: int) -> str:
+        return f"{self.namespace}:item:{example_id}"
+
+    def _search_key(self, params: Dict[str, Any], version: int) -> str:
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+        return f"{self.namespace}:search:{version}:{digest}"
+
+    def _version_key(self) -> str:
+        return f"{self.namespace}:searchVersion"
+
+
+crud_example_cache = CrudExampleCache(
+    max_entries=settings.CRUD_EXAMPLE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CRUD_EXAMPLE_CACHE_TTL_SECONDS,
+    backend=RedisCacheBackend(settings.CRUD_EXAMPLE_CACHE_REDIS_URL) if settings.CRUD_EXAMPLE_CACHE_REDIS_URL else None,
+)
+
+def get_crud_example_cache() -> CrudExampleCache:
+    """Get the process-wide crud example cache"""
+    return crud_example_cache
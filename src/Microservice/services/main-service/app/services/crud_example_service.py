@@ -1,8 +1,13 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from shared.utils.logger import get_logger
 from app.repository.crud_example_repository import CrudExampleRepository
-from app.schemas.crudExample import CrudExampleResponse, CrudExampleCreate, CrudExampleUpdate
+from app.core.config import settings
+from app.services.crud_example_cache import CrudExampleCache, CrudExamplePage
+from app.schemas.crudExample import (
+    CrudExampleResponse, CrudExampleCreate, CrudExampleUpdate, CrudExampleBulkItemResult, CrudExampleBulkResponse
+)
 
 logger = get_logger(__name__)
 
@@ -10,12 +15,13 @@ class CrudExampleService:
     """
     Business logic for crud example operations using repository pattern
     """
-    def __init__(self, crud_example_repository: CrudExampleRepository = None):
+    def __init__(self, crud_example_repository: CrudExampleRepository = None, cache: Optional[CrudExampleCache] = None):
         self.crud_example_repository = crud_example_repository or CrudExampleRepository()
+        self.cache = cache
 
     async def search_crud_examples(
         self,
-        db: Session,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         isActive: Optional[bool] = None,
@@ -25,39 +31,107 @@ class CrudExampleService:
         """
         Search crud examples with optional filtering
         """
-        # Use repository for database operations
-        crud_examples = self.crud_example_repository.search_crud_example(
-            db=db,
-            skip=skip,
-            limit=limit,
-            isActive=isActive,
-            status=status,
-            search=search
-        )
-        
-        # Convert to response DTOs
-        return [CrudExampleResponse.model_validate(example) for example in crud_examples]
+        async def load() -> CrudExamplePage:
+            # Use repository for database operations
+            crud_examples = await self.crud_example_repository.search_crud_example(
+                db=db,
+                skip=skip,
+                limit=limit,
+                isActive=isActive,
+                status=status,
+                search=search
+            )
+
+            # Convert to response DTOs
+            return [CrudExampleResponse.model_validate(example) for example in crud_examples], None
+
+        params = {"mode": "offset", "skip": skip, "limit": limit, "isActive": isActive, "status": status, "search": search}
+        crud_examples, _ = await self._cached_page(params, load)
+        return crud_examples
+
+    async def search_crud_examples_ranked(
+        self,
+        db: AsyncSession,
+        search: str,
+        skip: int = 0,
+        limit: int = 100,
+        isActive: Optional[bool] = None,
+        status: Optional[int] = None
+    ) -> List[CrudExampleResponse]:
+        """
+        Full-text search of crud examples ordered by relevance
+        """
+        async def load() -> CrudExamplePage:
+            crud_examples = await self.crud_example_repository.search_crud_example_ranked(
+                db=db,
+                search=search,
+                skip=skip,
+                limit=limit,
+                isActive=isActive,
+                status=status
+            )
+            return [CrudExampleResponse.model_validate(example) for example in crud_examples], None
+
+        params = {"mode": "ranked", "skip": skip, "limit": limit, "isActive": isActive, "status": status, "search": search}
+        crud_examples, _ = await self._cached_page(params, load)
+        return crud_examples
+
+    async def search_crud_examples_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        isActive: Optional[bool] = None,
+        status: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[CrudExampleResponse], Optional[str]]:
+        """
+        Search crud examples page by page with an opaque cursor, returning the next page's cursor
+        """
+        async def load() -> CrudExamplePage:
+            crud_examples, next_cursor = await self.crud_example_repository.search_crud_example_page(
+                db=db,
+                limit=limit,
+                cursor=cursor,
+                isActive=isActive,
+                status=status,
+                search=search
+            )
+            return [CrudExampleResponse.model_validate(example) for example in crud_examples], next_cursor
+
+        params = {"mode": "keyset", "cursor": cursor, "limit": limit, "isActive": isActive, "status": status, "search": search}
+        return await self._cached_page(params, load)
 
     async def get_crud_example_detail(
         self,
-        db: Session,
+        db: AsyncSession,
         example_id: int
     ) -> CrudExampleResponse:
         """
         Get a single crud example by ID
         """
-        crud_example = self.crud_example_repository.get_by_id(
+        version = None
+        if self._caching:
+            version = await self.cache.version()
+            cached = await self.cache.get_item(example_id)
+            if cached is not None:
+                return cached
+
+        crud_example = await self.crud_example_repository.get_by_id(
             db=db,
             id=example_id
         )
         if not crud_example:
             logger.warning(f"Crud example not found: id={example_id}")
             return None
-        return CrudExampleResponse.model_validate(crud_example)
+        response = CrudExampleResponse.model_validate(crud_example)
+        if self._caching:
+            await self.cache.put_item(response, version)
+        return response
     
     async def create_crud_example(
         self,
-        db: Session,
+        db: AsyncSession,
         crud_example_data: CrudExampleCreate
     ) -> CrudExampleResponse:
         """
@@ -69,14 +143,15 @@ class CrudExampleService:
         self._validate_crud_example_creation(crud_example_data)
 
         # Use repository to create crud example
-        crud_example = self.crud_example_repository.create_crud_example(db, crud_example_data)
+        crud_example = await self.crud_example_repository.create_crud_example(db, crud_example_data)
+        await self._invalidate()
 
         logger.info(f"Successfully created crud example with ID: {crud_example.id}")
         return CrudExampleResponse.model_validate(crud_example)
 
     async def update_crud_example(
         self,
-        db: Session,
+        db: AsyncSession,
         example_id: int,
         crud_example_update: CrudExampleUpdate
     ) -> Optional[CrudExampleResponse]:
@@ -89,7 +164,7 @@ class CrudExampleService:
         self._validate_crud_example_update(crud_example_update)
 
         # Use repository to update crud example
-        updated_crud_example = self.crud_example_repository.update_crud_example(
+        updated_crud_example = await self.crud_example_repository.update_crud_example(
             db=db,
             crud_example_id=example_id,
             crud_example_update=crud_example_update
@@ -98,13 +173,14 @@ class CrudExampleService:
         if not updated_crud_example:
             logger.warning(f"Crud example not found for update: id={example_id}")
             return None
+        await self._invalidate([example_id])
 
         logger.info(f"Successfully updated crud example with ID: {example_id}")
         return CrudExampleResponse.model_validate(updated_crud_example)
 
     async def delete_crud_example(
         self,
-        db: Session,
+        db: AsyncSession,
         example_id: int
     ) -> bool:
         """
@@ -112,18 +188,185 @@ class CrudExampleService:
         """
         logger.info(f"Deleting crud example with ID: {example_id}")
 
-        success = self.crud_example_repository.delete_crud_example_by_id(
+        success = await self.crud_example_repository.delete_crud_example_by_id(
             db=db,
             crud_example_id=example_id
         )
 
         if success:
+            await self._invalidate([example_id])
             logger.info(f"Successfully deleted crud example with ID: {example_id}")
         else:
             logger.warning(f"Crud example not found for deletion: id={example_id}")
 
         return success
 
+    async def bulk_create_crud_examples(
+        self,
+        db: AsyncSession,
+        crud_examples_data: List[CrudExampleCreate],
+        batch_size: Optional[int] = None
+    ) -> CrudExampleBulkResponse:
+        """
+        Create many crud examples in one transaction
+        Items repeating an externalId of the request, or reusing an existing one, are skipped
+        """
+        logger.info(f"Bulk creating {len(crud_examples_data)} crud examples")
+        for crud_example_data in crud_examples_data:
+            self._validate_crud_example_creation(crud_example_data)
+
+        batch_size = batch_size or settings.CRUD_BULK_BATCH_SIZE
+        results = self._duplicate_results([data.externalId for data in crud_examples_data], "externalId")
+        existing = await self.crud_example_repository.get_existing_external_ids(
+            db, [data.externalId for data in crud_examples_data if data.externalId is not None], batch_size)
+        for index, crud_example_data in enumerate(crud_examples_data):
+            if index not in results and crud_example_data.externalId in existing:
+                results[index] = CrudExampleBulkItemResult(
+                    index=index, status="conflict", error=f"externalId {crud_example_data.externalId} already exists")
+
+        pending = [index for index in range(len(crud_examples_data)) if index not in results]
+        created = await self.crud_example_repository.bulk_create_crud_examples(
+            db, [crud_examples_data[index] for index in pending], batch_size)
+        for index, crud_example in zip(pending, created):
+            results[index] = CrudExampleBulkItemResult(
+                index=index, status="created", id=crud_example.id, item=CrudExampleResponse.model_validate(crud_example))
+        if created:
+            await self._invalidate()
+
+        return self._bulk_response(results)
+
+    async def bulk_upsert_crud_examples(
+        self,
+        db: AsyncSession,
+        crud_examples_data: List[CrudExampleCreate],
+        batch_size: Optional[int] = None
+    ) -> CrudExampleBulkResponse:
+        """
+        Insert crud examples or update the ones whose externalId already exists, in one transaction
+        """
+        logger.info(f"Bulk upserting {len(crud_examples_data)} crud examples")
+        for crud_example_data in crud_examples_data:
+            self._validate_crud_example_creation(crud_example_data)
+
+        # One statement cannot update a row twice, so a repeated externalId is skipped
+        results = self._duplicate_results([data.externalId for data in crud_examples_data], "externalId")
+        pending = {crud_examples_data[index].externalId: index
+                   for index in range(len(crud_examples_data)) if index not in results}
+        upserted = await self.crud_example_repository.bulk_upsert_crud_examples(
+            db, [crud_examples_data[index] for index in pending.values()], batch_size or settings.CRUD_BULK_BATCH_SIZE)
+        for crud_example, inserted in upserted:
+            index = pending[crud_example.externalId]
+            results[index] = CrudExampleBulkItemResult(
+                index=index, status="created" if inserted else "updated", id=crud_example.id,
+                item=CrudExampleResponse.model_validate(crud_example))
+        await self._invalidate(crud_example.id for crud_example, inserted in upserted if not inserted)
+
+        return self._bulk_response(results)
+
+    async def bulk_update_crud_examples(
+        self,
+        db: AsyncSession,
+        example_ids: List[int],
+        crud_example_update: CrudExampleUpdate,
+        batch_size: Optional[int] = None
+    ) -> CrudExampleBulkResponse:
+        """
+        Apply the same update to many crud examples in one transaction
+        """
+        logger.info(f"Bulk updating {len(example_ids)} crud examples with data: {crud_example_update}")
+        self._validate_crud_example_update(crud_example_update)
+        if crud_example_update.externalId is not None and len(set(example_ids)) > 1:
+            raise ValueError("externalId is unique and cannot be set on several crud examples")
+
+        results = self._duplicate_results(example_ids, "id")
+        pending = {example_ids[index]: index for index in range(len(example_ids)) if index not in results}
+        updated = await self.crud_example_repository.bulk_update_crud_examples(
+            db, list(pending), crud_example_update, batch_size or settings.CRUD_BULK_BATCH_SIZE)
+        await self._invalidate(crud_example.id for crud_example in updated)
+        for crud_example in updated:
+            index = pending.pop(crud_example.id)
+            results[index] = CrudExampleBulkItemResult(
+                index=index, status="updated", id=crud_example.id, item=CrudExampleResponse.model_validate(crud_example))
+        for example_id, index in pending.items():
+            results[index] = CrudExampleBulkItemResult(index=index, status="not_found", id=example_id)
+
+        return self._bulk_response(results)
+
+    async def bulk_delete_crud_examples(
+        self,
+        db: AsyncSession,
+        example_ids: List[int],
+        batch_size: Optional[int] = None
+    ) -> CrudExampleBulkResponse:
+        """
+        Delete many crud examples in one transaction
+        """
+        logger.info(f"Bulk deleting {len(example_ids)} crud examples")
+
+        results = self._duplicate_results(example_ids, "id")
+        pending = {example_ids[index]: index for index in range(len(example_ids)) if index not in results}
+        deleted = await self.crud_example_repository.bulk_delete_crud_examples(
+            db, list(pending), batch_size or settings.CRUD_BULK_BATCH_SIZE)
+        await self._invalidate(deleted)
+        for example_id in deleted:
+            index = pending.pop(example_id)
+            results[index] = CrudExampleBulkItemResult(index=index, status="deleted", id=example_id)
+        for example_id, index in pending.items():
+            results[index] = CrudExampleBulkItemResult(index=index, status="not_found", id=example_id)
+
+        return self._bulk_response(results)
+
+    @property
+    def _caching(self) -> bool:
+        return self.cache is not None and self.cache.enabled
+
+    async def _cached_page(
+        self,
+        params: Dict[str, Any],
+        load: Callable[[], Awaitable[CrudExamplePage]]
+    ) -> CrudExamplePage:
+        """
+        Serve a search from the cache, loading and caching it on a miss
+        """
+        if not self._caching:
+            return await load()
+        version = await self.cache.version()
+        page = await self.cache.get_page(params, version)
+        if page is None:
+            page = await load()
+            await self.cache.put_page(params, version, page)
+        return page
+
+    async def _invalidate(self, example_ids: Iterable[int] = ()) -> None:
+        """
+        Drop written records from the cache; any write also invalidates every cached search
+        """
+        if self._caching:
+            await self.cache.invalidate(example_ids)
+
+    def _duplicate_results(self, keys: List, key_name: str) -> Dict[int, CrudExampleBulkItemResult]:
+        """
+        Results for the items repeating the key of an earlier item; the first occurrence is the one processed
+        """
+        first_seen = {}
+        results = {}
+        for index, key in enumerate(keys):
+            if key is None:
+                continue
+            if key in first_seen:
+                results[index] = CrudExampleBulkItemResult(
+                    index=index, status="duplicate", id=key if key_name == "id" else None,
+                    error=f"{key_name} {key} repeats item {first_seen[key]}")
+            else:
+                first_seen[key] = index
+        return results
+
+    def _bulk_response(self, results: Dict[int, CrudExampleBulkItemResult]) -> CrudExampleBulkResponse:
+        ordered = [results[index] for index in sorted(results)]
+        counts = Counter(result.status for result in ordered)
+        logger.info(f"Bulk request outcome: {dict(counts)}")
+        return CrudExampleBulkResponse(counts=dict(counts), results=ordered)
+
     def _validate_crud_example_creation(self, crud_example_data: CrudExampleCreate) -> None:
         """
         Validate business rules for crud example creation
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from shared.utils import get_logger
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+
+logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+# Bump whenever the rendered summary changes so stale entries are never served
+CACHE_FORMAT_VERSION = "4"
+CACHE_FILE_SUFFIX = ".summary"
+CACHE_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+# Settings that change what a summary says about the same bytes and options, e.g. the Excel parser's
+# dtypes or which rows dtype inference sees; changing one of them must not serve the old summaries
+OUTPUT_SETTINGS = (
+    "CSV_CHUNK_SIZE",
+    "EXCEL_ENGINE",
+    "DTYPE_INFERENCE_SAMPLE_ROWS",
+    "DTYPE_CATEGORICAL_MAX_RATIO",
+    "SAMPLE_HEAD_ROWS",
+    "EXACT_MAX_DISTINCT_VALUES",
+)
+
+
+def settings_digest() -> str:
+    """
+    Digest of the output-affecting settings this process runs with
+    """
+    material = "\n".join(f"{name}={getattr(settings, name)!r}" for name in OUTPUT_SETTINGS)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def build_cache_key(
+    content_digest: str,
+    file_type: str,
+    options: DataSummaryOptions,
+    output_format: str = "text"
+) -> str:
+    """
+    Derive the cache key from the uploaded bytes' digest, the report options, the output format
+    and the output-affecting settings
+    """
+    material = (
+        f"{CACHE_FORMAT_VERSION}\n{settings_digest()}\n{content_digest}\n{file_type}\n{output_format}\n"
+        f"{options.model_dump_json()}")
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class DataSummaryCache:
+    """
+    Content-addressed cache of rendered data summaries: a byte-bounded in-process LRU
+    backed by an optional disk tier
+
+    The disk tier is bounded by max_disk_bytes too. Files are shared by every worker process,
+    so recency is kept in their mtimes, refreshed on each disk hit, and the oldest go first
+    """
+
+    def __init__(self, max_bytes: int = 0, directory: Optional[str] = None, max_disk_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._size = 0
+        # Lookups run in worker threads so disk reads never block the event loop
+        self._lock = threading.Lock()
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or bool(self.directory)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached summary for a key, promoting disk hits into memory
+        """
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return summary
+
+        summary = self._read_disk(key)
+        with self._lock:
+            if summary is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, summary)
+        return summary
+
+    def put(self, key: str, summary: bytes) -> None:
+        with self._lock:
+            self._store(key, summary)
+        self._write_disk(key, summary)
+
+    def purge(self, key: str) -> bool:
+        """
+        Drop a key from both tiers, returning whether anything was removed
+        """
+        with self._lock:
+            removed = self._discard(key)
+        path = self._disk_path(key)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+            removed = True
+        if removed:
+            logger.info(f"Purged data summary cache entry {key}")
+        return removed
+
+    def clear(self) -> int:
+        """
+        Empty both tiers, returning the number of distinct keys removed
+        """
+        with self._lock:
+            keys = set(self._entries)
+            self._entries.clear()
+            self._sizes.clear()
+            self._size = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(CACHE_FILE_SUFFIX):
+                    os.remove(os.path.join(self.directory, name))
+                    keys.add(name[:-len(CACHE_FILE_SUFFIX)])
+        logger.info(f"Cleared {len(keys)} data summary cache entries")
+        return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": bool(self.directory),
+            }
+
+    def _store(self, key: str, summary: bytes) -> None:
+        size = len(summary)
+        self._discard(key)
+        if size > self.max_bytes:
+            # Too large for the memory tier; it can still live on disk
+            return
+        self._entries[key] = summary
+        self._sizes[key] = size
+        self._size += size
+        while self._size > self.max_bytes:
+            oldest, _ = self._entries.popitem(last=False)
+            self._size -= self._sizes.pop(oldest)
+
+    def _discard(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        del self._entries[key]
+        self._size -= self._sizes.pop(key)
+        return True
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        # Keys arrive from URLs when purging, so only well-formed digests map to files
+        if not self.directory or not CACHE_KEY_PATTERN.match(key):
+            return None
+        return os.path.join(self.directory, f"{key}{CACHE_FILE_SUFFIX}")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as cached:
+                summary = cached.read()
+            os.utime(path)
+            return summary
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, summary: bytes) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        if self.max_disk_bytes and len(summary) > self.max_disk_bytes:
+            return
+        temp_path = None
+        try:
+            # Write beside the target and rename so readers never see a partial entry
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "wb") as cached:
+                cached.write(summary)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write data summary cache entry {key}: {str(e)}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        if self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """
+        Remove the least recently used entries until the disk tier fits its budget
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                # Another worker evicted or purged it first
+                pass
+            total -= size
+            logger.info(f"Evicted data summary cache entry {name[:-len(CACHE_FILE_SUFFIX)]} from disk")
+
+
+data_summary_cache = DataSummaryCache(
+    max_bytes=settings.DATA_SUMMARY_CACHE_MAX_BYTES,
+    directory=settings.DATA_SUMMARY_CACHE_DIR,
+    max_disk_bytes=settings.DATA_SUMMARY_CACHE_DISK_MAX_BYTES,
+)
+
+def get_data_summary_cache() -> DataSummaryCache:
+    """Get the process-wide data summary cache"""
+    return data_summary_cache
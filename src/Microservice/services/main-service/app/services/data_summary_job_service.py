@@ -0,0 +1,257 @@
+import asyncio
+import multiprocessing
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from multiprocessing.managers import SyncManager
+from typing import Any, AsyncIterator, Callable, Optional
+from shared.utils import get_logger, utc_now
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryJobStatus, DataSummaryOptions
+from app.services.data_summary_cache import DataSummaryCache, data_summary_cache
+from app.services.excel_reader import EXCEL_FILE_TYPES
+from app.services.handle_file_service import DataSummaryCancelledError, HandleFileService, summarize_file
+
+logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+FINISHED_STATUSES = (
+    DataSummaryJobStatus.COMPLETED,
+    DataSummaryJobStatus.FAILED,
+    DataSummaryJobStatus.CANCELLED,
+)
+
+
+class DataSummaryJobQueueFullError(Exception):
+    """
+    Raised when too many jobs are already waiting for a worker
+    """
+
+
+class DataSummaryJob:
+    """
+    In-memory state of one background data summary
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        file_type: str,
+        filename: Optional[str],
+        options: DataSummaryOptions,
+        cache_key: Optional[str] = None
+    ):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.cancel_marker = f"{path}.cancel" if path else None
+        self.file_type = file_type
+        self.filename = filename
+        self.options = options
+        self.cache_key = cache_key
+        self.cached = False
+        self.status = DataSummaryJobStatus.PENDING
+        self.created_at: datetime = utc_now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+class DataSummaryJobManager:
+    """
+    Runs data summaries in a process pool with a bounded number of concurrent jobs
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_concurrent_jobs: Optional[int] = None,
+        max_queued_jobs: int = 20,
+        job_retention: int = 100,
+        cache: Optional[DataSummaryCache] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrent_jobs = max_concurrent_jobs or self.max_workers
+        self.max_queued_jobs = max_queued_jobs
+        self.job_retention = job_retention
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue_manager: Optional[SyncManager] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, DataSummaryJob]" = OrderedDict()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Workers are only forked once the first job arrives
+        if self._executor is None:
+            logger.info(f"Starting data summary process pool with {self.max_workers} workers")
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Executor]:
+        """
+        Hold one of the concurrent job slots for pool work that is not a job, such as a
+        per-sheet summary, a batch or a summary stream, and hand out the executor to run it on
+        """
+        async with self._get_semaphore():
+            yield self.executor
+
+    def event_queue(self):
+        """
+        A queue pool workers can put events on for the API process to read
+        """
+        # Plain multiprocessing queues cannot be passed to pool tasks; a manager's proxies can
+        if self._queue_manager is None:
+            self._queue_manager = multiprocessing.Manager()
+        return self._queue_manager.Queue()
+
+    def submit(
+        self,
+        path: str,
+        file_type: str,
+        filename: Optional[str] = None,
+        options: Optional[DataSummaryOptions] = None,
+        target: Callable[..., Any] = summarize_file,
+        cache_key: Optional[str] = None
+    ) -> DataSummaryJob:
+        """
+        Queue a spooled file for profiling; the job takes ownership of the file
+        """
+        pending = sum(1 for job in self._jobs.values() if job.status == DataSummaryJobStatus.PENDING)
+        if pending >= self.max_queued_jobs:
+            raise DataSummaryJobQueueFullError(f"{pending} data summary jobs are already queued")
+
+        job = DataSummaryJob(path, file_type, filename, options or DataSummaryOptions(), cache_key)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, target))
+        self._prune()
+        logger.info(f"Queued data summary job {job.id} for {filename}")
+        return job
+
+    def record_cached(
+        self,
+        file_type: str,
+        filename: Optional[str],
+        options: DataSummaryOptions,
+        cache_key: str,
+        result: str
+    ) -> DataSummaryJob:
+        """
+        Record an already completed job for an upload answered from the cache
+        """
+        job = DataSummaryJob(None, file_type, filename, options, cache_key)
+        job.cached = True
+        job.result = result
+        job.status = DataSummaryJobStatus.COMPLETED
+        job.started_at = job.finished_at = utc_now()
+        self._jobs[job.id] = job
+        self._prune()
+        logger.info(f"Data summary job {job.id} for {filename} answered from cache")
+        return job
+
+    def get(self, job_id: str) -> Optional[DataSummaryJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[DataSummaryJob]:
+        """
+        Cancel a queued job, or ask a running worker to stop at its next chunk
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return job
+
+        if job.status == DataSummaryJobStatus.PENDING:
+            job.task.cancel()
+            # A task cancelled before its first step never enters _run, so it is finished here
+            self._finish_cancelled(job)
+        else:
+            # Worker processes cannot be interrupted directly; they poll this marker between chunks
+            open(job.cancel_marker, "a").close()
+        logger.info(f"Cancellation requested for data summary job {job.id}")
+        return job
+
+    async def _run(self, job: DataSummaryJob, target: Callable[..., Any]) -> None:
+        try:
+            async with self._get_semaphore():
+                job.status = DataSummaryJobStatus.RUNNING
+                job.started_at = utc_now()
+                if job.options.sheets and job.file_type in EXCEL_FILE_TYPES:
+                    # Each sheet becomes its own pool task; the job still holds a single slot
+                    job.result = await HandleFileService.summarize_sheets(
+                        job.path, job.file_type, job.options, self.executor, job.cancel_marker)
+                else:
+                    loop = asyncio.get_running_loop()
+                    job.result = await loop.run_in_executor(
+                        self.executor, target, job.path, job.file_type, job.options, job.cancel_marker)
+                job.status = DataSummaryJobStatus.COMPLETED
+                logger.info(f"Data summary job {job.id} completed")
+            if self.cache is not None and job.cache_key:
+                await asyncio.to_thread(self.cache.put, job.cache_key, job.result.encode("utf-8"))
+        except (asyncio.CancelledError, DataSummaryCancelledError):
+            # A completed job may still be caching its result when the loop cancels it; it stays completed
+            if not job.is_finished:
+                self._finish_cancelled(job)
+        except Exception as e:
+            job.status = DataSummaryJobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"Data summary job {job.id} failed: {str(e)}")
+        finally:
+            if job.finished_at is None:
+                job.finished_at = utc_now()
+            self._remove_files(job)
+
+    def _finish_cancelled(self, job: DataSummaryJob) -> None:
+        if job.status != DataSummaryJobStatus.CANCELLED:
+            job.status = DataSummaryJobStatus.CANCELLED
+            job.finished_at = utc_now()
+            logger.info(f"Data summary job {job.id} cancelled")
+        self._remove_files(job)
+
+    @staticmethod
+    def _remove_files(job: DataSummaryJob) -> None:
+        for path in (job.path, job.cancel_marker):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def _prune(self) -> None:
+        # Forget the oldest finished jobs once the retention limit is exceeded
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(self._jobs) - self.job_retention)]:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        for job in self._jobs.values():
+            if not job.is_finished:
+                self.cancel(job.id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._queue_manager is not None:
+            self._queue_manager.shutdown()
+            self._queue_manager = None
+
+
+data_summary_job_manager = DataSummaryJobManager(
+    max_workers=settings.DATA_SUMMARY_WORKERS,
+    max_concurrent_jobs=settings.DATA_SUMMARY_MAX_CONCURRENT_JOBS,
+    max_queued_jobs=settings.DATA_SUMMARY_MAX_QUEUED_JOBS,
+    job_retention=settings.DATA_SUMMARY_JOB_RETENTION,
+    cache=data_summary_cache,
+)
+
+def get_data_summary_job_manager() -> DataSummaryJobManager:
+    """Get the process-wide data summary job manager"""
+    return data_summary_job_manager
@@ -0,0 +1,173 @@
+import json
+import struct
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from shared.utils.logger import get_logger
+from app.repository.dataset_profile_repository import DatasetProfileRepository
+from app.repository.dataset_table_repository import DatasetTableRepository, dataset_table_name
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import DataProfileAccumulator
+from app.services.profile_serialization import dump_accumulator, load_accumulator
+
+logger = get_logger(__name__)
+
+# Options that change what the stored accumulators contain; sketches built with different settings cannot merge
+MERGE_COMPATIBILITY_OPTIONS = {
+    "mode", "hll_precision", "top_k_capacity", "tdigest_compression", "frequency_sample_size", "columns",
+}
+
+
+# Stored profiles are serialized accumulators behind this header. Bump the version whenever
+# DataProfileAccumulator, the column accumulators or the sketches change shape, so profiles
+# written by an older profiler are rejected instead of merged into the wrong state
+PROFILE_MAGIC = b"DPRF"
+PROFILE_FORMAT_VERSION = 3
+
+
+class DatasetProfileConflictError(Exception):
+    """
+    Raised when an upload's options cannot be merged into a dataset's stored profile
+    """
+
+
+class DatasetProfileFormatError(DatasetProfileConflictError):
+    """
+    Raised when a dataset's stored profile was written in another profile format
+    """
+
+
+def _options_key(options: DataSummaryOptions) -> str:
+    return json.dumps(options.model_dump(include=MERGE_COMPATIBILITY_OPTIONS), sort_keys=True)
+
+
+def _dump(accumulator: DataProfileAccumulator) -> bytes:
+    header = PROFILE_MAGIC + struct.pack(">H", PROFILE_FORMAT_VERSION)
+    return header + dump_accumulator(accumulator)
+
+
+def profile_format_version(profile: bytes) -> int:
+    """
+    Format version a stored profile was written in; 0 for the unversioned pickles written before versioning
+    """
+    if not profile.startswith(PROFILE_MAGIC):
+        return 0
+    return struct.unpack_from(">H", profile, len(PROFILE_MAGIC))[0]
+
+
+def _load(name: str, profile: bytes) -> DataProfileAccumulator:
+    version = profile_format_version(profile)
+    if version != PROFILE_FORMAT_VERSION:
+        raise DatasetProfileFormatError(
+            f"Dataset {name} is stored in profile format {version} but this service reads format "
+            f"{PROFILE_FORMAT_VERSION}; delete the dataset and upload its files again")
+    return load_accumulator(profile[len(PROFILE_MAGIC) + 2:])
+
+
+class DatasetProfileService:
+    """
+    Business logic for named dataset profiles that are merged upload by upload
+
+    The repositories use a sync Session, so every operation runs whole in a worker thread;
+    a row lock held across an await would let a second upload block the event loop
+    """
+    def __init__(
+        self,
+        dataset_profile_repository: DatasetProfileRepository = None,
+        dataset_table_repository: DatasetTableRepository = None
+    ):
+        self.dataset_profile_repository = dataset_profile_repository or DatasetProfileRepository()
+        self.dataset_table_repository = dataset_table_repository or DatasetTableRepository()
+
+    async def ensure_compatible(self, db: Session, name: str, options: DataSummaryOptions) -> None:
+        """
+        Reject an upload whose options cannot be merged into the dataset, before anything is profiled or loaded
+        """
+        await run_in_threadpool(self._ensure_compatible, db, name, options)
+
+    async def append_to_dataset(
+        self,
+        db: Session,
+        name: str,
+        increment: DataProfileAccumulator,
+        options: DataSummaryOptions
+    ) -> DataProfileAccumulator:
+        """
+        Merge the accumulator of a new upload into the dataset's stored profile
+
+        Only the stored accumulator is loaded, so the cost is proportional to the
+        profile's size rather than to every row uploaded so far
+        """
+        return await run_in_threadpool(self._append_to_dataset, db, name, increment, options)
+
+    async def get_dataset_profile(self, db: Session, name: str) -> Optional[DataProfileAccumulator]:
+        """
+        Load a dataset's cumulative profile
+        """
+        return await run_in_threadpool(self._get_dataset_profile, db, name)
+
+    async def delete_dataset_profile(self, db: Session, name: str) -> bool:
+        """
+        Delete a dataset's stored profile and the table its rows were loaded into
+        """
+        return await run_in_threadpool(self._delete_dataset_profile, db, name)
+
+    def _ensure_compatible(self, db: Session, name: str, options: DataSummaryOptions) -> None:
+        dataset_profile = self.dataset_profile_repository.get_by_name(db, name)
+        if dataset_profile is not None and dataset_profile.options != _options_key(options):
+            raise DatasetProfileConflictError(
+                f"Dataset {name} is profiled with {dataset_profile.options}; upload used {_options_key(options)}")
+
+    def _append_to_dataset(
+        self,
+        db: Session,
+        name: str,
+        increment: DataProfileAccumulator,
+        options: DataSummaryOptions
+    ) -> DataProfileAccumulator:
+        options_key = _options_key(options)
+        for attempt in range(2):
+            # Lock the row so concurrent increments of the same dataset merge one after another
+            dataset_profile = self.dataset_profile_repository.get_by_name(db, name, for_update=True)
+
+            if dataset_profile is None:
+                try:
+                    self.dataset_profile_repository.create_dataset_profile(
+                        db, name, options_key, _dump(increment), increment.total_records)
+                except IntegrityError:
+                    # Another request created the dataset first; merge into its row instead
+                    if attempt:
+                        raise
+                    continue
+                logger.info(f"Created dataset profile {name} with {increment.total_records} records")
+                return increment
+
+            try:
+                if dataset_profile.options != options_key:
+                    raise DatasetProfileConflictError(
+                        f"Dataset {name} is profiled with {dataset_profile.options}; upload used {options_key}")
+                merged = _load(name, dataset_profile.profile)
+            except DatasetProfileConflictError:
+                # Release the row lock
+                db.rollback()
+                raise
+            merged.merge(increment)
+            self.dataset_profile_repository.update_dataset_profile(
+                db, dataset_profile, _dump(merged), merged.total_records)
+            logger.info(f"Merged {increment.total_records} records into dataset profile {name}")
+            return merged
+
+    def _get_dataset_profile(self, db: Session, name: str) -> Optional[DataProfileAccumulator]:
+        dataset_profile = self.dataset_profile_repository.get_by_name(db, name)
+        if not dataset_profile:
+            logger.warning(f"Dataset profile not found: {name}")
+            return None
+        return _load(name, dataset_profile.profile)
+
+    def _delete_dataset_profile(self, db: Session, name: str) -> bool:
+        table_dropped = self.dataset_table_repository.drop_table(db, dataset_table_name(name))
+        success = self.dataset_profile_repository.delete_dataset_profile_by_name(db, name)
+        if success or table_dropped:
+            logger.info(f"Deleted dataset profile {name}")
+        return success or table_dropped
@@ -0,0 +1,142 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+from app.core.config import settings
+
+# Values tried when inferring a format, and how many distinct ones seed format guesses
+DATETIME_SAMPLE_SIZE = 500
+FORMAT_GUESS_SEEDS = 5
+# Share of sampled values a format must parse to be accepted
+MIN_PARSE_RATE = 0.9
+
+# Epoch integers between 1973 and 2286 in either unit
+EPOCH_RANGES = {
+    "s": (1e8, 1e10),
+    "ms": (1e11, 1e13),
+}
+EPOCH_UNIT_NAMES = {"s": "epoch seconds", "ms": "epoch milliseconds"}
+
+
+@dataclass(frozen=True)
+class DatetimeFormat:
+    """
+    How a column's values map to timestamps: a strftime pattern or an epoch unit
+    """
+    kind: str  # "format" or "epoch"
+    value: str
+
+    def describe(self) -> str:
+        return EPOCH_UNIT_NAMES[self.value] if self.kind == "epoch" else self.value
+
+
+def is_time_like(name: Any) -> bool:
+    return "time" in str(name).lower()
+
+
+def _infer_epoch(values: pd.Series) -> Optional[DatetimeFormat]:
+    numbers = pd.to_numeric(values, errors="coerce").dropna()
+    if numbers.empty:
+        return None
+    low, high = numbers.min(), numbers.max()
+    for unit, (lower_bound, upper_bound) in EPOCH_RANGES.items():
+        if lower_bound <= low and high < upper_bound:
+            return DatetimeFormat("epoch", unit)
+    return None
+
+
+def infer_datetime_format(
+    values: Iterable[Any],
+    preferred: Optional[DatetimeFormat] = None
+) -> Optional[DatetimeFormat]:
+    """
+    Infer one fixed format from a sample so whole columns can be parsed vectorized
+
+    A preferred (e.g. cached) format is kept if it still parses the sample. Otherwise
+    numbers are checked against plausible epoch ranges, and for strings formats are
+    guessed from a few distinct values (plus ISO 8601); the one that parses the most
+    of the sample wins, provided it parses at least MIN_PARSE_RATE of it
+    """
+    sample = pd.Series(values).dropna().iloc[:DATETIME_SAMPLE_SIZE]
+    if sample.empty:
+        return None
+    if preferred is not None:
+        _, failed = parse_datetimes(sample, preferred)
+        if 1 - failed.mean() >= MIN_PARSE_RATE:
+            return preferred
+    if pd.api.types.is_numeric_dtype(sample) and not pd.api.types.is_bool_dtype(sample):
+        return _infer_epoch(sample)
+    if pd.api.types.is_datetime64_any_dtype(sample):
+        return None
+
+    candidates = []
+    for value in sample.astype(str).unique()[:FORMAT_GUESS_SEEDS]:
+        guessed = guess_datetime_format(value)
+        if guessed and guessed not in candidates:
+            candidates.append(guessed)
+    candidates.append("ISO8601")
+
+    best_format, best_rate = None, 0.0
+    for candidate in candidates:
+        parsed = pd.to_datetime(sample, format=candidate, errors="coerce")
+        rate = float(parsed.notna().mean())
+        if rate > best_rate:
+            best_format, best_rate = candidate, rate
+        if rate == 1.0:
+            break
+    if best_rate < MIN_PARSE_RATE:
+        return None
+    return DatetimeFormat("format", best_format)
+
+
+def parse_datetimes(values: Iterable[Any], datetime_format: DatetimeFormat) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Parse values with a fixed format, returning the timestamps and a mask of values that failed
+    """
+    series = pd.Series(values)
+    if datetime_format.kind == "epoch":
+        parsed = pd.to_datetime(pd.to_numeric(series, errors="coerce"), unit=datetime_format.value, errors="coerce")
+    else:
+        parsed = pd.to_datetime(series, format=datetime_format.value, errors="coerce")
+    failed = parsed.isna().to_numpy() & series.notna().to_numpy()
+    return parsed, failed
+
+
+class DatetimeFormatCache:
+    """
+    Formats inferred per dataset schema, so files with the same columns skip inference
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._formats: "OrderedDict[Tuple[str, ...], Dict[str, DatetimeFormat]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def schema_key(columns: Iterable[Any]) -> Tuple[str, ...]:
+        return tuple(str(column).strip() for column in columns)
+
+    def get(self, columns: Iterable[Any]) -> Dict[str, DatetimeFormat]:
+        key = self.schema_key(columns)
+        with self._lock:
+            formats = self._formats.get(key)
+            if formats is None:
+                return {}
+            self._formats.move_to_end(key)
+            return dict(formats)
+
+    def put(self, columns: Iterable[Any], formats: Dict[str, DatetimeFormat]) -> None:
+        if not formats or not self.max_entries:
+            return
+        key = self.schema_key(columns)
+        with self._lock:
+            self._formats[key] = {**self._formats.get(key, {}), **formats}
+            self._formats.move_to_end(key)
+            while len(self._formats) > self.max_entries:
+                self._formats.popitem(last=False)
+
+
+datetime_format_cache = DatetimeFormatCache(settings.DATETIME_FORMAT_CACHE_SIZE)
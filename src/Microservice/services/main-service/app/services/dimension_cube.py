@@ -0,0 +1,58 @@
+from typing import Any, Dict, List, Optional, Sequence
+import pandas as pd
+from shared.constants.constants import CUBE_DIMENSIONS
+
+# Stored for blank values and for dimensions a file does not have, so every cell has a unique key
+MISSING_DIMENSION_VALUE = ""
+
+
+def _dimension_labels(series: pd.Series) -> pd.Series:
+    # Integer codes such as mccmnc come back as floats when a chunk has blanks; keep them as "310260"
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        if (values == values.round()).all():
+            series = series.astype("Int64")
+    return series.astype("string").fillna(MISSING_DIMENSION_VALUE)
+
+
+class DimensionCubeAccumulator:
+    """
+    Record counts per combination of the cube dimensions, folded chunk by chunk
+    """
+
+    def __init__(self, dimensions: Optional[Sequence[str]] = None):
+        self.dimensions = list(dimensions or CUBE_DIMENSIONS)
+        self.counts = pd.Series(dtype="int64")
+        self.total_records = 0
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Group one chunk by the dimensions and add its counts to the running cube
+        """
+        # Same record definition as the profile: fully blank rows are not records
+        chunk = chunk.dropna(how='all')
+        self.total_records += len(chunk)
+        if chunk.empty:
+            return
+
+        columns = {column.strip() if isinstance(column, str) else column: column for column in chunk.columns}
+        labels = pd.DataFrame({
+            dimension: _dimension_labels(chunk[columns[dimension]])
+            if dimension in columns else MISSING_DIMENSION_VALUE
+            for dimension in self.dimensions
+        }, index=chunk.index)
+        counts = labels.groupby(self.dimensions, sort=False).size()
+
+        if self.counts.empty:
+            self.counts = counts
+        else:
+            self.counts = pd.concat([self.counts, counts]).groupby(level=list(range(len(self.dimensions))), sort=False).sum()
+
+    def cells(self) -> List[Dict[str, Any]]:
+        """
+        One row per non-empty cell, keyed by dimension name, ready to be upserted
+        """
+        return [
+            {**dict(zip(self.dimensions, key)), "record_count": int(count)}
+            for key, count in self.counts.items()
+        ]
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional, Sequence
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from shared.utils.logger import get_logger
+from shared.database.models import DimensionCube
+from app.repository.dimension_cube_repository import DimensionCubeRepository
+from app.schemas.dimensionCube import DimensionCubeCellResponse, DimensionCubeSliceResponse
+from app.services.dimension_cube import DimensionCubeAccumulator
+
+logger = get_logger(__name__)
+
+
+class DimensionCubeService:
+    """
+    Business logic for dimension cubes that are aggregated upload by upload and sliced without the raw files
+
+    The repository uses a sync Session, so every operation runs whole in a worker thread
+    """
+    def __init__(self, dimension_cube_repository: DimensionCubeRepository = None):
+        self.dimension_cube_repository = dimension_cube_repository or DimensionCubeRepository()
+
+    async def append_to_cube(self, db: Session, name: str, cube: DimensionCubeAccumulator) -> DimensionCube:
+        """
+        Add an upload's cell counts to the named cube, creating it on first use
+        """
+        return await run_in_threadpool(self._append_to_cube, db, name, cube)
+
+    async def slice_cube(
+        self,
+        db: Session,
+        name: str,
+        group_by: Sequence[str],
+        filters: Dict[str, List[str]],
+        limit: int = 1000
+    ) -> Optional[DimensionCubeSliceResponse]:
+        """
+        Group a cube's counts by some dimensions, restricted to the given dimension values
+        """
+        return await run_in_threadpool(self._slice_cube, db, name, group_by, filters, limit)
+
+    async def delete_dimension_cube(self, db: Session, name: str) -> bool:
+        """
+        Delete a dimension cube and all of its cells
+        """
+        return await run_in_threadpool(self._delete_dimension_cube, db, name)
+
+    def _append_to_cube(self, db: Session, name: str, cube: DimensionCubeAccumulator) -> DimensionCube:
+        dimension_cube = self.dimension_cube_repository.get_by_name(db, name)
+        if dimension_cube is None:
+            try:
+                dimension_cube = self.dimension_cube_repository.create_dimension_cube(db, name)
+            except IntegrityError:
+                # Another request created the cube first; add to its cells instead
+                dimension_cube = self.dimension_cube_repository.get_by_name(db, name)
+
+        cells = cube.cells()
+        self.dimension_cube_repository.add_cells(db, dimension_cube, cells, cube.total_records)
+        logger.info(f"Added {cube.total_records} records in {len(cells)} cells to dimension cube {name}")
+        return dimension_cube
+
+    def _slice_cube(
+        self,
+        db: Session,
+        name: str,
+        group_by: Sequence[str],
+        filters: Dict[str, List[str]],
+        limit: int
+    ) -> Optional[DimensionCubeSliceResponse]:
+        dimension_cube = self.dimension_cube_repository.get_by_name(db, name)
+        if not dimension_cube:
+            logger.warning(f"Dimension cube not found: {name}")
+            return None
+
+        rows = self.dimension_cube_repository.slice_cells(db, dimension_cube, group_by, filters, limit)
+        return DimensionCubeSliceResponse(
+            name=dimension_cube.name,
+            total_records=dimension_cube.total_records,
+            upload_count=dimension_cube.upload_count,
+            updated_at=dimension_cube.updated_at,
+            group_by=list(group_by),
+            filters=filters,
+            cells=[
+                DimensionCubeCellResponse(
+                    dimensions=dict(zip(group_by, row[:-1])), record_count=int(row[-1] or 0))
+                for row in rows
+            ],
+        )
+
+    def _delete_dimension_cube(self, db: Session, name: str) -> bool:
+        success = self.dimension_cube_repository.delete_dimension_cube_by_name(db, name)
+        if success:
+            logger.info(f"Deleted dimension cube {name}")
+        return success
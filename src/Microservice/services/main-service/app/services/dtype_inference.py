@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import pandas as pd
+from app.services.column_stats import MemoryFootprint
+from app.services.datetime_parsing import (
+    DatetimeFormat,
+    datetime_format_cache,
+    infer_datetime_format,
+    is_time_like,
+    parse_datetimes,
+)
+
+
+def is_text(series: pd.Series) -> bool:
+    """
+    Whether a column holds parsed text: object under pandas 2, the string dtype under pandas 3
+    """
+    return pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.StringDtype)
+
+
+def downcast_integers(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink integer columns to the smallest type that holds this chunk's values
+    """
+    for column in chunk.columns:
+        series = chunk[column]
+        if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            downcast = "unsigned" if series.min() >= 0 else "integer"
+            chunk[column] = pd.to_numeric(series, downcast=downcast)
+    return chunk
+
+
+@dataclass
+class InferredSchema:
+    """
+    Dtypes picked from a sample of a file, to be applied to every chunk of the full read
+    """
+    categorical: List[Any] = field(default_factory=list)
+    datetime: Dict[Any, DatetimeFormat] = field(default_factory=dict)
+
+    def read_csv_kwargs(self) -> Dict[str, Any]:
+        """
+        Arguments that make read_csv produce these dtypes while parsing, instead of converting afterwards
+        """
+        # Epoch columns stay integers here and are converted in apply()
+        date_formats = {
+            column: datetime_format.value
+            for column, datetime_format in self.datetime.items()
+            if datetime_format.kind == "format"
+        }
+        kwargs = {"dtype": {column: "category" for column in self.categorical}}
+        if date_formats:
+            kwargs["parse_dates"] = list(date_formats)
+            kwargs["date_format"] = date_formats
+        return kwargs
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a chunk to the inferred dtypes; columns that no longer fit keep what the reader produced
+        """
+        chunk = chunk.copy(deep=False)
+        for column in self.categorical:
+            if column in chunk.columns and is_text(chunk[column]):
+                chunk[column] = chunk[column].astype("category")
+        for column, datetime_format in self.datetime.items():
+            if column in chunk.columns and not pd.api.types.is_datetime64_any_dtype(chunk[column]):
+                parsed, failed = parse_datetimes(chunk[column], datetime_format)
+                # Chunks with unparseable values stay as read so the profiler can count the failures
+                if not failed.any():
+                    chunk[column] = parsed
+        return downcast_integers(chunk)
+
+    def measure(self, sample: pd.DataFrame) -> MemoryFootprint:
+        """
+        Compare the sample's per-row footprint under the reader's default dtypes and the inferred ones
+        """
+        rows = max(len(sample), 1)
+        default_bytes = int(sample.memory_usage(deep=True, index=False).sum())
+        optimized_bytes = int(self.apply(sample).memory_usage(deep=True, index=False).sum())
+        return MemoryFootprint(
+            sample_rows=len(sample),
+            default_bytes_per_row=default_bytes / rows,
+            optimized_bytes_per_row=optimized_bytes / rows,
+            categorical_columns=[str(column).strip() for column in self.categorical],
+            datetime_columns=[str(column).strip() for column in self.datetime],
+        )
+
+
+def infer_schema(sample: pd.DataFrame, max_unique_ratio: float) -> InferredSchema:
+    """
+    Pick categoricals for low-cardinality strings and timestamps for time-like columns
+    whose strings or epoch integers fit one inferred format
+    """
+    schema = InferredSchema()
+    cached_formats = datetime_format_cache.get(sample.columns)
+    for column in sample.columns:
+        series = sample[column]
+        is_integer = pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        if not is_text(series) and not is_integer:
+            continue
+        values = series.dropna()
+        if values.empty:
+            continue
+        if is_time_like(column):
+            datetime_format = infer_datetime_format(values, cached_formats.get(str(column).strip()))
+            if datetime_format is not None:
+                schema.datetime[column] = datetime_format
+                continue
+        if not is_integer and values.nunique() <= max_unique_ratio * len(values):
+            schema.categorical.append(column)
+    return schema
@@ -0,0 +1,110 @@
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Sequence, Union
+import pandas as pd
+from openpyxl import load_workbook
+
+EXCEL_FILE_TYPES = ('.xlsx', '.xls')
+ALL_SHEETS = "*"
+
+
+class UnknownSheetsError(ValueError):
+    """
+    Raised when a caller asks for sheets the workbook does not have
+    """
+
+
+def _pandas_engine(engine: str) -> Optional[str]:
+    # "openpyxl" streams .xlsx itself; .xls always goes through pandas' default reader
+    return "calamine" if engine == "calamine" else None
+
+
+def list_sheet_names(source: Union[str, BinaryIO], engine: str) -> List[str]:
+    with pd.ExcelFile(source, engine=_pandas_engine(engine)) as workbook:
+        return list(workbook.sheet_names)
+
+
+def resolve_sheets(source: Union[str, BinaryIO], sheets: Sequence[str], engine: str) -> List[str]:
+    """
+    Expand "*" to every sheet and check the requested names against the workbook
+    """
+    available = list_sheet_names(source, engine)
+    if ALL_SHEETS in sheets:
+        return available
+    missing = [sheet for sheet in sheets if sheet not in available]
+    if missing:
+        raise UnknownSheetsError(f"Unknown sheets: {missing}")
+    return list(dict.fromkeys(sheets))
+
+
+def _unique_headers(header: Sequence[Any]) -> List[Any]:
+    # Same naming read_excel uses for blank and repeated header cells
+    names: List[Any] = []
+    seen = {}
+    for position, name in enumerate(header):
+        if name is None:
+            name = f"Unnamed: {position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _iter_openpyxl_chunks(
+    source: Union[str, BinaryIO],
+    sheet: Optional[str],
+    usecols: Optional[Callable[[Any], bool]],
+    chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a worksheet through openpyxl's read-only row iterator
+
+    Read-only mode parses the sheet XML lazily instead of building the whole
+    cell tree, so only one chunk of rows is materialised at a time
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _unique_headers(header)
+
+        offset = 0
+        while True:
+            block = list(islice(rows, chunk_size))
+            if not block:
+                break
+            frame = pd.DataFrame(block, columns=columns).infer_objects()
+            frame.index = pd.RangeIndex(offset, offset + len(frame))
+            offset += len(frame)
+            if usecols is not None:
+                frame = frame[[column for column in frame.columns if usecols(column)]]
+            yield frame
+    finally:
+        workbook.close()
+
+
+def iter_excel_chunks(
+    source: Union[str, BinaryIO],
+    file_type: str,
+    sheet: Optional[str],
+    usecols: Optional[Callable[[Any], bool]],
+    chunk_size: int,
+    engine: str
+) -> Iterator[pd.DataFrame]:
+    """
+    Read one worksheet (the first when no sheet is given) with the configured engine
+    """
+    if engine == "openpyxl" and file_type == '.xlsx':
+        yield from _iter_openpyxl_chunks(source, sheet, usecols, chunk_size)
+        return
+    yield pd.read_excel(
+        source,
+        sheet_name=sheet if sheet is not None else 0,
+        usecols=usecols,
+        engine=_pandas_engine(engine),
+    )
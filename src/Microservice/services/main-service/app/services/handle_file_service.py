@@ -1,91 +1,641 @@
 from shared.utils import get_logger
+from shared.constants.constants import COLUMNAR_FILE_TYPES, COMPRESSED_CSV_FILE_TYPES, KNOWN_DIMENSIONS
 import pandas as pd
-import io
-from typing import Optional
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import DataProfile, DataProfileAccumulator, SampleInfo
+from app.services.columnar_reader import (
+    UnknownColumnsError,
+    count_rows,
+    iter_columnar_chunks,
+    read_column_metadata,
+    read_schema,
+    resolve_columns,
+    sample_columnar_rows,
+)
+from app.services.compressed_reader import DecompressingReader
+from app.services.dataset_table_loader import DatasetTableLoader
+from app.services.dtype_inference import infer_schema
+from app.services.dimension_cube import DimensionCubeAccumulator
+from app.services.excel_reader import EXCEL_FILE_TYPES, iter_excel_chunks, resolve_sheets
+from app.services.sampling import sample_chunks, sample_csv_rows
+from app.services.summary_renderers import encode_document, profile_document, sections_document
 
 
 logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
 
+SPOOL_COPY_BUFFER_SIZE = 1024 * 1024
+
+class DataSummaryCancelledError(Exception):
+    """
+    Raised inside a worker when its summary job has been cancelled
+    """
+
+
+class UploadTooLargeError(Exception):
+    """
+    Raised when an upload exceeds the configured maximum size while being spooled
+    """
+
+
+def _copy_and_hash(source: BinaryIO, target: BinaryIO, max_bytes: int = 0) -> str:
+    """
+    Copy a stream in buffered blocks, hashing it as it is read and stopping past max_bytes
+    """
+    digest = hashlib.sha256()
+    copied = 0
+    while True:
+        block = source.read(SPOOL_COPY_BUFFER_SIZE)
+        if not block:
+            break
+        copied += len(block)
+        if max_bytes and copied > max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the maximum size of {max_bytes} bytes")
+        digest.update(block)
+        target.write(block)
+    return digest.hexdigest()
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def _column_selector(columns: Optional[List[str]]) -> Optional[Callable[[str], bool]]:
+    # Headers are matched after stripping, the same way the profile names columns
+    if not columns:
+        return None
+    wanted = set(columns)
+    return lambda name: (name.strip() if isinstance(name, str) else name) in wanted
+
+
+def summarize_file(
+    path: str,
+    file_type: str,
+    options: Optional[DataSummaryOptions] = None,
+    cancel_marker: Optional[str] = None
+) -> str:
+    """
+    Profile a file on disk and render its summary (process pool entry point)
+    """
+    profile = HandleFileService.build_data_profile(path, file_type, options, cancel_marker)
+    return HandleFileService.render_summary(profile)
+
+
+@dataclass
+class SheetProfile:
+    """
+    Profile of one worksheet and how long it took to build
+    """
+    name: str
+    profile: DataProfile
+    seconds: float
+
+
+def profile_sheet(
+    path: str,
+    file_type: str,
+    sheet: str,
+    options: Optional[DataSummaryOptions] = None,
+    cancel_marker: Optional[str] = None
+) -> SheetProfile:
+    """
+    Profile and time one worksheet (process pool entry point)
+    """
+    started = time.perf_counter()
+    profile = HandleFileService.build_data_profile(path, file_type, options, cancel_marker, sheet=sheet)
+    return SheetProfile(sheet, profile, time.perf_counter() - started)
+
+
+def _add_stage_time(stage_timings: Dict[str, float], stage: str, started: float) -> None:
+    stage_timings[stage] = stage_timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+def _timed_chunks(chunks: Iterable[pd.DataFrame], stage_timings: Dict[str, float]) -> Iterator[pd.DataFrame]:
+    """
+    Yield chunks, charging the time spent reading and parsing each one to the read stage
+    """
+    iterator = iter(chunks)
+    while True:
+        started = time.perf_counter()
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _add_stage_time(stage_timings, "read", started)
+        yield chunk
+
+
+class _ReadProgress:
+    """
+    How much of a source has been consumed, from a file position or a row count
+    """
+
+    def __init__(self, total_bytes: Optional[int] = None, total_rows: Optional[int] = None):
+        self.total_bytes = total_bytes
+        self.total_rows = total_rows
+        self.handle: Optional[BinaryIO] = None
+        self.rows = 0
+
+    def fraction(self) -> Optional[float]:
+        if self.handle is not None and self.total_bytes:
+            return min(self.handle.tell() / self.total_bytes, 1.0)
+        if self.total_rows:
+            return min(self.rows / self.total_rows, 1.0)
+        return None
+
+
+def _iter_csv_tracking_position(path: str, read_progress: _ReadProgress, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Parse a CSV through our own handle, so its position tells how many bytes have been consumed
+    """
+    with open(path, "rb") as handle:
+        read_progress.handle = handle
+        with pd.read_csv(handle, **read_csv_kwargs) as reader:
+            yield from reader
+
+
+def _iter_compressed_csv(
+    path: str,
+    file_type: str,
+    profile: DataProfileAccumulator,
+    read_progress: _ReadProgress,
+    **read_csv_kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse a compressed CSV while it is decompressed, recording the compression figures on the profile
+    """
+    with DecompressingReader(path, file_type, settings.MAX_DECOMPRESSED_BYTES) as reader:
+        # Progress follows the compressed file, whose size is known up front
+        read_progress.handle = reader.compressed_handle
+        with pd.read_csv(reader, **read_csv_kwargs) as chunks:
+            yield from chunks
+        profile.compression = reader.info()
+
+
 class HandleFileService:
     """
     Business logic for file handling operations
     """
     
-    async def generate_data_summary(file: UploadFile, file_type: str) -> Optional[str]:
-        logger.info("Start to generate data summary")
-        summary_lines = []
+    async def generate_data_summary(
+        self,
+        file: UploadFile,
+        file_type: str,
+        options: Optional[DataSummaryOptions] = None,
+        executor: Optional[Executor] = None
+    ) -> Optional[str]:
+        path, _ = await self.spool_upload(file, file_type)
+        try:
+            return (await self.summarize_path(path, file_type, options, executor)).decode("utf-8")
+        finally:
+            os.remove(path)
+
+    async def summarize_path(
+        self,
+        path: str,
+        file_type: str,
+        options: Optional[DataSummaryOptions] = None,
+        executor: Optional[Executor] = None,
+        output_format: str = "text"
+    ) -> bytes:
+        """
+        Summarize a spooled upload in the requested format; parsers read the file from disk
+        rather than from request memory
+        """
+        options = options or DataSummaryOptions()
+        if options.sheets and file_type in EXCEL_FILE_TYPES:
+            sheet_profiles = await self.profile_sheets(path, file_type, options, executor)
+            return await run_in_threadpool(self.render_sections, sheet_profiles, output_format)
+        # Parse and render in a worker thread so the event loop keeps serving other requests
+        profile = await run_in_threadpool(self.build_data_profile, path, file_type, options)
+        return await run_in_threadpool(self.render_profile, profile, output_format)
+
+    async def spool_upload(self, file: UploadFile, file_type: str, directory: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Copy an upload to a named temporary file that parsers and worker processes can open,
+        returning its path and the SHA-256 digest of the copied bytes
+        """
+        await file.seek(0)
+        spool = tempfile.NamedTemporaryFile(
+            prefix="data-summary-", suffix=file_type, dir=directory or settings.UPLOAD_SPOOL_DIR, delete=False)
+        try:
+            with spool:
+                digest = await run_in_threadpool(_copy_and_hash, file.file, spool, settings.MAX_UPLOAD_BYTES)
+        except Exception:
+            os.remove(spool.name)
+            raise
+        finally:
+            # Release the framework's own spooled copy now rather than after the response
+            await file.close()
+        return spool.name, digest
+
+    @staticmethod
+    async def profile_sheets(
+        path: str,
+        file_type: str,
+        options: DataSummaryOptions,
+        executor: Optional[Executor] = None,
+        cancel_marker: Optional[str] = None
+    ) -> List[SheetProfile]:
+        """
+        Profile the requested worksheets concurrently on the executor
+        """
+        sheets = await run_in_threadpool(resolve_sheets, path, options.sheets, settings.EXCEL_ENGINE)
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(
+            loop.run_in_executor(executor, profile_sheet, path, file_type, sheet, options, cancel_marker)
+            for sheet in sheets
+        ))
+
+    @staticmethod
+    async def summarize_sheets(
+        path: str,
+        file_type: str,
+        options: DataSummaryOptions,
+        executor: Optional[Executor] = None,
+        cancel_marker: Optional[str] = None
+    ) -> str:
+        """
+        Profile the requested worksheets concurrently and render one combined text report
+        """
+        sheet_profiles = await HandleFileService.profile_sheets(path, file_type, options, executor, cancel_marker)
+        return HandleFileService.render_sheet_summaries(sheet_profiles)
+
+    @staticmethod
+    def build_data_accumulator(
+        source: Union[str, BinaryIO],
+        file_type: str,
+        options: Optional[DataSummaryOptions] = None,
+        cancel_marker: Optional[str] = None,
+        sheet: Optional[str] = None,
+        cube: Optional[DimensionCubeAccumulator] = None,
+        stage_timings: Optional[Dict[str, float]] = None,
+        progress: Optional[Callable[[DataProfileAccumulator, Optional[float]], None]] = None,
+        table_loader: Optional[DatasetTableLoader] = None
+    ) -> DataProfileAccumulator:
+        """
+        Fold a CSV, Excel or columnar source into a mergeable, unfinished profile,
+        optionally aggregating a dimension cube from the same chunks and bulk-loading
+        them into a dataset table
+
+        Seconds spent per stage (infer, read, convert, profile, cube, load) are added to
+        stage_timings when it is given. progress is called after every chunk with
+        the profile so far and the fraction of the source consumed (None when the
+        reader cannot tell); it may raise to stop early
+        """
+        options = options or DataSummaryOptions()
+        logger.info(f"Start to generate data summary (mode={options.mode})")
+        profile = DataProfileAccumulator(options)
+        schema = None
+        stage_timings = {} if stage_timings is None else stage_timings
+        read_progress = _ReadProgress()
+
+        if file_type in COLUMNAR_FILE_TYPES:
+            # Columnar files are memory-mapped, so they must already be spooled to disk
+            arrow_schema = read_schema(source, file_type)
+            columns = resolve_columns(arrow_schema, options.columns)
+            chunks = iter_columnar_chunks(source, file_type, columns, settings.CSV_CHUNK_SIZE)
+            profile.unloaded_columns = read_column_metadata(
+                source, file_type, [name for name in arrow_schema.names if name not in columns])
+            if progress is not None:
+                read_progress.total_rows = count_rows(source, file_type)
+        elif file_type == '.csv' or file_type in COMPRESSED_CSV_FILE_TYPES:
+            read_csv_kwargs = {}
+            if options.infer_dtypes and isinstance(source, str):
+                # Sample the head of the file so the full read parses straight into compact dtypes
+                started = time.perf_counter()
+                if file_type in COMPRESSED_CSV_FILE_TYPES:
+                    # Only the head is decompressed, by a reader of its own
+                    with DecompressingReader(source, file_type, settings.MAX_DECOMPRESSED_BYTES) as reader:
+                        sample = pd.read_csv(
+                            reader, nrows=settings.DTYPE_INFERENCE_SAMPLE_ROWS, usecols=_column_selector(options.columns))
+                else:
+                    sample = pd.read_csv(
+                        source, nrows=settings.DTYPE_INFERENCE_SAMPLE_ROWS, usecols=_column_selector(options.columns))
+                schema = infer_schema(sample, settings.DTYPE_CATEGORICAL_MAX_RATIO)
+                profile.memory_footprint = schema.measure(sample)
+                profile.add_datetime_formats(schema.datetime)
+                read_csv_kwargs = schema.read_csv_kwargs()
+                _add_stage_time(stage_timings, "infer", started)
+            # Stream the source through the parser so only one chunk is held in memory;
+            # spooled files are memory-mapped instead of read through Python file objects,
+            # unless progress is reported, which needs a handle whose position can be read
+            read_csv_kwargs.update(chunksize=settings.CSV_CHUNK_SIZE, usecols=_column_selector(options.columns))
+            if file_type in COMPRESSED_CSV_FILE_TYPES:
+                # Compressed files must already be spooled to disk; they stay compressed there
+                read_progress.total_bytes = os.path.getsize(source)
+                chunks = _iter_compressed_csv(source, file_type, profile, read_progress, **read_csv_kwargs)
+            elif progress is not None and isinstance(source, str):
+                read_progress.total_bytes = os.path.getsize(source)
+                chunks = _iter_csv_tracking_position(source, read_progress, **read_csv_kwargs)
+            else:
+                chunks = pd.read_csv(source, memory_map=isinstance(source, str), **read_csv_kwargs)
+        else:
+            chunks = iter_excel_chunks(
+                source, file_type, sheet, _column_selector(options.columns), settings.CSV_CHUNK_SIZE, settings.EXCEL_ENGINE)
+
+        for chunk in _timed_chunks(chunks, stage_timings):
+            if cancel_marker and os.path.exists(cancel_marker):
+                raise DataSummaryCancelledError("Data summary cancelled")
+            if options.infer_dtypes:
+                if schema is None:
+                    # Readers without a pre-pass infer from their first chunk instead
+                    started = time.perf_counter()
+                    sample = chunk.head(settings.DTYPE_INFERENCE_SAMPLE_ROWS)
+                    schema = infer_schema(sample, settings.DTYPE_CATEGORICAL_MAX_RATIO)
+                    profile.memory_footprint = schema.measure(sample)
+                    profile.add_datetime_formats(schema.datetime)
+                    _add_stage_time(stage_timings, "infer", started)
+                started = time.perf_counter()
+                chunk = schema.apply(chunk)
+                _add_stage_time(stage_timings, "convert", started)
+            started = time.perf_counter()
+            profile.update(chunk)
+            _add_stage_time(stage_timings, "profile", started)
+            if cube is not None:
+                started = time.perf_counter()
+                cube.update(chunk)
+                _add_stage_time(stage_timings, "cube", started)
+            if table_loader is not None:
+                started = time.perf_counter()
+                table_loader.update(chunk)
+                _add_stage_time(stage_timings, "load", started)
+            if progress is not None:
+                read_progress.rows += len(chunk)
+                progress(profile, read_progress.fraction())
+
+        if options.columns:
+            missing = [column for column in options.columns if column not in profile.columns]
+            if missing:
+                raise UnknownColumnsError(f"Unknown columns: {missing}")
+
+        timings = ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in stage_timings.items())
+        logger.debug(f"Stage timings: {timings}")
+        return profile
+
+    @staticmethod
+    def build_data_profile(
+        source: Union[str, BinaryIO],
+        file_type: str,
+        options: Optional[DataSummaryOptions] = None,
+        cancel_marker: Optional[str] = None,
+        sheet: Optional[str] = None
+    ) -> DataProfile:
+        """
+        Fold a CSV, Excel or columnar source into a finished profile
+        """
+        if options is not None and options.mode == "sample":
+            return HandleFileService.build_sample_profile(source, file_type, options, sheet)
+        data_profile = HandleFileService.build_data_accumulator(source, file_type, options, cancel_marker, sheet).finalize()
+        logger.info(f"Profiled {data_profile.total_records} records across {len(data_profile.columns)} columns")
+        return data_profile
 
-        contents = await file.read()
-        main_dataframe = pd.read_csv(io.BytesIO(contents)) if file_type == '.csv' else pd.read_excel(io.BytesIO(contents))
+    @staticmethod
+    def build_sample_profile(
+        path: str,
+        file_type: str,
+        options: DataSummaryOptions,
+        sheet: Optional[str] = None
+    ) -> DataProfile:
+        """
+        Profile the leading rows plus a random sample of a spooled file, for a quick preview
 
-        summary_lines.append("\n🔍 FIRST 10 ROWS (original):")
-        for index, row in main_dataframe.head(10).iterrows():
-            row_text = ', '.join(str(value) for value in row)
+        Statistics come from the sample only and the record count is estimated where
+        the format cannot report it, so the report labels every figure as estimated
+        """
+        compression = None
+        if file_type in COLUMNAR_FILE_TYPES:
+            columns = resolve_columns(read_schema(path, file_type), options.columns)
+            head, sample, total_records = sample_columnar_rows(
+                path, file_type, columns, settings.SAMPLE_HEAD_ROWS, options.sample_size)
+            frame = pd.concat([head, sample])
+            sample_info = SampleInfo(len(head), len(sample), "random rows" if file_type != '.parquet' else "random row groups")
+        elif file_type == '.csv':
+            frame, sample_info, total_records = sample_csv_rows(
+                path, _column_selector(options.columns), settings.SAMPLE_HEAD_ROWS, options.sample_size)
+        elif file_type in COMPRESSED_CSV_FILE_TYPES:
+            # Compressed streams cannot be entered at random offsets, so the rows are drawn while decompressing
+            with DecompressingReader(path, file_type, settings.MAX_DECOMPRESSED_BYTES) as reader:
+                with pd.read_csv(
+                        reader, usecols=_column_selector(options.columns), chunksize=settings.CSV_CHUNK_SIZE) as chunks:
+                    frame, sample_info, total_records = sample_chunks(chunks, settings.SAMPLE_HEAD_ROWS, options.sample_size)
+                compression = reader.info()
+        else:
+            chunks = iter_excel_chunks(
+                path, file_type, sheet, _column_selector(options.columns), settings.CSV_CHUNK_SIZE, settings.EXCEL_ENGINE)
+            frame, sample_info, total_records = sample_chunks(chunks, settings.SAMPLE_HEAD_ROWS, options.sample_size)
+
+        profile = DataProfileAccumulator(options)
+        profile.compression = compression
+        if options.infer_dtypes and not frame.empty:
+            schema = infer_schema(frame.head(settings.DTYPE_INFERENCE_SAMPLE_ROWS), settings.DTYPE_CATEGORICAL_MAX_RATIO)
+            profile.memory_footprint = schema.measure(frame.head(settings.DTYPE_INFERENCE_SAMPLE_ROWS))
+            profile.add_datetime_formats(schema.datetime)
+            frame = schema.apply(frame)
+        profile.update(frame)
+
+        if options.columns:
+            missing = [column for column in options.columns if column not in profile.columns]
+            if missing:
+                raise UnknownColumnsError(f"Unknown columns: {missing}")
+
+        data_profile = profile.finalize()
+        data_profile.total_records = total_records
+        data_profile.sample = sample_info
+        logger.info(
+            f"Sampled {sample_info.head_rows} + {sample_info.random_rows} of "
+            f"{'~' if sample_info.total_records_estimated else ''}{total_records} records")
+        return data_profile
+
+    @staticmethod
+    def render_profile(profile: DataProfile, output_format: str = "text") -> bytes:
+        """
+        Render a profile as the text report or as a JSON/MessagePack document
+        """
+        if output_format == "text":
+            return HandleFileService.render_summary(profile).encode("utf-8")
+        return encode_document(profile_document(profile), output_format)
+
+    @staticmethod
+    def render_sections(sections: List[SheetProfile], output_format: str = "text", label: str = "sheet") -> bytes:
+        """
+        Render timed per-sheet (or per-file) profiles in the requested format
+        """
+        if output_format == "text":
+            return HandleFileService.render_sheet_summaries(sections, label).encode("utf-8")
+        return encode_document({f"{label}s": sections_document(sections, label)}, output_format)
+
+    @staticmethod
+    def render_sheet_summaries(sheet_profiles: List[SheetProfile], label: str = "sheet") -> str:
+        """
+        Render one report per worksheet (or file), preceded by how long each one took
+        """
+        summary_lines = [f"\n⏱️ {label.upper()} TIMINGS:"]
+        for sheet_profile in sheet_profiles:
+            summary_lines.append(
+                f"    - {sheet_profile.name}: {sheet_profile.seconds:.2f}s "
+                f"({sheet_profile.profile.total_records} records)")
+
+        for sheet_profile in sheet_profiles:
+            summary_lines.append(f"\n{'=' * 60}\n📄 {label.upper()}: {sheet_profile.name}\n{'=' * 60}")
+            summary_lines.append(HandleFileService.render_summary(sheet_profile.profile))
+
+        return "\n".join(summary_lines)
+
+    @staticmethod
+    def render_summary(profile: DataProfile) -> str:
+        """
+        Render the text report from a completed profile
+        """
+        return "\n".join(HandleFileService.iter_summary_sections(profile))
+
+    @staticmethod
+    def render_preview(preview_rows: List[Tuple[Any, List[Any]]]) -> str:
+        """
+        Render the first rows of a file, which are known as soon as its first chunk is read
+        """
+        summary_lines = ["\n🔍 FIRST 10 ROWS (original):"]
+        for index, values in preview_rows:
+            row_text = ', '.join(str(value) for value in values)
             summary_lines.append(f"row {index + 1}: {row_text}")
+        return "\n".join(summary_lines)
 
-        main_dataframe.dropna(how='all', inplace=True)
-        main_dataframe.dropna(axis=1, how='all', inplace=True)
-        main_dataframe.columns = main_dataframe.columns.str.strip()
+    @staticmethod
+    def iter_summary_sections(profile: DataProfile, include_preview: bool = True) -> Iterator[str]:
+        """
+        Yield the text report block by block: preview, overview, one block per column, then distributions
+        """
+        if include_preview:
+            yield HandleFileService.render_preview(profile.preview_rows)
 
-        columns = main_dataframe.columns
+        summary_lines = []
+        columns = profile.columns
+        sample = profile.sample
+        # Sample-mode figures describe only the sampled rows
+        in_sample = " (in sample)" if sample is not None else ""
 
         summary_lines.append("🧾 DATA SUMMARY\n")
-        summary_lines.append(f"🔢 Total Records: {len(main_dataframe)}")
-        summary_lines.append(f"🧱 Columns: {list(columns)}\n")
+        if sample is not None:
+            summary_lines.append(
+                f"🎲 SAMPLE MODE - every figure is estimated from the first {sample.head_rows} rows plus "
+                f"{sample.random_rows} drawn at random ({sample.method}); request mode=exact for the full report\n")
+        total_records = f"≈{profile.total_records}" if sample is not None and sample.total_records_estimated else profile.total_records
+        summary_lines.append(f"🔢 Total Records: {total_records}")
+        summary_lines.append(f"🧱 Columns: {[column.name for column in columns]}\n")
+
+        footprint = profile.memory_footprint
+        if footprint is not None:
+            default_bytes = footprint.default_bytes_per_row * profile.total_records
+            optimized_bytes = footprint.optimized_bytes_per_row * profile.total_records
+            saving = 1 - optimized_bytes / default_bytes if default_bytes else 0
+            summary_lines.append(f"💾 MEMORY FOOTPRINT (estimated from a {footprint.sample_rows}-row sample):")
+            summary_lines.append(f"    - Default dtypes: {_format_bytes(default_bytes)}")
+            summary_lines.append(f"    - Inferred dtypes: {_format_bytes(optimized_bytes)} ({saving:.0%} smaller)")
+            summary_lines.append(f"    - Categorical columns: {footprint.categorical_columns}")
+            summary_lines.append(f"    - Parsed datetime columns: {footprint.datetime_columns}\n")
+
+        compression = profile.compression
+        if compression is not None:
+            summary_lines.append(f"🗜️ COMPRESSION ({compression.codec}):")
+            summary_lines.append(f"    - Compressed size: {_format_bytes(compression.compressed_bytes)}")
+            summary_lines.append(
+                f"    - Uncompressed size: {_format_bytes(compression.uncompressed_bytes)} ({compression.ratio:.1f}x ratio)")
+            summary_lines.append(
+                f"    - Decompression: {compression.seconds:.2f}s ({_format_bytes(compression.bytes_per_second)}/s)\n")
+
+        if profile.error_bounds:
+            summary_lines.append("⚙️ APPROXIMATE MODE - figures marked ≈ are estimates:")
+            for label, bound in profile.error_bounds:
+                summary_lines.append(f"    - {label}: {bound}")
+            summary_lines.append("")
 
         summary_lines.append("📌 COLUMN DETAILS:")
+        yield "\n".join(summary_lines)
 
         for column in columns:
-            sample_values = main_dataframe[column].dropna().astype(str).unique()[:3]
-            is_unique = main_dataframe[column].is_unique
-            dtype = main_dataframe[column].dtype
-
-            summary_lines.append(f"\n🧷 Column: {column}")
-            summary_lines.append(f"    - Data type: {dtype}")
-            summary_lines.append(f"    - Sample values: {sample_values}")
-            summary_lines.append(f"    - Unique: {'Yes ✅' if is_unique else 'No ❌'}")
-            summary_lines.append(f"    - Null values: {main_dataframe[column].isnull().sum()}")
-
-            if pd.api.types.is_numeric_dtype(main_dataframe[column]):
-                summary_lines.append(f"    - Min: {main_dataframe[column].min()}, Max: {main_dataframe[column].max()}")
-            elif pd.api.types.is_datetime64_any_dtype(main_dataframe[column]) or "time" in column.lower():
-                try:
-                    main_dataframe[column] = pd.to_datetime(main_dataframe[column])
-                    summary_lines.append(
-                        f"    - Date range: {main_dataframe[column].min()} to {main_dataframe[column].max()}")
-                except:
+            summary_lines = [f"\n🧷 Column: {column.name}"]
+            summary_lines.append(f"    - Data type: {column.dtype}")
+            summary_lines.append(f"    - Sample values: {column.sample_values}")
+            summary_lines.append(
+                f"    - Unique: {'Yes ✅' if column.is_unique else 'No ❌'}{' (≈)' if column.approximate or sample else ''}")
+            summary_lines.append(f"    - Null values: {column.null_count}{in_sample}")
+
+            if column.is_numeric:
+                summary_lines.append(f"    - Min: {column.minimum}, Max: {column.maximum}{in_sample}")
+                if column.quantiles:
+                    quantiles = ', '.join(f"p{int(q * 100)}={value:.10g}" for q, value in column.quantiles.items())
+                    summary_lines.append(f"    - Quantiles (≈): {quantiles}")
+            if column.is_datetime_like and (not column.is_numeric or column.datetime_format):
+                if column.datetime_failed:
                     summary_lines.append("    - ⚠️ Could not parse datetime")
+                else:
+                    summary_lines.append(f"    - Date range: {column.datetime_min} to {column.datetime_max}{in_sample}")
+                    summary_lines.append(f"    - Datetime format: {column.datetime_format or 'native timestamps'}")
+                    if column.datetime_failed_count:
+                        summary_lines.append(f"    - ⚠️ Values that failed to parse: {column.datetime_failed_count}")
 
             summary_lines.append("-" * 60)
+            yield "\n".join(summary_lines)
+
+        summary_lines = []
+        if profile.unloaded_columns:
+            summary_lines.append("\n📎 COLUMNS NOT LOADED (from file metadata):")
+            for column in profile.unloaded_columns:
+                summary_lines.append(f"\n🧷 Column: {column.name}")
+                summary_lines.append(f"    - Data type: {column.dtype}")
+                summary_lines.append(
+                    f"    - Null values: {column.null_count if column.null_count is not None else 'unknown'}")
+                if column.minimum is not None:
+                    summary_lines.append(f"    - Min: {column.minimum}, Max: {column.maximum}")
+                summary_lines.append("-" * 60)
 
         summary_lines.append("\n📊 VALUE DISTRIBUTION SUMMARY:")
-        summary = []
-        for column in main_dataframe.columns:
-            value_counts = main_dataframe[column].value_counts(dropna=True)
-            unique_count = value_counts.shape[0]
-            median_freq = value_counts.median()
-            top3 = value_counts.head(3).to_dict()
-            summary.append({
-                'Column': column,
-                'Unique Values': unique_count,
-                'Median Frequency': median_freq,
-                'Top 3 Most Common': top3
-            })
+        summary = [
+            {
+                'Column': column.name,
+                'Unique Values': f"≈{column.unique_count}" if column.approximate or sample else column.unique_count,
+                'Median Frequency': f"≈{column.median_frequency}" if column.approximate or sample else column.median_frequency,
+                'Top 3 Most Common': column.top_values(3)
+            }
+            for column in columns
+        ]
         summary_dataframe = pd.DataFrame(summary)
         summary_lines.append(summary_dataframe.to_string(index=False))
 
         summary_lines.append("\n📈 KNOWN DIMENSION DISTRIBUTIONS (if present):")
-        for key in ['imsi', 'subscriptionId', 'offerName', 'zone', 'requestType', 'mccmnc']:
-            if key in main_dataframe.columns:
-                summary_lines.append(f"\n▶ {key} distribution:")
-                summary_lines.append(main_dataframe[key].value_counts().describe().to_string())
-                summary_lines.append(main_dataframe[key].value_counts().head(5).to_string())
+        for key in KNOWN_DIMENSIONS:
+            column = profile.column(key)
+            if column is None:
+                continue
+            summary_lines.append(f"\n▶ {key} distribution{in_sample}:")
+            if column.approximate:
+                summary_lines.append(f"distinct   ≈{column.unique_count} (±{column.distinct_error:.2%})")
+                summary_lines.append(f"median     ≈{column.median_frequency}")
+                summary_lines.append(f"top counts may overestimate by up to {column.frequency_error}")
+            else:
+                summary_lines.append(column.value_counts.describe().to_string())
+            summary_lines.append(column.value_counts.head(5).to_string())
 
-        if 'requestType' in main_dataframe.columns:
-            summary_lines.append("\n📂 Request Type Breakdown:")
-            summary_lines.append(main_dataframe['requestType'].value_counts().to_string())
+        request_type = profile.column('requestType')
+        if request_type is not None:
+            summary_lines.append(f"\n📂 Request Type Breakdown{in_sample}:")
+            if request_type.approximate:
+                summary_lines.append(f"(most common values only, counts may overestimate by up to {request_type.frequency_error})")
+            summary_lines.append(request_type.value_counts.to_string())
 
-        return "\n".join(summary_lines)
-    
\ No newline at end of file
+        yield "\n".join(summary_lines)
@@ -1,11 +1,12 @@
 import psutil
 import time
+from typing import List
 from sqlalchemy import text
 from shared.utils import utc_now
-from app.schemas.health import HealthResponse, DatabaseStatus
+from app.schemas.health import HealthResponse, DatabasePoolStats, DatabaseStatus
 from app.core.config import settings
 from shared.utils import get_logger
-from shared.database.dbContext import get_db
+from shared.database.dbContext import get_async_db, get_pool_statistics
 
 logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
 
@@ -42,6 +43,12 @@ class HealthService:
             database=database_status
         )
     
+    async def get_database_pool_stats(self) -> List[DatabasePoolStats]:
+        """
+        Report connection pool occupancy and wait times for sizing the pool
+        """
+        return [DatabasePoolStats(**statistics) for statistics in get_pool_statistics()]
+
     async def _check_database_connectivity(self) -> DatabaseStatus:
         """
         Check database connectivity and response time
@@ -50,12 +57,12 @@ class HealthService:
             start_time = time.time()
             
             # Get database session
-            db_gen = get_db()
-            db = next(db_gen)
+            db_gen = get_async_db()
+            db = await anext(db_gen)
             
             try:
                 # Execute a simple query to test connectivity
-                result = db.execute(text("SELECT 1 as test"))
+                result = await db.execute(text("SELECT 1 as test"))
                 result.fetchone()
                 
                 end_time = time.time()
@@ -70,7 +77,7 @@ class HealthService:
                 )
                 
             finally:
-                db.close()
+                await db_gen.aclose()
                 
         except Exception as e:
             error_msg = str(e)
@@ -0,0 +1,316 @@
+import datetime
+import decimal
+import io
+import json
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import (
+    ColumnAccumulator,
+    ColumnMetadata,
+    CompressionInfo,
+    DataProfileAccumulator,
+    MemoryFootprint,
+    SketchColumnAccumulator,
+)
+from app.services.datetime_parsing import DatetimeFormat
+from app.services.sketches import DistinctValueSample, HyperLogLog, SpaceSavingSketch, TDigest
+
+# Numeric arrays are stored raw; any other index is stored as a list of tagged scalars
+RAW_ARRAY_KINDS = "biuf"
+
+
+class _ArrayStore:
+    """
+    Arrays written next to the JSON document, referenced from it by name
+    """
+
+    def __init__(self, arrays: Optional[Dict[str, np.ndarray]] = None):
+        self.arrays = arrays if arrays is not None else {}
+
+    def put(self, array: np.ndarray) -> Dict[str, str]:
+        name = f"a{len(self.arrays)}"
+        self.arrays[name] = np.ascontiguousarray(array)
+        return {"array": name}
+
+    def get(self, reference: Dict[str, str]) -> np.ndarray:
+        return self.arrays[reference["array"]]
+
+
+def _encode_value(value: Any) -> Any:
+    """
+    A cell, column name or extreme as JSON; values JSON cannot tell apart carry a type tag
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (np.bool_, np.integer, np.floating)):
+        return {"type": "numpy", "dtype": value.dtype.str, "value": value.item()}
+    if isinstance(value, (int, float)):
+        return value
+    if value is pd.NaT:
+        return {"type": "NaT"}
+    if value is pd.NA:
+        return {"type": "NA"}
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if isinstance(value, np.timedelta64):
+        value = pd.Timedelta(value)
+    if isinstance(value, pd.Timestamp):
+        return {"type": "timestamp", "value": value.isoformat(), "unit": value.unit,
+                "tz": str(value.tz) if value.tz is not None else None}
+    if isinstance(value, pd.Timedelta):
+        return {"type": "timedelta", "value": value.isoformat(), "unit": value.unit}
+    if isinstance(value, datetime.datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"type": "date", "value": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"type": "time", "value": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {"type": "decimal", "value": str(value)}
+    raise TypeError(f"Cannot store a {type(value).__name__} value in a dataset profile")
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    kind = value["type"]
+    if kind == "NaT":
+        return pd.NaT
+    if kind == "NA":
+        return pd.NA
+    if kind == "numpy":
+        return np.dtype(value["dtype"]).type(value["value"])
+    if kind == "timestamp":
+        timestamp = pd.Timestamp(value["value"])
+        if value["tz"] is not None:
+            timestamp = timestamp.tz_convert(value["tz"])
+        return timestamp.as_unit(value["unit"])
+    if kind == "timedelta":
+        return pd.Timedelta(value["value"]).as_unit(value["unit"])
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(value["value"])
+    if kind == "date":
+        return datetime.date.fromisoformat(value["value"])
+    if kind == "time":
+        return datetime.time.fromisoformat(value["value"])
+    if kind == "decimal":
+        return decimal.Decimal(value["value"])
+    raise ValueError(f"Unknown value type {kind} in a stored dataset profile")
+
+
+def _encode_dtype(dtype: Any) -> Optional[str]:
+    return str(dtype) if dtype is not None else None
+
+
+def _decode_dtype(dtype: Optional[str]) -> Any:
+    return pd.api.types.pandas_dtype(dtype) if dtype is not None else None
+
+
+def _encode_index(index: pd.Index, store: _ArrayStore) -> Dict[str, Any]:
+    if isinstance(index.dtype, np.dtype) and index.dtype.kind in RAW_ARRAY_KINDS:
+        return {"dtype": index.dtype.str, "values": store.put(index.to_numpy())}
+    return {"dtype": str(index.dtype), "values": [_encode_value(value) for value in index]}
+
+
+def _decode_index(document: Dict[str, Any], store: _ArrayStore) -> pd.Index:
+    values = document["values"]
+    if isinstance(values, dict):
+        return pd.Index(store.get(values), dtype=np.dtype(document["dtype"]))
+    return pd.Index([_decode_value(value) for value in values], dtype=pd.api.types.pandas_dtype(document["dtype"]))
+
+
+def _encode_counts(counts: pd.Series, store: _ArrayStore) -> Dict[str, Any]:
+    return {"index": _encode_index(counts.index, store), "counts": store.put(counts.to_numpy(dtype=np.int64))}
+
+
+def _decode_counts(document: Dict[str, Any], store: _ArrayStore) -> pd.Series:
+    return pd.Series(store.get(document["counts"]), index=_decode_index(document["index"], store), dtype="int64")
+
+
+def _encode_datetime_format(datetime_format: Optional[DatetimeFormat]) -> Optional[Dict[str, str]]:
+    return {"kind": datetime_format.kind, "value": datetime_format.value} if datetime_format is not None else None
+
+
+def _decode_datetime_format(document: Optional[Dict[str, str]]) -> Optional[DatetimeFormat]:
+    return DatetimeFormat(document["kind"], document["value"]) if document is not None else None
+
+
+def _encode_sketches(accumulator: SketchColumnAccumulator, store: _ArrayStore) -> Dict[str, Any]:
+    return {
+        "distinct": {
+            "precision": accumulator.distinct.precision,
+            "registers": store.put(accumulator.distinct.registers),
+        },
+        "top_values": {
+            "capacity": accumulator.top_values.capacity,
+            "counts": _encode_counts(accumulator.top_values.counts, store),
+            "errors": store.put(accumulator.top_values.errors.to_numpy(dtype=np.int64)),
+            "total": accumulator.top_values.total,
+        },
+        "frequency_sample": {
+            "size": accumulator.frequency_sample.size,
+            "frequencies": _encode_counts(accumulator.frequency_sample.frequencies, store),
+        },
+        "quantiles": {
+            "compression": accumulator.quantiles.compression,
+            "means": store.put(accumulator.quantiles.means),
+            "weights": store.put(accumulator.quantiles.weights),
+            "minimum": accumulator.quantiles.minimum,
+            "maximum": accumulator.quantiles.maximum,
+        },
+    }
+
+
+def _decode_sketches(accumulator: SketchColumnAccumulator, document: Dict[str, Any], store: _ArrayStore) -> None:
+    distinct = HyperLogLog(document["distinct"]["precision"])
+    distinct.registers = store.get(document["distinct"]["registers"]).copy()
+
+    top_values = SpaceSavingSketch(document["top_values"]["capacity"])
+    top_values.counts = _decode_counts(document["top_values"]["counts"], store)
+    top_values.errors = pd.Series(store.get(document["top_values"]["errors"]), index=top_values.counts.index, dtype="int64")
+    top_values.total = document["top_values"]["total"]
+
+    frequency_sample = DistinctValueSample(document["frequency_sample"]["size"])
+    frequency_sample.frequencies = _decode_counts(document["frequency_sample"]["frequencies"], store)
+
+    quantiles = TDigest(document["quantiles"]["compression"])
+    quantiles.means = store.get(document["quantiles"]["means"]).copy()
+    quantiles.weights = store.get(document["quantiles"]["weights"]).copy()
+    quantiles.minimum = document["quantiles"]["minimum"]
+    quantiles.maximum = document["quantiles"]["maximum"]
+
+    accumulator.distinct = distinct
+    accumulator.top_values = top_values
+    accumulator.frequency_sample = frequency_sample
+    accumulator.quantiles = quantiles
+
+
+def _encode_column(accumulator: ColumnAccumulator, store: _ArrayStore) -> Dict[str, Any]:
+    document = {
+        "name": _encode_value(accumulator.name),
+        "dtype": _encode_dtype(accumulator.dtype),
+        "non_null_count": accumulator.non_null_count,
+        "null_count": accumulator.null_count,
+        "sample_values": list(accumulator.sample_values),
+        "minimum": _encode_value(accumulator.minimum),
+        "maximum": _encode_value(accumulator.maximum),
+        "datetime_min": _encode_value(accumulator.datetime_min),
+        "datetime_max": _encode_value(accumulator.datetime_max),
+        "datetime_format": _encode_datetime_format(accumulator.datetime_format),
+        "datetime_failed_count": accumulator.datetime_failed_count,
+    }
+    # A sketched column's frequency table is never read back; its sketches hold the counts
+    if isinstance(accumulator, SketchColumnAccumulator):
+        document["sketches"] = _encode_sketches(accumulator, store)
+    else:
+        document["value_counts"] = _encode_counts(accumulator.value_counts, store)
+    return document
+
+
+def _decode_column(document: Dict[str, Any], options: DataSummaryOptions, store: _ArrayStore) -> ColumnAccumulator:
+    name = _decode_value(document["name"])
+    datetime_format = _decode_datetime_format(document["datetime_format"])
+    if "sketches" in document:
+        accumulator = SketchColumnAccumulator(name, options, datetime_format)
+        _decode_sketches(accumulator, document["sketches"], store)
+    else:
+        accumulator = ColumnAccumulator(name, datetime_format)
+        accumulator.value_counts = _decode_counts(document["value_counts"], store)
+    accumulator.dtype = _decode_dtype(document["dtype"])
+    accumulator.non_null_count = document["non_null_count"]
+    accumulator.null_count = document["null_count"]
+    accumulator.sample_values = list(document["sample_values"])
+    accumulator.minimum = _decode_value(document["minimum"])
+    accumulator.maximum = _decode_value(document["maximum"])
+    accumulator.datetime_min = _decode_value(document["datetime_min"])
+    accumulator.datetime_max = _decode_value(document["datetime_max"])
+    accumulator.datetime_failed_count = document["datetime_failed_count"]
+    return accumulator
+
+
+def _encode_metadata(metadata: ColumnMetadata) -> Dict[str, Any]:
+    return {
+        "name": _encode_value(metadata.name),
+        "dtype": metadata.dtype,
+        "null_count": metadata.null_count,
+        "minimum": _encode_value(metadata.minimum),
+        "maximum": _encode_value(metadata.maximum),
+    }
+
+
+def _decode_metadata(document: Dict[str, Any]) -> ColumnMetadata:
+    return ColumnMetadata(
+        name=_decode_value(document["name"]),
+        dtype=document["dtype"],
+        null_count=document["null_count"],
+        minimum=_decode_value(document["minimum"]),
+        maximum=_decode_value(document["maximum"]),
+    )
+
+
+def dump_accumulator(accumulator: DataProfileAccumulator) -> bytes:
+    """
+    Serialize a profile accumulator as a JSON document plus its counts and sketch arrays
+
+    Nothing is pickled: the arrays are written as an .npz archive and read back with
+    allow_pickle=False, and every other value is a JSON type or an explicitly tagged scalar
+    """
+    store = _ArrayStore()
+    document = {
+        "options": accumulator.options.model_dump(mode="json"),
+        "preview_rows": [
+            [_encode_value(index), [_encode_value(value) for value in values]]
+            for index, values in accumulator.preview_rows
+        ],
+        "total_records": accumulator.total_records,
+        "columns": [_encode_column(column, store) for column in accumulator.columns.values()],
+        "unloaded_columns": [_encode_metadata(metadata) for metadata in accumulator.unloaded_columns],
+        "memory_footprint": asdict(accumulator.memory_footprint) if accumulator.memory_footprint else None,
+        "compression": asdict(accumulator.compression) if accumulator.compression else None,
+        "schema_columns": (
+            [_encode_value(column) for column in accumulator.schema_columns]
+            if accumulator.schema_columns is not None else None),
+        "datetime_formats": [
+            [_encode_value(column), _encode_datetime_format(datetime_format)]
+            for column, datetime_format in accumulator.datetime_formats.items()
+        ],
+    }
+    encoded = np.frombuffer(json.dumps(document).encode("utf-8"), dtype=np.uint8)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, document=encoded, **store.arrays)
+    return buffer.getvalue()
+
+
+def load_accumulator(data: bytes) -> DataProfileAccumulator:
+    """
+    Rebuild a profile accumulator written by dump_accumulator
+    """
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    document = json.loads(arrays.pop("document").tobytes().decode("utf-8"))
+    store = _ArrayStore(arrays)
+
+    options = DataSummaryOptions(**document["options"])
+    accumulator = DataProfileAccumulator(options)
+    accumulator.preview_rows = [
+        (_decode_value(index), [_decode_value(value) for value in values])
+        for index, values in document["preview_rows"]
+    ]
+    accumulator.total_records = document["total_records"]
+    columns: List[ColumnAccumulator] = [_decode_column(column, options, store) for column in document["columns"]]
+    accumulator.columns = {column.name: column for column in columns}
+    accumulator.unloaded_columns = [_decode_metadata(metadata) for metadata in document["unloaded_columns"]]
+    if document["memory_footprint"] is not None:
+        accumulator.memory_footprint = MemoryFootprint(**document["memory_footprint"])
+    if document["compression"] is not None:
+        accumulator.compression = CompressionInfo(**document["compression"])
+    if document["schema_columns"] is not None:
+        accumulator.schema_columns = [_decode_value(column) for column in document["schema_columns"]]
+    accumulator.datetime_formats = {
+        _decode_value(column): _decode_datetime_format(datetime_format)
+        for column, datetime_format in document["datetime_formats"]
+    }
+    return accumulator
@@ -0,0 +1,135 @@
+import io
+import os
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.services.column_stats import SampleInfo
+
+# Fixed so repeated previews of the same file (and their cache entries) agree
+SAMPLE_SEED = 0
+# Rounds of sample_rows random offsets drawn at most while too few landed lines pass the rejection test
+SAMPLE_MAX_DRAW_ROUNDS = 20
+LINE_SEARCH_BLOCK_BYTES = 64 * 1024
+
+
+def sample_csv_rows(
+    path: str,
+    usecols: Optional[Callable[[str], bool]],
+    head_rows: int,
+    sample_rows: int,
+    seed: int = SAMPLE_SEED
+) -> Tuple[pd.DataFrame, SampleInfo, int]:
+    """
+    Read the leading rows of a CSV plus lines found at random byte offsets in the rest
+
+    Only the head and the sampled lines are parsed, so the cost does not depend on
+    the file size. A random byte lands in a line with probability proportional to its
+    length, so the record count is estimated from the lines landed in (body bytes times
+    their mean inverse length) and a landed line is kept with probability shortest / its
+    length, which leaves every line equally likely. Offsets are drawn for at most
+    SAMPLE_MAX_DRAW_ROUNDS rounds, so very uneven line lengths can return fewer rows.
+    Quoted fields spanning lines can make a sampled line unparseable, in which case it is skipped
+    """
+    head = pd.read_csv(path, nrows=head_rows, usecols=usecols)
+    file_size = os.path.getsize(path)
+
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        for _ in range(len(head)):
+            handle.readline()
+        body_start = handle.tell()
+        if len(head) < head_rows or body_start >= file_size:
+            return head, SampleInfo(len(head), 0, "whole file"), len(head)
+
+        rng = np.random.default_rng(seed)
+        landed: Dict[int, bytes] = {}
+        draws, keys = [], []
+        for _ in range(SAMPLE_MAX_DRAW_ROUNDS):
+            for offset in np.sort(rng.integers(body_start, file_size, sample_rows)):
+                line_start, line = _line_at(handle, int(offset), body_start)
+                landed[line_start] = line
+                draws.append(line_start)
+            keys.extend(rng.random(sample_rows))
+            if len(_accepted(landed, draws, keys)) >= sample_rows:
+                break
+
+    inverse_lengths = np.fromiter((1.0 / len(landed[start]) for start in draws), dtype="float64", count=len(draws))
+    total_records = len(head) + int(round((file_size - body_start) * inverse_lengths.mean()))
+    accepted = _accepted(landed, draws, keys)
+    if len(accepted) > sample_rows:
+        accepted = rng.choice(accepted, sample_rows, replace=False)
+    lines = [landed[start] for start in sorted(accepted)]
+    lines = [line if line.endswith(b"\n") else line + b"\n" for line in lines]
+
+    sample = pd.read_csv(io.BytesIO(header + b"".join(lines)), usecols=usecols, on_bad_lines="skip")
+    sample.index = pd.RangeIndex(len(head), len(head) + len(sample))
+    info = SampleInfo(len(head), len(sample), "random byte offsets", total_records_estimated=True)
+    return pd.concat([head, sample]), info, total_records
+
+
+def _line_at(handle: BinaryIO, offset: int, body_start: int) -> Tuple[int, bytes]:
+    """
+    Start and bytes of the line holding the byte at offset
+    """
+    line_start = offset
+    while line_start > body_start:
+        block_start = max(body_start, line_start - LINE_SEARCH_BLOCK_BYTES)
+        handle.seek(block_start)
+        newline = handle.read(line_start - block_start).rfind(b"\n")
+        if newline >= 0:
+            line_start = block_start + newline + 1
+            break
+        line_start = block_start
+    handle.seek(line_start)
+    return line_start, handle.readline()
+
+
+def _accepted(landed: Dict[int, bytes], draws: List[int], keys: List[float]) -> List[int]:
+    """
+    Distinct line starts whose draw passed the shortest / length rejection test
+    """
+    shortest = min(len(line) for line in landed.values())
+    return list({start: None for start, key in zip(draws, keys) if key < shortest / len(landed[start])})
+
+
+def sample_chunks(
+    chunks: Iterable[pd.DataFrame],
+    head_rows: int,
+    sample_rows: int,
+    seed: int = SAMPLE_SEED
+) -> Tuple[pd.DataFrame, SampleInfo, int]:
+    """
+    Keep the leading rows plus a uniform reservoir sample of the remaining rows of a stream
+
+    For readers without random access. Every row gets a random key and the rows with
+    the smallest keys are kept (bottom-k), one vectorized step per chunk; no
+    statistics are computed while streaming
+    """
+    rng = np.random.default_rng(seed)
+    head_parts, head_count, total_records = [], 0, 0
+    reservoir, keys = None, np.empty(0)
+
+    for chunk in chunks:
+        total_records += len(chunk)
+        if head_count < head_rows:
+            leading = chunk.iloc[:head_rows - head_count]
+            head_parts.append(leading)
+            head_count += len(leading)
+            chunk = chunk.iloc[len(leading):]
+        if chunk.empty:
+            continue
+
+        chunk_keys = rng.random(len(chunk))
+        if reservoir is None:
+            reservoir, keys = chunk, chunk_keys
+        else:
+            reservoir, keys = pd.concat([reservoir, chunk]), np.concatenate([keys, chunk_keys])
+        if len(reservoir) > sample_rows:
+            kept = np.argpartition(keys, sample_rows)[:sample_rows]
+            reservoir, keys = reservoir.iloc[kept], keys[kept]
+
+    head = pd.concat(head_parts) if head_parts else pd.DataFrame()
+    if reservoir is None:
+        return head, SampleInfo(len(head), 0, "whole file"), total_records
+    sample = reservoir.sort_index()
+    return pd.concat([head, sample]), SampleInfo(len(head), len(sample), "reservoir"), total_records
@@ -0,0 +1,252 @@
+import math
+from typing import Any, Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values: Iterable[Any]) -> np.ndarray:
+    """
+    Stable 64-bit hashes for a batch of values
+    """
+    index = pd.Index(values)
+    # Hash integers at full width so downcast chunks hash the same values identically
+    if pd.api.types.is_signed_integer_dtype(index):
+        index = index.astype("int64")
+    elif pd.api.types.is_unsigned_integer_dtype(index):
+        index = index.astype("uint64")
+    return pd.util.hash_pandas_object(index, index=False).to_numpy(dtype=np.uint64)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized int.bit_length() for uint64 arrays
+    """
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # frexp is exact for values that fit in 32 bits
+    high_bits = np.frexp(high)[1]
+    low_bits = np.frexp(low)[1]
+    return np.where(high > 0, high_bits + 32, low_bits)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2^precision one-byte registers
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        register_index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        remaining = hashes << np.uint64(self.precision)
+        max_rank = 64 - self.precision + 1
+        rank = np.minimum(64 - _bit_length(remaining) + 1, max_rank).astype(np.uint8)
+        np.maximum.at(self.registers, register_index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        register_count = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / register_count)
+        raw = alpha * register_count ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zero_registers = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is more accurate while many registers are still empty
+        if raw <= 2.5 * register_count and zero_registers:
+            return register_count * math.log(register_count / zero_registers)
+        return float(raw)
+
+
+class SpaceSavingSketch:
+    """
+    Mergeable Space-Saving summary of the most frequent values
+
+    Counts are upper bounds; each one overestimates the true frequency by at
+    most its recorded error, which never exceeds total / capacity
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("Space-Saving capacity must be positive")
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.errors = pd.Series(dtype="int64")
+        self.total = 0
+
+    @property
+    def is_saturated(self) -> bool:
+        """
+        Whether values have been evicted, i.e. counts are no longer exact
+        """
+        return bool(self.errors.any()) or len(self.counts) >= self.capacity
+
+    @property
+    def error_bound(self) -> int:
+        """
+        Largest possible overestimate of any reported count
+        """
+        return int(self.errors.max()) if len(self.errors) else 0
+
+    def _floor(self) -> int:
+        # Any value not in a full summary occurred at most min(counts) times
+        return int(self.counts.min()) if len(self.counts) >= self.capacity else 0
+
+    def update_counts(self, counts: pd.Series) -> None:
+        """
+        Add exact frequencies of a batch of values
+        """
+        self._combine(counts.astype("int64"), pd.Series(0, index=counts.index, dtype="int64"), 0, int(counts.sum()))
+
+    def merge(self, other: "SpaceSavingSketch") -> None:
+        self._combine(other.counts, other.errors, other._floor(), other.total)
+
+    def _combine(self, counts: pd.Series, errors: pd.Series, other_floor: int, other_total: int) -> None:
+        own_floor = self._floor()
+        if self.counts.empty:
+            merged_counts, merged_errors = counts, errors
+        else:
+            merged_counts = pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+            merged_errors = pd.concat([self.errors, errors]).groupby(level=0, sort=False).sum()
+            only_other = ~merged_counts.index.isin(self.counts.index)
+            only_self = ~merged_counts.index.isin(counts.index)
+            padding = np.where(only_other, own_floor, 0) + np.where(only_self, other_floor, 0)
+            merged_counts = merged_counts + padding
+            merged_errors = merged_errors + padding
+        if len(merged_counts) > self.capacity:
+            merged_counts = merged_counts.sort_values(ascending=False, kind="stable").iloc[:self.capacity]
+            merged_errors = merged_errors.loc[merged_counts.index]
+        self.counts = merged_counts.astype("int64")
+        self.errors = merged_errors.astype("int64")
+        self.total += other_total
+
+    def top(self, count: int) -> pd.Series:
+        return self.counts.sort_values(ascending=False, kind="stable").head(count)
+
+
+class TDigest:
+    """
+    Merging t-digest for streaming quantile estimates in bounded memory
+    """
+
+    def __init__(self, compression: int = 100):
+        if compression < 10:
+            raise ValueError("t-digest compression must be at least 10")
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    @property
+    def median_rank_error(self) -> float:
+        """
+        Width, as a fraction of all values, of the centroid covering the median
+        """
+        return math.pi / (2 * self.compression)
+
+    def update(self, values: np.ndarray, weights: np.ndarray = None) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+        keep = ~np.isnan(values)
+        values, weights = values[keep], weights[keep]
+        if len(values) == 0:
+            return
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._compress(values, weights)
+
+    def merge(self, other: "TDigest") -> None:
+        if len(other.means) == 0:
+            return
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress(other.means, other.weights)
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+
+        cumulative = np.cumsum(weights)
+        quantile = (cumulative - weights / 2) / cumulative[-1]
+        # Arcsine scale: centroids are small in the tails and widest at the median
+        scale = np.floor(self.compression * (np.arcsin(2 * quantile - 1) / math.pi + 0.5))
+        starts = np.flatnonzero(np.diff(scale, prepend=-1))
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: float) -> float:
+        if len(self.means) == 0:
+            return math.nan
+        cumulative = np.cumsum(self.weights)
+        centers = (cumulative - self.weights / 2) / cumulative[-1]
+        positions = np.concatenate([[0.0], centers, [1.0]])
+        values = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return float(np.interp(q, positions, values))
+
+
+class DistinctValueSample:
+    """
+    Bottom-k hash sample of distinct values with their exact frequencies
+
+    A value enters the sample the first time it is seen and is only evicted
+    once k smaller hashes exist, so every retained frequency is exact and the
+    sample is uniform over distinct values
+    """
+
+    def __init__(self, size: int = 1024):
+        if size < 1:
+            raise ValueError("Distinct sample size must be positive")
+        self.size = size
+        self.frequencies = pd.Series(dtype="int64")
+
+    def update(self, hashes: np.ndarray, counts: np.ndarray) -> None:
+        self._combine(pd.Series(np.asarray(counts, dtype=np.int64), index=np.asarray(hashes, dtype=np.uint64)))
+
+    def merge(self, other: "DistinctValueSample") -> None:
+        self._combine(other.frequencies)
+
+    def _combine(self, frequencies: pd.Series) -> None:
+        if not self.frequencies.empty:
+            frequencies = pd.concat([self.frequencies, frequencies])
+        frequencies = frequencies.groupby(level=0).sum()
+        self.frequencies = frequencies.iloc[:self.size]
+
+    def median_frequency(self) -> float:
+        return float(self.frequencies.median()) if len(self.frequencies) else math.nan
+
+
+def describe_error_bounds(
+    hll_precision: int,
+    top_k_capacity: int,
+    tdigest_compression: int,
+    frequency_sample_size: int
+) -> List[Tuple[str, str]]:
+    """
+    Human readable accuracy guarantees for a set of sketch parameters
+    """
+    return [
+        ("Distinct counts", f"HyperLogLog p={hll_precision}, standard error ±{1.04 / math.sqrt(1 << hll_precision):.2%}"),
+        ("Top values", f"Space-Saving capacity {top_k_capacity}, counts overestimate by at most N/{top_k_capacity}"),
+        ("Quantiles", f"t-digest δ={tdigest_compression}, rank error ≤ {math.pi / (2 * tdigest_compression):.2%} at the median"),
+        ("Median frequency", f"uniform sample of up to {frequency_sample_size} distinct values"),
+    ]
@@ -0,0 +1,171 @@
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import msgpack
+import numpy as np
+import orjson
+import pandas as pd
+from shared.constants.constants import KNOWN_DIMENSIONS
+from app.services.column_stats import ColumnStats, DataProfile
+
+SUMMARY_FORMATS = ("text", "json", "msgpack")
+SUMMARY_MEDIA_TYPES = {
+    "text": "text/plain; charset=utf-8",
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+}
+TOP_VALUE_COUNT = 10
+KNOWN_DIMENSION_TOP_COUNT = 5
+
+
+def _plain(value: Any) -> Any:
+    """
+    Convert numpy, pandas and datetime scalars into JSON/MessagePack-native values
+    """
+    # Before the builtin checks: np.float64 subclasses float, but orjson only serializes exact floats
+    if isinstance(value, np.generic):
+        return _plain(value.item())
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else float(value)
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return None if pd.isna(value) else value.isoformat()
+    if isinstance(value, (pd.Timedelta, timedelta)):
+        return None if pd.isna(value) else str(value)
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return str(value)
+
+
+def _value_counts(counts: pd.Series, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    # A list of pairs keeps non-string values intact, which object keys would not
+    if limit is not None:
+        counts = counts.head(limit)
+    return [{"value": _plain(value), "count": int(count)} for value, count in counts.items()]
+
+
+def column_document(column: ColumnStats, sampled: bool = False) -> Dict[str, Any]:
+    document = {
+        "name": _plain(column.name),
+        "dtype": str(column.dtype),
+        "non_null_count": column.non_null_count,
+        "null_count": column.null_count,
+        "sample_values": list(column.sample_values),
+        "unique": column.is_unique,
+        "unique_count": column.unique_count,
+        "median_frequency": _plain(column.median_frequency),
+        "approximate": column.approximate,
+        "estimated": column.approximate or sampled,
+        "top_values": _value_counts(column.value_counts, TOP_VALUE_COUNT),
+    }
+    if column.approximate:
+        document["distinct_error"] = column.distinct_error
+        document["frequency_error"] = column.frequency_error
+    if column.is_numeric:
+        document["minimum"] = _plain(column.minimum)
+        document["maximum"] = _plain(column.maximum)
+        if column.quantiles:
+            document["quantiles"] = {f"p{int(q * 100)}": _plain(value) for q, value in column.quantiles.items()}
+    if column.is_datetime_like and (not column.is_numeric or column.datetime_format):
+        document["datetime_parse_failed"] = column.datetime_failed
+        document["datetime_format"] = column.datetime_format
+        document["datetime_failed_count"] = column.datetime_failed_count
+        if not column.datetime_failed:
+            document["datetime_min"] = _plain(column.datetime_min)
+            document["datetime_max"] = _plain(column.datetime_max)
+    return document
+
+
+def preview_document(preview_rows: Sequence[Tuple[Any, List[Any]]]) -> List[Dict[str, Any]]:
+    return [
+        {"row": int(index) + 1, "values": [_plain(value) for value in values]}
+        for index, values in preview_rows
+    ]
+
+
+def profile_document(profile: DataProfile) -> Dict[str, Any]:
+    """
+    Structured form of a finished profile, carrying the same figures as the text report
+    """
+    known_dimensions = {}
+    for key in KNOWN_DIMENSIONS:
+        column = profile.column(key)
+        if column is None:
+            continue
+        dimension = {"top_values": _value_counts(column.value_counts, KNOWN_DIMENSION_TOP_COUNT)}
+        if not column.approximate:
+            dimension["frequency_stats"] = {
+                name: _plain(value) for name, value in column.value_counts.describe().items()}
+        known_dimensions[key] = dimension
+
+    document = {
+        "total_records": profile.total_records,
+        "preview_rows": preview_document(profile.preview_rows),
+        "columns": [column_document(column, profile.sample is not None) for column in profile.columns],
+        "known_dimensions": known_dimensions,
+        "error_bounds": [{"label": label, "bound": bound} for label, bound in profile.error_bounds],
+        "unloaded_columns": [
+            {
+                "name": _plain(column.name),
+                "dtype": column.dtype,
+                "null_count": column.null_count,
+                "minimum": _plain(column.minimum),
+                "maximum": _plain(column.maximum),
+            }
+            for column in profile.unloaded_columns
+        ],
+    }
+
+    if profile.sample is not None:
+        # Every figure below describes only the sampled rows
+        document["sample"] = {
+            "head_rows": profile.sample.head_rows,
+            "random_rows": profile.sample.random_rows,
+            "method": profile.sample.method,
+            "total_records_estimated": profile.sample.total_records_estimated,
+        }
+
+    request_type = profile.column('requestType')
+    if request_type is not None:
+        document["request_type_breakdown"] = _value_counts(request_type.value_counts)
+
+    footprint = profile.memory_footprint
+    if footprint is not None:
+        document["memory_footprint"] = {
+            "sample_rows": footprint.sample_rows,
+            "default_bytes": int(footprint.default_bytes_per_row * profile.total_records),
+            "inferred_bytes": int(footprint.optimized_bytes_per_row * profile.total_records),
+            "categorical_columns": footprint.categorical_columns,
+            "datetime_columns": footprint.datetime_columns,
+        }
+
+    compression = profile.compression
+    if compression is not None:
+        document["compression"] = {
+            "codec": compression.codec,
+            "compressed_bytes": compression.compressed_bytes,
+            "uncompressed_bytes": compression.uncompressed_bytes,
+            "ratio": round(compression.ratio, 3),
+            "decompress_seconds": round(compression.seconds, 4),
+            "decompress_bytes_per_second": round(compression.bytes_per_second),
+        }
+    return document
+
+
+def sections_document(sections: Sequence[Any], label: str) -> List[Dict[str, Any]]:
+    """
+    Structured form of timed per-sheet or per-file profiles
+    """
+    return [
+        {label: section.name, "seconds": round(section.seconds, 3), "summary": profile_document(section.profile)}
+        for section in sections
+    ]
+
+
+def encode_document(document: Dict[str, Any], output_format: str) -> bytes:
+    if output_format == "json":
+        return orjson.dumps(document, default=_plain)
+    if output_format == "msgpack":
+        return msgpack.packb(document, default=_plain, use_bin_type=True)
+    raise ValueError(f"Unsupported summary format: {output_format}")
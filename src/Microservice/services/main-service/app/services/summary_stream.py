@@ -0,0 +1,179 @@
+import asyncio
+import os
+import queue
+from typing import Any, AsyncIterator, Dict, Optional
+from shared.utils import get_logger
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import DataProfile, DataProfileAccumulator
+from app.services.data_summary_job_service import DataSummaryJobManager, get_data_summary_job_manager
+from app.services.handle_file_service import DataSummaryCancelledError, HandleFileService
+from app.services.summary_renderers import column_document, encode_document, preview_document, profile_document
+
+logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+STREAM_MEDIA_TYPES = {
+    "text": "text/plain; charset=utf-8",
+    "sse": "text/event-stream",
+}
+# Idle proxies drop quiet connections, so something is sent at least this often
+KEEPALIVE_SECONDS = 15
+# Parts of the structured report sent as the overview event; columns and the preview have their own events
+OVERVIEW_KEYS = ("total_records", "error_bounds", "memory_footprint", "compression", "sample")
+# Text progress lines start with this; the latest one is repeated as the text keep-alive
+PROGRESS_TEXT_PREFIX = "⏳ Progress: ".encode("utf-8")
+
+
+class SummaryStream:
+    """
+    Profile a spooled file on the data summary pool and yield the report piece by piece as it
+    becomes known: the preview and schema after the first chunk, progress after every chunk,
+    then each section
+
+    The stream holds one of the job manager's concurrent job slots while it profiles, and waits
+    for one (sending keep-alives) when they are all taken. It owns the spooled file and removes
+    it when profiling ends
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file_type: str,
+        options: DataSummaryOptions,
+        stream_format: str = "text",
+        job_manager: Optional[DataSummaryJobManager] = None
+    ):
+        self.path = path
+        self.file_type = file_type
+        self.options = options
+        self.stream_format = stream_format
+        self.cancel_marker = f"{path}.cancel"
+        self._job_manager = job_manager or get_data_summary_job_manager()
+        self._events = self._job_manager.event_queue()
+        self._task: Optional[asyncio.Task] = None
+        self._last_progress = b""
+
+    def start(self) -> None:
+        """
+        Queue the profiling for a job slot; events queue up until the response reads them
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def iterate(self) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                try:
+                    event = await asyncio.to_thread(self._events.get, True, KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield b": keep-alive\n\n" if self.stream_format == "sse" else self._last_progress or b"\n"
+                    continue
+                if event is None:
+                    return
+                if event.startswith(PROGRESS_TEXT_PREFIX):
+                    self._last_progress = event
+                yield event
+        finally:
+            # The client went away or the stream ended; either way the worker can stop.
+            # A stream still waiting for a slot never starts; a running one stops at its next chunk
+            if os.path.exists(self.path):
+                open(self.cancel_marker, "a").close()
+
+    async def _run(self) -> None:
+        try:
+            async with self._job_manager.slot() as executor:
+                if os.path.exists(self.cancel_marker):
+                    raise DataSummaryCancelledError("Summary stream closed by the client")
+                await asyncio.get_running_loop().run_in_executor(
+                    executor, stream_summary, self.path, self.file_type, self.options, self.stream_format,
+                    self._events, self.cancel_marker)
+        except DataSummaryCancelledError:
+            logger.info(f"Summary stream for {self.path} closed before it started")
+        except Exception as e:
+            logger.error(f"Error streaming data summary: {str(e)}")
+            _StreamWriter(self._events, self.stream_format).send_error(e)
+        finally:
+            for path in (self.path, self.cancel_marker):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._events.put(None)
+
+
+def stream_summary(
+    path: str,
+    file_type: str,
+    options: DataSummaryOptions,
+    stream_format: str,
+    events,
+    cancel_marker: str
+) -> None:
+    """
+    Profile a file and put the stream's events on a manager queue (process pool entry point)
+    """
+    writer = _StreamWriter(events, stream_format)
+    try:
+        accumulator = HandleFileService.build_data_accumulator(
+            path, file_type, options, cancel_marker, progress=writer.on_progress)
+        profile = accumulator.finalize()
+        if not writer.preview_sent:
+            writer.send_preview(accumulator)
+        writer.send_sections(profile)
+        writer.send("done", {}, "\n")
+    except DataSummaryCancelledError:
+        logger.info(f"Summary stream for {path} closed before it finished")
+    except Exception as e:
+        logger.error(f"Error streaming data summary: {str(e)}")
+        writer.send_error(e)
+
+
+class _StreamWriter:
+    """
+    Encodes stream events as text or Server-Sent Events onto the stream's queue
+    """
+
+    def __init__(self, events, stream_format: str):
+        self.events = events
+        self.stream_format = stream_format
+        self.preview_sent = False
+
+    def send(self, name: str, document: Dict[str, Any], text: str) -> None:
+        if self.stream_format == "sse":
+            self.events.put(b"event: " + name.encode("utf-8") + b"\ndata: " + encode_document(document, "json") + b"\n\n")
+        elif text:
+            self.events.put(text.encode("utf-8"))
+
+    def send_error(self, error: Exception) -> None:
+        self.send("error", {"detail": str(error)}, f"\n❌ Error while generating data summary: {str(error)}\n")
+
+    def on_progress(self, accumulator: DataProfileAccumulator, fraction: Optional[float]) -> None:
+        if not self.preview_sent:
+            self.send_preview(accumulator)
+
+        percent = round(fraction * 100, 1) if fraction is not None else None
+        text = f"{PROGRESS_TEXT_PREFIX.decode('utf-8')}{f'{percent:.0f}% ' if percent is not None else ''}({accumulator.total_records} records)\n"
+        self.send("progress", {"percent": percent, "records": accumulator.total_records}, text)
+
+    def send_preview(self, accumulator: DataProfileAccumulator) -> None:
+        self.preview_sent = True
+        schema = {str(name): str(column.dtype) for name, column in accumulator.columns.items()}
+        text = (
+            HandleFileService.render_preview(accumulator.preview_rows)
+            + f"\n🧱 Schema: {', '.join(f'{name} ({dtype})' for name, dtype in schema.items())}\n")
+        self.send("preview", {
+            "preview_rows": preview_document(accumulator.preview_rows),
+            "columns": [{"name": name, "dtype": dtype} for name, dtype in schema.items()],
+        }, text)
+
+    def send_sections(self, profile: DataProfile) -> None:
+        if self.stream_format != "sse":
+            for section in HandleFileService.iter_summary_sections(profile, include_preview=False):
+                self.events.put(f"\n{section}".encode("utf-8"))
+            return
+
+        document = profile_document(profile)
+        self.send("overview", {key: document.pop(key) for key in OVERVIEW_KEYS if key in document}, "")
+        sampled = profile.sample is not None
+        for column in profile.columns:
+            self.send("column", column_document(column, sampled), "")
+        document.pop("columns")
+        document.pop("preview_rows")
+        self.send("distributions", document, "")
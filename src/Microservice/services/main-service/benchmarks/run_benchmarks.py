@@ -0,0 +1,220 @@
+"""
+Benchmark the data summary pipeline on synthetic telecom usage files
+
+Run from the main-service directory:
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 --formats csv xlsx
+    python -m benchmarks.run_benchmarks --save            # record a new baseline
+
+Every case runs in a fresh process so its peak RSS is its own, and the results
+are compared against the previous baseline JSON when one exists
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add the parent Microservice directory to Python path so we can import shared modules
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_data import XLSX_MAX_ROWS, write_dataset
+
+DEFAULT_SIZES = [10000, 100000, 1000000, 10000000]
+DEFAULT_BASELINE = str(Path(__file__).parent / "baseline.json")
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "data-summary-benchmarks")
+BASELINE_VERSION = 1
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:
+        import psutil
+        memory = psutil.Process().memory_info()
+        # Windows reports its own peak; elsewhere the current RSS is the best available
+        return int(getattr(memory, "peak_wset", memory.rss))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def run_case(path: str, file_type: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Profile and render one file in this process, timing each stage (process pool entry point)
+    """
+    from app.schemas.dataSummary import DataSummaryOptions
+    from app.services.handle_file_service import HandleFileService
+
+    summary_options = DataSummaryOptions(**options)
+    stage_timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    accumulator = HandleFileService.build_data_accumulator(
+        path, file_type, summary_options, stage_timings=stage_timings)
+
+    stage_started = time.perf_counter()
+    profile = accumulator.finalize()
+    stage_timings["finalize"] = time.perf_counter() - stage_started
+
+    stage_started = time.perf_counter()
+    HandleFileService.render_profile(profile, "text")
+    stage_timings["render"] = time.perf_counter() - stage_started
+
+    return {
+        "total_records": profile.total_records,
+        "wall_seconds": time.perf_counter() - started,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "stages": {stage: round(seconds, 4) for stage, seconds in stage_timings.items()},
+    }
+
+
+def _dataset_path(data_dir: str, file_format: str, rows: int, columns: int, cardinalities: Dict[str, int], seed: int) -> str:
+    material = json.dumps({"rows": rows, "columns": columns, "cardinalities": cardinalities, "seed": seed}, sort_keys=True)
+    digest = hashlib.sha256(material.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(data_dir, f"usage-{rows}x{columns}-{digest}.{file_format}")
+
+
+def _parse_cardinalities(values: List[str]) -> Dict[str, int]:
+    cardinalities = {}
+    for value in values:
+        column, _, count = value.partition("=")
+        if not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Expected COLUMN=COUNT, got {value}")
+        cardinalities[column] = int(count)
+    return cardinalities
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    cardinalities = _parse_cardinalities(args.cardinality)
+    options = {"mode": args.mode, "infer_dtypes": not args.no_infer_dtypes}
+    results = []
+
+    for file_format in args.formats:
+        for rows in args.sizes:
+            case = f"{file_format}-{rows}x{args.columns}-{args.mode}"
+            if file_format == "xlsx" and rows > XLSX_MAX_ROWS:
+                print(f"⏭️  {case}: skipped, an .xlsx sheet holds at most {XLSX_MAX_ROWS} rows")
+                continue
+
+            path = _dataset_path(args.data_dir, file_format, rows, args.columns, cardinalities, args.seed)
+            if not os.path.exists(path):
+                print(f"🛠️  Generating {path}")
+                write_dataset(path, rows, args.columns, cardinalities, args.seed)
+
+            runs = []
+            for _ in range(args.repeat):
+                # A fresh process per run keeps peak RSS and warm caches from leaking between cases
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    runs.append(executor.submit(run_case, path, f".{file_format}", options).result())
+            best = min(runs, key=lambda run: run["wall_seconds"])
+
+            result = {
+                "case": case,
+                "format": file_format,
+                "rows": rows,
+                "columns": args.columns,
+                "file_bytes": os.path.getsize(path),
+                **best,
+                "wall_seconds": round(best["wall_seconds"], 4),
+            }
+            print(
+                f"⏱️  {case}: {result['wall_seconds']:.2f}s, peak RSS {result['peak_rss_bytes'] / 2**20:.0f} MiB, "
+                f"{rows / max(result['wall_seconds'], 1e-9):,.0f} rows/s")
+            results.append(result)
+
+    return {
+        "version": BASELINE_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "cardinalities": cardinalities,
+        "results": results,
+    }
+
+
+def _change(current: float, previous: float) -> Optional[float]:
+    return (current - previous) / previous if previous else None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print each case against the baseline and return the cases that regressed beyond the threshold
+    """
+    previous = {result["case"]: result for result in baseline.get("results", [])}
+    regressions = []
+
+    print(f"\n📊 COMPARISON with baseline from {baseline.get('created_at', 'unknown')}:")
+    print(f"    {'case':<36}{'wall':>10}{'Δ wall':>10}{'peak RSS':>12}{'Δ RSS':>10}")
+    for result in current["results"]:
+        before = previous.get(result["case"])
+        if before is None:
+            print(f"    {result['case']:<36}{result['wall_seconds']:>9.2f}s{'new':>10}")
+            continue
+        wall_change = _change(result["wall_seconds"], before["wall_seconds"])
+        rss_change = _change(result["peak_rss_bytes"], before["peak_rss_bytes"])
+        print(
+            f"    {result['case']:<36}{result['wall_seconds']:>9.2f}s{wall_change or 0:>+10.1%}"
+            f"{result['peak_rss_bytes'] / 2**20:>8.0f} MiB{rss_change or 0:>+10.1%}")
+        for stage, seconds in result["stages"].items():
+            stage_change = _change(seconds, before.get("stages", {}).get(stage, 0))
+            if stage_change is not None and stage_change > threshold:
+                print(f"        - {stage}: {before['stages'][stage]:.3f}s → {seconds:.3f}s ({stage_change:+.0%})")
+        if (wall_change or 0) > threshold or (rss_change or 0) > threshold:
+            regressions.append(result["case"])
+
+    if regressions:
+        print(f"\n⚠️ Regressions beyond {threshold:.0%}: {regressions}")
+    else:
+        print(f"\n✅ No regressions beyond {threshold:.0%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the data summary pipeline on synthetic usage files")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Row counts to generate")
+    parser.add_argument("--formats", nargs="+", choices=["csv", "xlsx"], default=["csv", "xlsx"], help="File formats")
+    parser.add_argument("--columns", type=int, default=11, help="Columns per file; extra ones alternate metrics and attributes")
+    parser.add_argument("--cardinality", action="append", default=[], metavar="COLUMN=COUNT",
+                        help="Distinct values of imsi, subscriptionId, offerName, zone, mccmnc or attribute")
+    parser.add_argument("--mode", choices=["exact", "approximate"], default="exact", help="Profiling mode")
+    parser.add_argument("--no-infer-dtypes", action="store_true", help="Profile with the reader's default dtypes")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is recorded")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated files")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Where generated files are kept and reused")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save", action="store_true", help="Overwrite the baseline with these results")
+    parser.add_argument("--output", help="Also write these results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown or growth counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when a case regresses")
+    args = parser.parse_args()
+
+    current = run_benchmarks(args)
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare(current, json.load(baseline_file), args.threshold)
+    else:
+        print(f"\nℹ️ No baseline at {args.baseline}; run with --save to record one")
+
+    for path in filter(None, [args.output, args.baseline if args.save else None]):
+        with open(path, "w", encoding="utf-8") as output_file:
+            json.dump(current, output_file, indent=2)
+        print(f"💾 Results written to {path}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Excel caps a worksheet at 1,048,576 rows including the header
+XLSX_MAX_ROWS = 1048575
+WRITE_CHUNK_ROWS = 1000000
+
+BASE_COLUMNS = [
+    "imsi", "subscriptionId", "offerName", "zone", "requestType", "mccmnc",
+    "eventTime", "bytesUp", "bytesDown", "durationSeconds", "chargedAmount",
+]
+REQUEST_TYPES = ["DATA", "VOICE", "SMS", "MMS"]
+DEFAULT_CARDINALITIES = {
+    "imsi": 100000,
+    "subscriptionId": 100000,
+    "offerName": 50,
+    "zone": 12,
+    "mccmnc": 40,
+    "attribute": 20,
+}
+EVENT_TIME_START = pd.Timestamp("2024-01-01")
+EVENT_TIME_SPAN_SECONDS = 90 * 24 * 3600
+
+
+def column_names(column_count: int) -> List[str]:
+    """
+    The telecom usage columns, padded with alternating metric and attribute columns
+    """
+    names = BASE_COLUMNS[:column_count]
+    for index in range(column_count - len(names)):
+        names.append(f"metric{index}" if index % 2 == 0 else f"attribute{index}")
+    return names
+
+
+def generate_usage_frame(
+    rows: int,
+    column_count: int,
+    cardinalities: Optional[Dict[str, int]] = None,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Build a DataFrame shaped like a telecom usage export, with controllable distinct-value counts
+    """
+    cardinalities = {**DEFAULT_CARDINALITIES, **(cardinalities or {})}
+    rng = np.random.default_rng(seed)
+
+    def codes(column: str) -> np.ndarray:
+        return rng.integers(0, max(cardinalities[column], 1), rows)
+
+    generators = {
+        "imsi": lambda: pd.Series(codes("imsi") + 1000000000).map("00101{:010d}".format),
+        "subscriptionId": lambda: pd.Series(codes("subscriptionId")).map("SUB{:08d}".format),
+        "offerName": lambda: pd.Series(codes("offerName")).map("Offer {}".format),
+        "zone": lambda: pd.Series(codes("zone")).map("Zone {}".format),
+        "requestType": lambda: pd.Series(rng.choice(REQUEST_TYPES, rows, p=[0.7, 0.2, 0.08, 0.02])),
+        "mccmnc": lambda: pd.Series(310000 + codes("mccmnc") * 10),
+        "eventTime": lambda: pd.Series(
+            EVENT_TIME_START + pd.to_timedelta(rng.integers(0, EVENT_TIME_SPAN_SECONDS, rows), unit="s")
+        ).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "bytesUp": lambda: pd.Series(rng.lognormal(8, 2, rows).astype("int64")),
+        "bytesDown": lambda: pd.Series(rng.lognormal(10, 2, rows).astype("int64")),
+        "durationSeconds": lambda: pd.Series(rng.integers(0, 3600, rows)),
+        "chargedAmount": lambda: pd.Series(rng.gamma(2.0, 0.5, rows).round(4)),
+    }
+
+    data = {}
+    for name in column_names(column_count):
+        if name in generators:
+            data[name] = generators[name]()
+        elif name.startswith("metric"):
+            data[name] = pd.Series(rng.normal(100, 25, rows).round(3))
+        else:
+            data[name] = pd.Series(codes("attribute")).map("value {}".format)
+    return pd.DataFrame(data)
+
+
+def write_dataset(
+    path: str,
+    rows: int,
+    column_count: int,
+    cardinalities: Optional[Dict[str, int]] = None,
+    seed: int = 0
+) -> str:
+    """
+    Write a synthetic usage file (.csv or .xlsx), generating large CSVs block by block
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.partial"
+
+    if path.endswith(".xlsx"):
+        if rows > XLSX_MAX_ROWS:
+            raise ValueError(f"An .xlsx worksheet holds at most {XLSX_MAX_ROWS} rows, not {rows}")
+        generate_usage_frame(rows, column_count, cardinalities, seed).to_excel(
+            temp_path, index=False, engine="openpyxl")
+    else:
+        written = 0
+        while written < rows:
+            block_rows = min(WRITE_CHUNK_ROWS, rows - written)
+            # Seed each block separately so blocks do not repeat each other
+            frame = generate_usage_frame(block_rows, column_count, cardinalities, seed + written)
+            frame.to_csv(temp_path, mode="a" if written else "w", header=not written, index=False)
+            written += block_rows
+
+    os.replace(temp_path, path)
+    return path
@@ -9,7 +9,8 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from app.core.app import create_application
 from app.core.config import settings
 from shared.utils import setup_logging, get_logger
-from shared.database.dbContext import initialize_database
+from shared.database.dbContext import PoolOptions, dispose_async_database, initialize_async_database, initialize_database
+from app.services.data_summary_job_service import data_summary_job_manager
 
 # Setup logging
 setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
@@ -19,7 +20,17 @@ logger = get_logger(__name__, settings.LOG_LEVEL, settings.LOG_FORMAT)
 if settings.DATABASE_URL is None:
     logger.error("DATABASE_URL is not set in the configuration.")
     raise ValueError("DATABASE_URL is not set in the configuration.")
-engine, SessionLocal = initialize_database(settings.DATABASE_URL)
+pool_options = PoolOptions(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    statement_timeout_ms=settings.DB_STATEMENT_TIMEOUT_MS,
+    lock_timeout_ms=settings.DB_LOCK_TIMEOUT_MS,
+)
+engine, SessionLocal = initialize_database(settings.DATABASE_URL, settings.DB_ECHO, pool_options)
+async_engine, AsyncSessionLocal = initialize_async_database(settings.DATABASE_URL, settings.DB_ECHO, pool_options)
 
 @asynccontextmanager
 async def lifespan(app):
@@ -35,6 +46,8 @@ async def lifespan(app):
     
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    data_summary_job_manager.shutdown()
+    await dispose_async_database()
 
 # Create FastAPI application with lifespan
 app = create_application(lifespan=lifespan)
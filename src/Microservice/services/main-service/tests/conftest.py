@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Same layout as main.py: main-service for the app package, Microservice for shared
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+
+@pytest.fixture
+def usage_csv(tmp_path):
+    """
+    A small telecom usage CSV with numeric, categorical, datetime and unique ID columns
+    """
+    rows = ["imsi,offerName,zone,requestType,eventTime,bytesUp,chargedAmount"]
+    for index in range(200):
+        rows.append(
+            f"{1000 + index},offer{index % 4},zone{index % 3},{['DATA', 'VOICE', 'SMS'][index % 3]},"
+            f"2024-01-{1 + index % 28:02d} 10:{index % 60:02d}:00,{index * 10},{index * 0.25}")
+    path = tmp_path / "usage.csv"
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def sync_db():
+    """
+    A sync Session on in-memory SQLite holding the tables that need no Postgres features
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from shared.database.dbContext import Base
+    from shared.database.models import DatasetProfile, DimensionCube, DimensionCubeCell
+
+    # Services run the session in worker threads, so the single connection is shared across them
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[
+        DatasetProfile.__table__, DimensionCube.__table__, DimensionCubeCell.__table__])
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def make_upload():
+    """
+    Build FastAPI UploadFile objects from bytes, as the endpoints receive them
+    """
+    import io
+    from fastapi import UploadFile
+
+    return lambda filename, content: UploadFile(io.BytesIO(content), filename=filename)
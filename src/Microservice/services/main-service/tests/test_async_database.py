@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shared.database import dbContext
+from shared.database.dbContext import PoolOptions, get_async_db, initialize_async_database, to_async_database_url
+from app.services.health_service import HealthService
+
+
+@pytest.mark.parametrize("database_url, expected", [
+    ("postgresql://user:secret@db:5432/app", "postgresql+asyncpg://user:secret@db:5432/app"),
+    ("postgresql+psycopg2://user:secret@db/app", "postgresql+asyncpg://user:secret@db/app"),
+    ("sqlite:///local.db", "sqlite:///local.db"),
+])
+def test_sync_urls_switch_to_asyncpg(database_url, expected):
+    assert to_async_database_url(database_url) == expected
+
+
+@pytest.fixture
+def uninitialized_async_database(monkeypatch):
+    # Restored after the test, so no engine leaks into other tests
+    monkeypatch.setattr(dbContext, "async_engine", None)
+    monkeypatch.setattr(dbContext, "AsyncSessionLocal", None)
+    monkeypatch.setattr(dbContext.async_pool_statistics, "engine", None)
+
+
+def test_async_engine_is_pooled_and_keeps_objects_after_commit(uninitialized_async_database):
+    options = PoolOptions(pool_size=3, max_overflow=2, statement_timeout_ms=5000)
+
+    engine, session_factory = initialize_async_database("postgresql://user:secret@db/app", pool_options=options)
+
+    assert isinstance(engine, AsyncEngine)
+    assert engine.url.drivername == "postgresql+asyncpg"
+    assert (engine.pool.size(), engine.pool._max_overflow) == (3, 2)
+    assert type(engine.pool).__name__ == "InstrumentedAsyncAdaptedQueuePool"
+    assert session_factory.kw["expire_on_commit"] is False
+    assert dbContext.async_pool_statistics.engine is engine.sync_engine
+    with pytest.raises(ValueError):
+        initialize_async_database(None)
+
+
+def test_async_session_dependency_requires_initialization(uninitialized_async_database):
+    async def first_session():
+        return await anext(get_async_db())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(first_session())
+
+
+def test_health_check_reports_an_unreachable_database(uninitialized_async_database):
+    status = asyncio.run(HealthService()._check_database_connectivity())
+
+    assert not status.connected
+    assert status.response_time_ms is None
+    assert "not initialized" in status.error
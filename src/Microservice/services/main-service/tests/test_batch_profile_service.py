@@ -0,0 +1,85 @@
+import asyncio
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.batch_profile_service import BatchInputError, BatchProfileService, file_type_of
+
+FIRST_CSV = b"imsi,zone\n1,zone0\n2,zone1\n3,zone2\n"
+SECOND_CSV = b"imsi,zone\n4,zone0\n5,zone0\n"
+
+
+def zip_archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def tar_archive(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def summarize(files, output_format="json"):
+    return asyncio.run(BatchProfileService().summarize_batch(
+        files, DataSummaryOptions(infer_dtypes=False), output_format=output_format))
+
+
+def test_file_types_keep_compound_suffixes():
+    assert file_type_of("usage.TAR.GZ") == ".tar.gz"
+    assert file_type_of("usage.csv.gz") == ".csv.gz"
+    assert file_type_of("usage.parquet") == ".parquet"
+
+
+def test_several_files_are_reported_separately_and_merged(make_upload):
+    document = json.loads(summarize([make_upload("first.csv", FIRST_CSV), make_upload("second.csv", SECOND_CSV)]))
+
+    assert [(section["file"], section["summary"]["total_records"]) for section in document["files"]] == [
+        ("first.csv", 3), ("second.csv", 2)]
+    assert document["merged"]["total_records"] == 5
+    imsi = next(column for column in document["merged"]["columns"] if column["name"] == "imsi")
+    assert imsi["unique_count"] == 5
+
+
+@pytest.mark.parametrize("filename, build", [("usage.zip", zip_archive), ("usage.tar.gz", tar_archive)])
+def test_archive_members_are_extracted_and_unsupported_ones_skipped(make_upload, filename, build):
+    archive = build({"jan/first.csv": FIRST_CSV, "feb/second.csv": SECOND_CSV, "README.txt": b"notes"})
+
+    summary = summarize([make_upload(filename, archive)], output_format="text").decode("utf-8")
+
+    assert "BATCH: 2 files, 5 records" in summary
+    assert "jan/first.csv" in summary and "README.txt" not in summary
+
+
+def test_unsupported_uploads_are_rejected(make_upload):
+    with pytest.raises(BatchInputError):
+        summarize([make_upload("first.csv", FIRST_CSV), make_upload("notes.txt", b"notes")])
+    with pytest.raises(BatchInputError):
+        summarize([make_upload("empty.zip", zip_archive({"README.txt": b"notes"}))])
+    with pytest.raises(BatchInputError):
+        summarize([make_upload("broken.zip", b"not a zip")])
+
+
+def test_archives_cannot_expand_past_the_limits(make_upload, monkeypatch):
+    archive = zip_archive({"first.csv": FIRST_CSV, "second.csv": SECOND_CSV})
+
+    monkeypatch.setattr(settings, "BATCH_MAX_FILES", 1)
+    with pytest.raises(BatchInputError, match="too many files"):
+        summarize([make_upload("usage.zip", archive)])
+
+    monkeypatch.setattr(settings, "BATCH_MAX_FILES", 10)
+    monkeypatch.setattr(settings, "BATCH_MAX_EXTRACTED_BYTES", len(FIRST_CSV) + 1)
+    with pytest.raises(BatchInputError, match="size limit"):
+        summarize([make_upload("usage.zip", archive)])
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from benchmarks.run_benchmarks import compare, run_case
+from benchmarks.synthetic_data import column_names, generate_usage_frame, write_dataset
+
+
+def test_synthetic_frames_are_deterministic_and_bounded():
+    frame = generate_usage_frame(1000, 14, {"zone": 5}, seed=3)
+
+    assert list(frame.columns) == column_names(14)
+    assert list(frame.columns[-3:]) == ["metric0", "attribute1", "metric2"]
+    assert frame["zone"].nunique() <= 5
+    assert frame.equals(generate_usage_frame(1000, 14, {"zone": 5}, seed=3))
+
+
+def test_large_csvs_are_written_block_by_block(tmp_path, monkeypatch):
+    monkeypatch.setattr("benchmarks.synthetic_data.WRITE_CHUNK_ROWS", 400)
+    path = write_dataset(str(tmp_path / "usage.csv"), 1000, 6)
+
+    frame = pd.read_csv(path)
+    assert len(frame) == 1000
+    assert list(frame.columns) == column_names(6)
+    # Blocks are seeded separately, so the second block does not repeat the first
+    assert not frame.iloc[:400].reset_index(drop=True).equals(frame.iloc[400:800].reset_index(drop=True))
+
+
+def test_run_case_times_every_stage(tmp_path):
+    path = write_dataset(str(tmp_path / "usage.csv"), 500, 11)
+
+    result = run_case(path, ".csv", {"mode": "exact"})
+
+    assert result["total_records"] == 500
+    assert {"infer", "read", "convert", "profile", "finalize", "render"} <= set(result["stages"])
+    assert result["peak_rss_bytes"] > 0
+
+
+def test_compare_reports_regressions_beyond_the_threshold():
+    def results(wall, rss):
+        return {"results": [{"case": "csv-1", "wall_seconds": wall, "peak_rss_bytes": rss, "stages": {"read": wall}}]}
+
+    assert compare(results(1.05, 100), results(1.0, 100), 0.1) == []
+    assert compare(results(1.5, 100), results(1.0, 100), 0.1) == ["csv-1"]
+    assert compare(results(1.0, 150), results(1.0, 100), 0.1) == ["csv-1"]
+    assert compare(results(1.0, 100), {"results": []}, 0.1) == []
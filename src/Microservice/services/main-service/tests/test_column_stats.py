@@ -0,0 +1,157 @@
+import copy
+
+import pandas as pd
+
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import ColumnAccumulator, DataProfileAccumulator, SketchColumnAccumulator
+
+
+def usage_chunks(rows=400, chunk_size=100):
+    frame = pd.DataFrame({
+        "imsi": range(1000, 1000 + rows),
+        "zone": [f"zone{index % 3}" for index in range(rows)],
+    })
+    return [frame.iloc[start:start + chunk_size] for start in range(0, rows, chunk_size)]
+
+
+def profile_of(chunks, **options):
+    accumulator = DataProfileAccumulator(DataSummaryOptions(top_k_capacity=10, **options))
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator
+
+
+def test_exact_columns_under_the_bound_stay_exact():
+    accumulator = profile_of(usage_chunks(), exact_max_distinct=1000)
+
+    assert type(accumulator.columns["imsi"]) is ColumnAccumulator
+    profile = accumulator.finalize()
+    assert profile.error_bounds == []
+    assert profile.column("imsi").unique_count == 400
+    assert not profile.column("imsi").approximate
+
+
+def test_high_cardinality_column_falls_back_to_sketches():
+    accumulator = profile_of(usage_chunks(), exact_max_distinct=150)
+
+    imsi = accumulator.columns["imsi"]
+    assert isinstance(imsi, SketchColumnAccumulator)
+    # The exact table is released once the column switches
+    assert imsi.value_counts.empty
+    # Low-cardinality columns keep their exact table
+    assert type(accumulator.columns["zone"]) is ColumnAccumulator
+
+    profile = accumulator.finalize()
+    stats = profile.column("imsi")
+    assert stats.approximate
+    assert stats.non_null_count == 400
+    assert (stats.minimum, stats.maximum) == (1000, 1399)
+    assert abs(stats.unique_count - 400) <= 400 * 3 * stats.distinct_error
+    assert profile.column("zone").unique_count == 3
+    assert not profile.column("zone").approximate
+    assert profile.error_bounds
+
+
+def test_zero_bound_keeps_every_column_exact():
+    accumulator = profile_of(usage_chunks(), exact_max_distinct=0)
+
+    assert type(accumulator.columns["imsi"]) is ColumnAccumulator
+    assert accumulator.finalize().column("imsi").unique_count == 400
+
+
+def test_exact_and_sketched_columns_merge_either_way():
+    chunks = usage_chunks()
+    sketched = profile_of(chunks[:3], exact_max_distinct=150)
+    exact = profile_of(chunks[3:], exact_max_distinct=150)
+    assert isinstance(sketched.columns["imsi"], SketchColumnAccumulator)
+    assert type(exact.columns["imsi"]) is ColumnAccumulator
+
+    for left, right in ((sketched, exact), (exact, sketched)):
+        merged = profile_of([], exact_max_distinct=150)
+        merged.merge(copy.deepcopy(left))
+        merged.merge(copy.deepcopy(right))
+        stats = merged.finalize().column("imsi")
+        assert isinstance(merged.columns["imsi"], SketchColumnAccumulator)
+        assert stats.non_null_count == 400
+        assert (stats.minimum, stats.maximum) == (1000, 1399)
+        assert abs(stats.unique_count - 400) <= 400 * 3 * stats.distinct_error
+
+
+def test_merged_exact_columns_are_bounded_too():
+    chunks = usage_chunks()
+    left = profile_of(chunks[:2], exact_max_distinct=300)
+    right = profile_of(chunks[2:], exact_max_distinct=300)
+
+    left.merge(right)
+
+    assert isinstance(left.columns["imsi"], SketchColumnAccumulator)
+    assert type(left.columns["zone"]) is ColumnAccumulator
+
+
+def column_figures(profile):
+    return {
+        stats.name: (
+            str(stats.dtype), stats.non_null_count, stats.null_count, stats.unique_count,
+            stats.median_frequency, stats.is_unique, stats.minimum, stats.maximum,
+            stats.datetime_min, stats.datetime_max, stats.top_values(5),
+        )
+        for stats in profile.columns
+    }
+
+
+def test_chunk_size_does_not_change_the_profile(usage_csv, monkeypatch):
+    from app.core.config import settings
+    from app.services.handle_file_service import HandleFileService
+
+    options = DataSummaryOptions(infer_dtypes=False)
+    whole = HandleFileService.build_data_profile(usage_csv, ".csv", options)
+    monkeypatch.setattr(settings, "CSV_CHUNK_SIZE", 7)
+    streamed = HandleFileService.build_data_profile(usage_csv, ".csv", options)
+
+    assert streamed.total_records == whole.total_records == 200
+    assert column_figures(streamed) == column_figures(whole)
+    assert streamed.preview_rows == whole.preview_rows
+
+
+def test_merged_halves_match_the_whole_file():
+    frame = pd.DataFrame({
+        "zone": [f"zone{index % 5}" if index % 7 else None for index in range(300)],
+        "bytesUp": [index % 40 for index in range(300)],
+    })
+    whole = profile_of([frame])
+    first, second = profile_of([frame.iloc[:120]]), profile_of([frame.iloc[120:]])
+
+    first.merge(second)
+
+    assert first.total_records == whole.total_records
+    assert column_figures(first.finalize()) == column_figures(whole.finalize())
+
+
+def test_single_pass_figures_match_pandas():
+    series = pd.Series(["b", "a", None, "c", "a", "b", "a", None, "d"], name="offerName")
+    accumulator = ColumnAccumulator("offerName")
+
+    accumulator.update(series.iloc[:4])
+    accumulator.update(series.iloc[4:])
+    stats = accumulator.finalize()
+
+    expected = series.value_counts()
+    assert stats.non_null_count == series.count()
+    assert stats.null_count == series.isna().sum()
+    assert stats.unique_count == series.nunique()
+    assert stats.median_frequency == expected.median()
+    assert stats.is_unique == series.is_unique
+    # Ties rank in order of first appearance, as a whole-series value_counts() does
+    assert stats.top_values(4) == expected.head(4).to_dict()
+    assert list(stats.top_values(4)) == ["a", "b", "c", "d"]
+    assert stats.sample_values == ["b", "a", "c"]
+
+
+def test_unique_column_with_a_single_null_is_unique():
+    accumulator = ColumnAccumulator("imsi")
+    accumulator.update(pd.Series([1.0, 2.0, None, 3.0]))
+
+    stats = accumulator.finalize()
+
+    assert stats.is_unique == pd.Series([1.0, 2.0, None, 3.0]).is_unique
+    assert (stats.minimum, stats.maximum) == (1.0, 3.0)
@@ -0,0 +1,119 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pytest
+
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.columnar_reader import (
+    PARQUET_SAMPLE_SCAN_FACTOR,
+    UnknownColumnsError,
+    count_rows,
+    iter_columnar_chunks,
+    read_column_metadata,
+    sample_columnar_rows,
+)
+from app.services.handle_file_service import HandleFileService
+
+
+@pytest.fixture
+def usage_table():
+    return pa.Table.from_pandas(pd.DataFrame({
+        "imsi": range(1000, 1300),
+        "zone": [f"zone{index % 3}" for index in range(300)],
+        "bytesUp": [float(index) if index % 10 else None for index in range(300)],
+    }), preserve_index=False)
+
+
+@pytest.fixture
+def columnar_files(usage_table, tmp_path):
+    paths = {
+        ".parquet": str(tmp_path / "usage.parquet"),
+        ".feather": str(tmp_path / "usage.feather"),
+        ".arrow": str(tmp_path / "usage.arrow"),
+    }
+    pq.write_table(usage_table, paths[".parquet"], row_group_size=100)
+    feather.write_feather(usage_table, paths[".feather"], chunksize=100)
+    # An Arrow IPC stream rather than a file, which has no footer to count rows from
+    with ipc.new_stream(paths[".arrow"], usage_table.schema) as writer:
+        writer.write_table(usage_table, max_chunksize=100)
+    return paths
+
+
+@pytest.mark.parametrize("file_type", [".parquet", ".feather", ".arrow"])
+def test_columnar_profile_matches_the_dataframe(columnar_files, usage_table, file_type):
+    profile = HandleFileService.build_data_profile(
+        columnar_files[file_type], file_type, DataSummaryOptions(infer_dtypes=False))
+
+    frame = usage_table.to_pandas()
+    assert profile.total_records == 300
+    for column in frame.columns:
+        stats = profile.column(column)
+        assert stats.non_null_count == frame[column].count()
+        assert stats.unique_count == frame[column].nunique()
+
+
+@pytest.mark.parametrize("file_type", [".parquet", ".feather", ".arrow"])
+def test_batches_keep_a_continuous_index(columnar_files, file_type):
+    chunks = list(iter_columnar_chunks(columnar_files[file_type], file_type, ["zone"], 100))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 100]
+    assert list(pd.concat(chunks).index) == list(range(300))
+    assert all(list(chunk.columns) == ["zone"] for chunk in chunks)
+
+
+def test_row_counts_come_from_metadata(columnar_files):
+    assert count_rows(columnar_files[".parquet"], ".parquet") == 300
+    assert count_rows(columnar_files[".feather"], ".feather") == 300
+    assert count_rows(columnar_files[".arrow"], ".arrow") is None
+
+
+def test_projection_describes_unloaded_columns_from_metadata(columnar_files):
+    profile = HandleFileService.build_data_profile(
+        columnar_files[".parquet"], ".parquet", DataSummaryOptions(columns=["zone"]))
+
+    assert [stats.name for stats in profile.columns] == ["zone"]
+    unloaded = {column.name: column for column in profile.unloaded_columns}
+    assert set(unloaded) == {"imsi", "bytesUp"}
+    assert (unloaded["imsi"].minimum, unloaded["imsi"].maximum, unloaded["imsi"].null_count) == (1000, 1299, 0)
+    assert unloaded["bytesUp"].null_count == 30
+
+
+def test_arrow_metadata_reports_null_counts_only(columnar_files):
+    described = read_column_metadata(columnar_files[".feather"], ".feather", ["bytesUp"])
+
+    assert [(column.name, column.null_count, column.minimum) for column in described] == [("bytesUp", 30, None)]
+
+
+def test_unknown_projected_columns_are_rejected(columnar_files):
+    with pytest.raises(UnknownColumnsError):
+        HandleFileService.build_data_profile(
+            columnar_files[".parquet"], ".parquet", DataSummaryOptions(columns=["zone", "missing"]))
+
+
+@pytest.mark.parametrize("file_type", [".parquet", ".feather"])
+def test_sample_reads_the_head_and_random_rows(columnar_files, file_type):
+    head, sample, total_rows = sample_columnar_rows(columnar_files[file_type], file_type, ["imsi"], 50, 60)
+
+    assert total_rows == 300
+    assert list(head["imsi"]) == list(range(1000, 1050))
+    assert len(sample) == 60
+    assert sample["imsi"].is_unique
+    # Parquet skips the row group the head came from; Arrow IPC only the head rows
+    assert sample["imsi"].min() >= (1100 if file_type == ".parquet" else 1050)
+
+
+def test_single_row_group_sample_skips_the_head_and_stays_bounded(tmp_path):
+    path = str(tmp_path / "single.parquet")
+    pq.write_table(pa.table({"imsi": range(20000)}), path, row_group_size=20000)
+
+    head, sample, total_rows = sample_columnar_rows(path, ".parquet", ["imsi"], 100, 500)
+    _, small_sample, _ = sample_columnar_rows(path, ".parquet", ["imsi"], 100, 50)
+
+    assert total_rows == 20000
+    assert len(sample) == 500
+    assert not set(head["imsi"]) & set(sample["imsi"])
+    assert list(sample.index) == list(range(100, 600))
+    # Only the leading PARQUET_SAMPLE_SCAN_FACTOR samples' worth of the group is decoded
+    assert small_sample["imsi"].min() >= 100 and small_sample["imsi"].max() < 100 + 50 * PARQUET_SAMPLE_SCAN_FACTOR
@@ -0,0 +1,77 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+import zstandard
+
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.compressed_reader import DecompressingReader, DecompressionLimitError
+from app.services.handle_file_service import HandleFileService
+
+COMPRESSORS = {
+    ".csv.gz": ("gzip", gzip.compress),
+    ".csv.zst": ("zstd", lambda data: zstandard.ZstdCompressor().compress(data)),
+    ".csv.bz2": ("bzip2", bz2.compress),
+    ".csv.xz": ("xz", lzma.compress),
+}
+
+
+def compressed_copy(usage_csv, tmp_path, file_type, frames=1):
+    with open(usage_csv, "rb") as source:
+        content = source.read()
+    header, body = content.split(b"\n", 1)
+    # Later frames carry rows only, as a parallel compressor splitting one file would produce
+    parts = [content] + [body] * (frames - 1)
+    path = tmp_path / f"usage{file_type}"
+    path.write_bytes(b"".join(COMPRESSORS[file_type][1](part) for part in parts))
+    return str(path), len(b"".join(parts))
+
+
+@pytest.mark.parametrize("file_type", list(COMPRESSORS))
+def test_compressed_csv_profiles_like_the_plain_file(usage_csv, tmp_path, file_type):
+    path, uncompressed_bytes = compressed_copy(usage_csv, tmp_path, file_type)
+    options = DataSummaryOptions(infer_dtypes=False)
+
+    profile = HandleFileService.build_data_accumulator(path, file_type, options).finalize()
+    plain = HandleFileService.build_data_profile(usage_csv, ".csv", options)
+
+    assert profile.total_records == plain.total_records == 200
+    for stats in plain.columns:
+        assert profile.column(stats.name).unique_count == stats.unique_count
+    assert profile.compression.codec == COMPRESSORS[file_type][0]
+    assert profile.compression.uncompressed_bytes == uncompressed_bytes
+    assert profile.compression.ratio > 1
+
+
+@pytest.mark.parametrize("file_type", list(COMPRESSORS))
+def test_concatenated_frames_are_read_across(usage_csv, tmp_path, file_type):
+    path, _ = compressed_copy(usage_csv, tmp_path, file_type, frames=3)
+
+    profile = HandleFileService.build_data_accumulator(path, file_type, DataSummaryOptions()).finalize()
+
+    assert profile.total_records == 600
+
+
+def test_decompression_is_bounded(usage_csv, tmp_path, monkeypatch):
+    path, uncompressed_bytes = compressed_copy(usage_csv, tmp_path, ".csv.gz")
+
+    with DecompressingReader(path, ".csv.gz", uncompressed_bytes - 1) as reader:
+        with pytest.raises(DecompressionLimitError):
+            reader.read()
+
+    monkeypatch.setattr(settings, "MAX_DECOMPRESSED_BYTES", 100)
+    with pytest.raises(DecompressionLimitError):
+        HandleFileService.build_data_profile(path, ".csv.gz", DataSummaryOptions(infer_dtypes=False))
+
+
+def test_sample_mode_draws_while_decompressing(usage_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SAMPLE_HEAD_ROWS", 20)
+    path, _ = compressed_copy(usage_csv, tmp_path, ".csv.zst")
+
+    profile = HandleFileService.build_data_profile(path, ".csv.zst", DataSummaryOptions(mode="sample", sample_size=100))
+
+    assert profile.total_records == 200
+    assert (profile.sample.head_rows, profile.sample.random_rows) == (20, 100)
+    assert profile.compression.codec == "zstd"
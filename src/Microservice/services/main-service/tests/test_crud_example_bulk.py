@@ -0,0 +1,174 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.api.v1.endpoints import crud_example
+from app.core.config import settings
+from app.repository.async_base import iter_batches
+from app.repository.crud_example_repository import CrudExampleRepository
+from app.schemas.crudExample import CrudExampleCreate, CrudExampleUpdate
+from app.services.crud_example_service import CrudExampleService
+from shared.database.models import CrudExample
+
+
+class InMemoryCrudExampleRepository:
+    """
+    Stands in for CrudExampleRepository, whose bulk statements need Postgres, keeping rows in a dict
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.batch_sizes = []
+
+    def _store(self, fields, id=None):
+        now = datetime.now(timezone.utc)
+        id = id or len(self.rows) + 1
+        self.rows[id] = CrudExample(id=id, created_at=now, updated_at=now, **{"isActive": False, "status": 0, **fields})
+        return self.rows[id]
+
+    async def get_existing_external_ids(self, db, external_ids, batch_size=1000):
+        return {row.externalId for row in self.rows.values()} & set(external_ids)
+
+    async def bulk_create_crud_examples(self, db, crud_examples_data, batch_size=1000):
+        self.batch_sizes.append(batch_size)
+        return [self._store(data.model_dump()) for data in crud_examples_data]
+
+    async def bulk_upsert_crud_examples(self, db, crud_examples_data, batch_size=1000):
+        by_external_id = {row.externalId: row for row in self.rows.values()}
+        results = []
+        for data in crud_examples_data:
+            existing = by_external_id.get(data.externalId)
+            results.append((self._store(data.model_dump(), existing.id if existing else None), existing is None))
+        return results
+
+    async def bulk_update_crud_examples(self, db, crud_example_ids, crud_example_update, batch_size=1000):
+        updated = []
+        for id in crud_example_ids:
+            if id in self.rows:
+                for field, value in crud_example_update.model_dump(exclude_unset=True).items():
+                    setattr(self.rows[id], field, value)
+                updated.append(self.rows[id])
+        return updated
+
+    async def bulk_delete_crud_examples(self, db, crud_example_ids, batch_size=1000):
+        return [id for id in crud_example_ids if self.rows.pop(id, None) is not None]
+
+
+class RecordingSession:
+    """
+    Stands in for an AsyncSession, recording the statements it runs and how often it commits
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return []
+
+    async def commit(self):
+        self.commits += 1
+
+
+def items(*external_ids):
+    return [CrudExampleCreate(name=f"item {index}", externalId=external_id) for index, external_id in enumerate(external_ids)]
+
+
+def test_iter_batches_covers_every_item_in_order():
+    assert [list(batch) for batch in iter_batches(list(range(7)), 3)] == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_batches([], 3)) == []
+
+
+def test_bulk_create_reports_duplicates_and_conflicts_per_item(monkeypatch):
+    monkeypatch.setattr(settings, "CRUD_BULK_BATCH_SIZE", 250)
+    repository = InMemoryCrudExampleRepository()
+    repository._store({"name": "existing", "externalId": "taken"})
+    service = CrudExampleService(repository)
+
+    response = asyncio.run(service.bulk_create_crud_examples(None, items("a", "taken", "a", None, None)))
+
+    assert [result.status for result in response.results] == ["created", "conflict", "duplicate", "created", "created"]
+    assert [result.index for result in response.results] == [0, 1, 2, 3, 4]
+    assert response.results[2].error == "externalId a repeats item 0"
+    assert response.counts == {"created": 3, "conflict": 1, "duplicate": 1}
+    assert response.results[0].item.name == "item 0"
+    assert repository.batch_sizes == [250]
+
+
+def test_bulk_upsert_tells_inserts_from_updates():
+    repository = InMemoryCrudExampleRepository()
+    existing = repository._store({"name": "old name", "externalId": "b"})
+    service = CrudExampleService(repository)
+
+    response = asyncio.run(service.bulk_upsert_crud_examples(None, items("a", "b", "a"), batch_size=10))
+
+    assert [result.status for result in response.results] == ["created", "updated", "duplicate"]
+    assert response.results[1].id == existing.id
+    assert repository.rows[existing.id].name == "item 1"
+
+
+def test_bulk_update_and_delete_report_missing_ids():
+    repository = InMemoryCrudExampleRepository()
+    for index in range(3):
+        repository._store({"name": f"row {index}"})
+    service = CrudExampleService(repository)
+
+    updated = asyncio.run(service.bulk_update_crud_examples(None, [1, 9, 1, 2], CrudExampleUpdate(status=4)))
+    deleted = asyncio.run(service.bulk_delete_crud_examples(None, [3, 3, 8]))
+
+    assert [(result.status, result.id) for result in updated.results] == [
+        ("updated", 1), ("not_found", 9), ("duplicate", 1), ("updated", 2)]
+    assert updated.results[0].item.status == 4
+    assert [(result.status, result.id) for result in deleted.results] == [
+        ("deleted", 3), ("duplicate", 3), ("not_found", 8)]
+    assert set(repository.rows) == {1, 2}
+
+
+def test_external_id_cannot_be_set_on_several_records():
+    with pytest.raises(ValueError):
+        asyncio.run(CrudExampleService(InMemoryCrudExampleRepository()).bulk_update_crud_examples(
+            None, [1, 2], CrudExampleUpdate(externalId="shared")))
+
+
+def test_upsert_runs_one_on_conflict_statement_per_batch_in_one_transaction():
+    db = RecordingSession()
+
+    asyncio.run(CrudExampleRepository().bulk_upsert_crud_examples(db, items("a", "b", "c", "d", "e"), batch_size=2))
+
+    assert len(db.statements) == 3
+    assert db.commits == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT ("externalId") DO UPDATE SET name = excluded.name' in sql
+    assert "updated_at = excluded.updated_at" in sql
+    assert "xmax = 0 AS inserted" in sql
+
+
+class DuplicateExternalIdService:
+    """
+    A service whose writes hit the externalId unique constraint
+    """
+
+    async def create_crud_example(self, db, crud_example_data):
+        raise IntegrityError("INSERT", {}, Exception("duplicate key value violates uq_crudExamples_externalId"))
+
+    async def update_crud_example(self, db, example_id, crud_example_update):
+        raise IntegrityError("UPDATE", {}, Exception("duplicate key value violates uq_crudExamples_externalId"))
+
+
+def test_single_writes_with_a_taken_external_id_are_conflicts():
+    service = DuplicateExternalIdService()
+
+    with pytest.raises(HTTPException) as created:
+        asyncio.run(crud_example.create_crud_example(
+            CrudExampleCreate(name="item", externalId="taken"), db=None, crud_example_service=service))
+    with pytest.raises(HTTPException) as updated:
+        asyncio.run(crud_example.update_crud_example(
+            1, CrudExampleUpdate(externalId="taken"), db=None, crud_example_service=service))
+
+    assert created.value.status_code == updated.value.status_code == 409
+    assert "uq_crudExamples_externalId" in created.value.detail
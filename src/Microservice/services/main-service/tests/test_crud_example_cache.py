@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.schemas.crudExample import CrudExampleResponse, CrudExampleUpdate
+from app.services.crud_example_cache import CacheBackend, CrudExampleCache, InMemoryCacheBackend
+from app.services.crud_example_service import CrudExampleService
+from shared.database.models import CrudExample
+
+
+def crud_example(id, name="usage"):
+    now = datetime.now(timezone.utc)
+    return CrudExample(id=id, name=name, isActive=True, status=0, created_at=now, updated_at=now)
+
+
+class CountingCrudExampleRepository:
+    """
+    Stands in for CrudExampleRepository, which needs Postgres, and counts the reads that reach it
+    """
+
+    def __init__(self, *rows):
+        self.rows = {row.id: row for row in rows}
+        self.reads = 0
+
+    async def get_by_id(self, db, id):
+        self.reads += 1
+        return self.rows.get(id)
+
+    async def search_crud_example(self, db, skip=0, limit=100, isActive=None, status=None, search=None):
+        self.reads += 1
+        return list(self.rows.values())[skip:skip + limit]
+
+    async def update_crud_example(self, db, crud_example_id, crud_example_update):
+        row = self.rows.get(crud_example_id)
+        if row is not None:
+            for field, value in crud_example_update.model_dump(exclude_unset=True).items():
+                setattr(row, field, value)
+        return row
+
+    async def delete_crud_example_by_id(self, db, crud_example_id):
+        return self.rows.pop(crud_example_id, None) is not None
+
+
+class FailingCacheBackend(CacheBackend):
+    """
+    A shared backend that is down
+    """
+
+    async def get(self, key):
+        raise ConnectionError("cache unreachable")
+
+    async def set(self, key, value, ttl_seconds):
+        raise ConnectionError("cache unreachable")
+
+    async def delete(self, *keys):
+        raise ConnectionError("cache unreachable")
+
+    async def incr(self, key):
+        raise ConnectionError("cache unreachable")
+
+
+def test_lookups_are_read_through_and_writes_invalidate():
+    repository = CountingCrudExampleRepository(crud_example(1), crud_example(2))
+    cache = CrudExampleCache(max_entries=10)
+    service = CrudExampleService(repository, cache)
+
+    async def scenario():
+        for _ in range(3):
+            assert (await service.get_crud_example_detail(None, 1)).name == "usage"
+            await service.search_crud_examples(None, status=0)
+        await service.update_crud_example(None, 1, CrudExampleUpdate(name="renamed"))
+        detail = await service.get_crud_example_detail(None, 1)
+        await service.search_crud_examples(None, status=0)
+        return detail
+
+    detail = asyncio.run(scenario())
+
+    # One miss each before the update, then both the record and the search are read again
+    assert detail.name == "renamed"
+    assert repository.reads == 4
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (4, 4, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_a_read_that_raced_a_write_is_not_cached():
+    cache = CrudExampleCache(max_entries=10)
+    item = CrudExampleResponse.model_validate(crud_example(1))
+
+    async def scenario():
+        version = await cache.version()
+        await cache.invalidate([1])
+        await cache.put_item(item, version)
+        return await cache.get_item(1)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_searches_are_keyed_on_their_parameters_and_version():
+    cache = CrudExampleCache(max_entries=10)
+    page = ([CrudExampleResponse.model_validate(crud_example(1))], "cursor")
+
+    async def scenario():
+        await cache.put_page({"status": 0}, 0, page)
+        hits = [await cache.get_page({"status": 0}, 0), await cache.get_page({"status": 1}, 0)]
+        await cache.invalidate()
+        hits.append(await cache.get_page({"status": 0}, await cache.version()))
+        return hits
+
+    assert asyncio.run(scenario()) == [page, None, None]
+
+
+def test_entries_are_evicted_least_recently_used_and_expire():
+    items = [CrudExampleResponse.model_validate(crud_example(id)) for id in (1, 2, 3)]
+    cache = CrudExampleCache(max_entries=2)
+    expiring = CrudExampleCache(max_entries=2, ttl_seconds=0)
+
+    async def scenario():
+        for item in items[:2]:
+            await cache.put_item(item, 0)
+        await cache.get_item(1)
+        await cache.put_item(items[2], 0)
+        await expiring.put_item(items[0], 0)
+        return [await cache.get_item(id) for id in (1, 2, 3)], await expiring.get_item(1)
+
+    lookups, expired = asyncio.run(scenario())
+
+    assert [item and item.id for item in lookups] == [1, None, 3]
+    assert cache.stats()["evictions"] == 1
+    assert expired is None
+    assert expiring.stats()["expirations"] == 1
+
+
+def test_workers_share_records_and_the_search_version_through_the_backend():
+    backend = InMemoryCacheBackend()
+    first, second = CrudExampleCache(max_entries=10, backend=backend), CrudExampleCache(max_entries=10, backend=backend)
+    item = CrudExampleResponse.model_validate(crud_example(1))
+
+    async def scenario():
+        await first.put_item(item, await first.version())
+        shared = await second.get_item(1)
+        await second.invalidate([1])
+        return shared, await first.version(), await second.get_item(1)
+
+    shared, version, stored = asyncio.run(scenario())
+
+    assert shared == item
+    assert second.stats()["backend_hits"] == 1
+    assert version == 1
+    assert stored is None
+
+
+def test_an_unreachable_backend_degrades_to_the_database():
+    repository = CountingCrudExampleRepository(crud_example(1))
+    cache = CrudExampleCache(max_entries=0, backend=FailingCacheBackend())
+    service = CrudExampleService(repository, cache)
+
+    async def scenario():
+        details = [await service.get_crud_example_detail(None, 1) for _ in range(2)]
+        assert await service.delete_crud_example(None, 1)
+        return details
+
+    details = asyncio.run(scenario())
+
+    assert [detail.id for detail in details] == [1, 1]
+    assert repository.reads == 2
+    assert cache.stats()["backend_errors"] > 0
@@ -0,0 +1,89 @@
+import asyncio
+from pathlib import Path
+
+from alembic.script import ScriptDirectory
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.repository.crud_example_repository import CrudExampleRepository
+from benchmarks.search_benchmark import build_vocabulary
+from shared.database.models import CrudExample
+
+
+class ScalarResult:
+    """
+    An empty result of RecordingSession.scalars
+    """
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    """
+    Stands in for an AsyncSession, which needs Postgres, and keeps the statements it is given
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        return ScalarResult()
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_substring_search_keeps_the_ilike_the_trigram_indexes_serve():
+    db = RecordingSession()
+
+    asyncio.run(CrudExampleRepository().search_crud_example(db, search="roam", status=1))
+
+    statement = db.statements[0].compile(dialect=postgresql.dialect())
+    sql = str(statement)
+    assert '"crudExamples".name ILIKE' in sql and '"crudExamples".description ILIKE' in sql
+    assert (statement.params["name_1"], statement.params["description_1"]) == ("%roam%", "%roam%")
+    assert statement.params["status_1"] == 1
+
+
+def test_ranked_search_matches_and_orders_on_the_search_vector():
+    db = RecordingSession()
+
+    asyncio.run(CrudExampleRepository().search_crud_example_ranked(db, search="data roaming", isActive=True))
+
+    sql = compiled(db.statements[0])
+    # The query must use the config the generated column was built with, or the GIN index is skipped
+    assert "\"crudExamples\".search_vector @@ websearch_to_tsquery('english'::regconfig, 'data roaming')" in sql
+    assert "ORDER BY ts_rank_cd(\"crudExamples\".search_vector, websearch_to_tsquery(" in sql
+    assert '"crudExamples"."isActive" = true' in sql
+    assert "ILIKE" not in sql
+
+
+def test_model_declares_the_search_indexes_and_generated_vector():
+    indexes = {index.name: compiled(CreateIndex(index)) for index in CrudExample.__table__.indexes}
+
+    assert "USING gin (name gin_trgm_ops)" in indexes["ix_crudExamples_name_trgm"]
+    assert "USING gin (description gin_trgm_ops)" in indexes["ix_crudExamples_description_trgm"]
+    assert "USING gin (search_vector)" in indexes["ix_crudExamples_search_vector"]
+    table = compiled(CreateTable(CrudExample.__table__))
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS (setweight(to_tsvector('english'" in table
+    assert "STORED" in table
+
+
+def test_migrations_form_a_single_chain():
+    scripts = ScriptDirectory(str(Path(__file__).parent.parent.parent.parent / "alembic"))
+
+    assert len(scripts.get_bases()) == 1
+    assert len(scripts.get_heads()) == 1
+    revisions = [revision.revision for revision in scripts.walk_revisions()]
+    assert revisions.index("a3f1c9d27e10") > revisions.index("c52e8b4f1a07")
+
+
+def test_benchmark_vocabulary_is_deterministic():
+    vocabulary = build_vocabulary(50, seed=1)
+
+    assert vocabulary == build_vocabulary(50, seed=1)
+    assert len(set(vocabulary)) == 50
+    assert all(word.isalpha() and word.islower() for word in vocabulary)
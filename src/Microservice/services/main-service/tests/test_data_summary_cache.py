@@ -0,0 +1,120 @@
+import hashlib
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.data_summary_cache import DataSummaryCache, build_cache_key
+
+
+def digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def test_cache_key_covers_content_type_options_and_format():
+    key = build_cache_key(digest(b"a,b\n1,2\n"), ".csv", DataSummaryOptions())
+
+    assert key == build_cache_key(digest(b"a,b\n1,2\n"), ".csv", DataSummaryOptions())
+    assert len({
+        key,
+        build_cache_key(digest(b"a,b\n1,3\n"), ".csv", DataSummaryOptions()),
+        build_cache_key(digest(b"a,b\n1,2\n"), ".csv.gz", DataSummaryOptions()),
+        build_cache_key(digest(b"a,b\n1,2\n"), ".csv", DataSummaryOptions(mode="approximate")),
+        build_cache_key(digest(b"a,b\n1,2\n"), ".csv", DataSummaryOptions(), "json"),
+    }) == 5
+
+
+@pytest.mark.parametrize("name, value", [
+    ("EXCEL_ENGINE", "openpyxl"),
+    ("DTYPE_INFERENCE_SAMPLE_ROWS", 10),
+    ("CSV_CHUNK_SIZE", 7),
+    ("EXACT_MAX_DISTINCT_VALUES", 5),
+])
+def test_cache_key_changes_with_output_affecting_settings(monkeypatch, name, value):
+    key = build_cache_key(digest(b"a,b\n1,2\n"), ".xlsx", DataSummaryOptions())
+
+    monkeypatch.setattr(settings, name, value)
+
+    assert build_cache_key(digest(b"a,b\n1,2\n"), ".xlsx", DataSummaryOptions()) != key
+
+
+def test_memory_tier_evicts_least_recently_used_within_the_byte_budget():
+    cache = DataSummaryCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["size_bytes"]) == (3, 1, 2, 8)
+
+
+def test_disk_tier_survives_a_restart_and_promotes_hits(tmp_path):
+    key = build_cache_key(digest(b"rows"), ".csv", DataSummaryOptions())
+    DataSummaryCache(max_bytes=1024, directory=str(tmp_path)).put(key, b"summary")
+
+    cache = DataSummaryCache(max_bytes=1024, directory=str(tmp_path))
+
+    assert cache.get(key) == b"summary"
+    assert cache.get(key) == b"summary"
+    assert cache.stats()["disk_hits"] == 1
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_oversized_summaries_live_on_disk_only(tmp_path):
+    key = build_cache_key(digest(b"rows"), ".csv", DataSummaryOptions())
+    cache = DataSummaryCache(max_bytes=4, directory=str(tmp_path))
+
+    cache.put(key, b"too large")
+
+    assert cache.stats()["entries"] == 0
+    assert cache.get(key) == b"too large"
+
+
+def test_purge_and_clear_remove_both_tiers(tmp_path):
+    keys = [build_cache_key(digest(content), ".csv", DataSummaryOptions()) for content in (b"one", b"two")]
+    cache = DataSummaryCache(max_bytes=1024, directory=str(tmp_path))
+    for key in keys:
+        cache.put(key, b"summary")
+
+    assert cache.purge(keys[0])
+    assert not cache.purge(keys[0])
+    assert cache.get(keys[0]) is None
+    assert cache.clear() == 1
+    assert cache.get(keys[1]) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_malformed_keys_never_reach_the_disk(tmp_path):
+    cache = DataSummaryCache(max_bytes=0, directory=str(tmp_path))
+
+    cache.put("../escape", b"summary")
+
+    assert cache.get("../escape") is None
+    assert not cache.purge("../escape")
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_tier_evicts_least_recently_used_within_its_budget(tmp_path):
+    keys = [build_cache_key(digest(content), ".csv", DataSummaryOptions()) for content in (b"a", b"b", b"c", b"d")]
+    writer = DataSummaryCache(directory=str(tmp_path), max_disk_bytes=20)
+    for age, key in enumerate(keys[:2]):
+        writer.put(key, b"x" * 8)
+        # Pin distinct mtimes; the filesystem's own resolution may be too coarse to order them
+        os.utime(tmp_path / f"{key}.summary", (1000 + age, 1000 + age))
+
+    # A disk hit makes the oldest entry the most recently used
+    assert DataSummaryCache(directory=str(tmp_path)).get(keys[0]) == b"x" * 8
+    writer.put(keys[2], b"x" * 8)
+
+    remaining = {name[:-len(".summary")] for name in os.listdir(tmp_path)}
+    assert remaining == {keys[0], keys[2]}
+
+    # Entries over the whole budget are never written
+    writer.put(keys[3], b"x" * 21)
+    assert writer.get(keys[3]) is None
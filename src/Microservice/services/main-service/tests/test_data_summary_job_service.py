@@ -0,0 +1,226 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.schemas.dataSummary import DataSummaryJobStatus
+from app.services.data_summary_cache import DataSummaryCache
+from app.services.data_summary_job_service import DataSummaryJobManager, DataSummaryJobQueueFullError
+from app.services.handle_file_service import summarize_file
+
+
+def job_manager(**kwargs):
+    # Threads instead of worker processes, so targets can share events with the test
+    manager = DataSummaryJobManager(max_workers=2, **kwargs)
+    manager._executor = ThreadPoolExecutor(max_workers=2)
+    return manager
+
+
+def spooled_copy(usage_csv, tmp_path, name):
+    path = str(tmp_path / name)
+    shutil.copy(usage_csv, path)
+    return path
+
+
+async def wait_for(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not job.is_finished:
+        assert time.monotonic() < deadline, f"job stuck in {job.status}"
+        await asyncio.sleep(0.01)
+
+
+def test_job_completes_caches_and_removes_its_file(usage_csv, tmp_path):
+    async def scenario():
+        cache = DataSummaryCache(max_bytes=1024 * 1024)
+        manager = job_manager(cache=cache)
+        path = spooled_copy(usage_csv, tmp_path, "upload.csv")
+
+        job = manager.submit(path, ".csv", "usage.csv", cache_key="a" * 64)
+        assert job.status == DataSummaryJobStatus.PENDING
+        # The result is cached after the job reports completion, so wait for the whole task
+        await job.task
+        manager.shutdown()
+        return job, path, cache
+
+    job, path, cache = asyncio.run(scenario())
+
+    assert job.status == DataSummaryJobStatus.COMPLETED
+    assert job.started_at <= job.finished_at
+    assert "Total Records: 200" in job.result
+    assert not os.path.exists(path)
+    assert cache.get("a" * 64) == job.result.encode("utf-8")
+
+
+def test_completed_job_stays_completed_when_cancelled_while_caching(usage_csv, tmp_path):
+    class SlowCache(DataSummaryCache):
+        """Takes long enough to store a result for the job task to be cancelled meanwhile"""
+
+        def put(self, key, value):
+            time.sleep(0.2)
+            super().put(key, value)
+
+    async def scenario():
+        manager = job_manager(cache=SlowCache(max_bytes=1024 * 1024))
+        job = manager.submit(spooled_copy(usage_csv, tmp_path, "upload.csv"), ".csv", cache_key="a" * 64)
+        await wait_for(job)
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+        manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert job.status == DataSummaryJobStatus.COMPLETED
+    assert "Total Records: 200" in job.result
+
+
+def test_queued_job_is_cancelled_before_it_starts(usage_csv, tmp_path):
+    release = threading.Event()
+
+    def blocking_target(path, file_type, options, cancel_marker):
+        release.wait(10)
+        return "done"
+
+    async def scenario():
+        manager = job_manager(max_concurrent_jobs=1)
+        running = manager.submit(spooled_copy(usage_csv, tmp_path, "first.csv"), ".csv", target=blocking_target)
+        queued = manager.submit(spooled_copy(usage_csv, tmp_path, "second.csv"), ".csv", target=blocking_target)
+        await asyncio.sleep(0.05)
+        assert running.status == DataSummaryJobStatus.RUNNING
+        assert queued.status == DataSummaryJobStatus.PENDING
+
+        manager.cancel(queued.id)
+        await wait_for(queued)
+        release.set()
+        await wait_for(running)
+        manager.shutdown()
+        return running, queued
+
+    running, queued = asyncio.run(scenario())
+
+    assert queued.status == DataSummaryJobStatus.CANCELLED
+    assert queued.started_at is None
+    assert not os.path.exists(queued.path)
+    assert running.status == DataSummaryJobStatus.COMPLETED
+    assert running.result == "done"
+
+
+def test_job_cancelled_before_its_task_runs_is_finished(usage_csv, tmp_path):
+    async def scenario():
+        manager = job_manager()
+        # Cancelled in the same step it was submitted, so its task never gets to start
+        job = manager.submit(spooled_copy(usage_csv, tmp_path, "upload.csv"), ".csv")
+        manager.cancel(job.id)
+        status = job.status
+        await asyncio.sleep(0.05)
+        manager.shutdown()
+        return job, status
+
+    job, status = asyncio.run(scenario())
+
+    assert status == job.status == DataSummaryJobStatus.CANCELLED
+    assert job.started_at is None
+    assert job.finished_at is not None
+    assert not os.path.exists(job.path)
+
+
+def test_slots_bound_work_that_is_not_a_job():
+    async def scenario():
+        manager = job_manager(max_concurrent_jobs=1)
+        order = []
+
+        async def hold(name):
+            async with manager.slot() as executor:
+                order.append(f"{name} start")
+                await asyncio.get_running_loop().run_in_executor(executor, time.sleep, 0.05)
+                order.append(f"{name} end")
+
+        await asyncio.gather(hold("first"), hold("second"))
+        manager.shutdown()
+        return order
+
+    assert asyncio.run(scenario()) == ["first start", "first end", "second start", "second end"]
+
+
+def test_running_job_stops_at_the_next_chunk(usage_csv, tmp_path):
+    started = threading.Event()
+
+    def cancellable_target(path, file_type, options, cancel_marker):
+        started.set()
+        # Hold the worker until the cancel marker appears, then profile as the real entry point does
+        deadline = time.monotonic() + 10
+        while not os.path.exists(cancel_marker) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return summarize_file(path, file_type, options, cancel_marker)
+
+    async def scenario():
+        manager = job_manager()
+        job = manager.submit(spooled_copy(usage_csv, tmp_path, "upload.csv"), ".csv", target=cancellable_target)
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        manager.cancel(job.id)
+        await wait_for(job)
+        manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert job.status == DataSummaryJobStatus.CANCELLED
+    assert job.result is None
+    assert not os.path.exists(job.path)
+    assert not os.path.exists(job.cancel_marker)
+
+
+def test_failed_job_records_the_error(usage_csv, tmp_path):
+    def failing_target(path, file_type, options, cancel_marker):
+        raise ValueError("unreadable file")
+
+    async def scenario():
+        manager = job_manager()
+        job = manager.submit(spooled_copy(usage_csv, tmp_path, "upload.csv"), ".csv", target=failing_target)
+        await wait_for(job)
+        # Cancelling a finished job leaves it as it is
+        assert manager.cancel(job.id) is job
+        manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert job.status == DataSummaryJobStatus.FAILED
+    assert job.error == "unreadable file"
+
+
+def test_queue_limit_and_retention(usage_csv, tmp_path):
+    release = threading.Event()
+
+    def blocking_target(path, file_type, options, cancel_marker):
+        release.wait(10)
+        return "done"
+
+    async def scenario():
+        manager = job_manager(max_concurrent_jobs=1, max_queued_jobs=1, job_retention=2)
+        first = manager.submit(spooled_copy(usage_csv, tmp_path, "first.csv"), ".csv", target=blocking_target)
+        await asyncio.sleep(0.05)
+        second = manager.submit(spooled_copy(usage_csv, tmp_path, "second.csv"), ".csv", target=blocking_target)
+        with pytest.raises(DataSummaryJobQueueFullError):
+            manager.submit(spooled_copy(usage_csv, tmp_path, "third.csv"), ".csv", target=blocking_target)
+
+        release.set()
+        await wait_for(first)
+        await wait_for(second)
+        cached = [manager.record_cached(".csv", "usage.csv", first.options, "b" * 64, "done") for _ in range(2)]
+        manager.shutdown()
+        return manager, first, second, cached
+
+    manager, first, second, cached = asyncio.run(scenario())
+
+    # Only the newest finished jobs are retained
+    assert manager.get(first.id) is None
+    assert manager.get(second.id) is None
+    assert all(manager.get(job.id) is job for job in cached)
+    assert all(job.cached and job.status == DataSummaryJobStatus.COMPLETED for job in cached)
@@ -0,0 +1,88 @@
+import asyncio
+import pickle
+
+import pytest
+
+from app.repository.dataset_table_repository import dataset_table_name
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.dataset_profile_service import (
+    PROFILE_FORMAT_VERSION,
+    DatasetProfileConflictError,
+    DatasetProfileFormatError,
+    DatasetProfileService,
+    _dump,
+    _load,
+    profile_format_version,
+)
+from app.services.handle_file_service import HandleFileService
+
+
+class DroppedTables:
+    """Stands in for DatasetTableRepository, which needs Postgres"""
+
+    def __init__(self):
+        self.dropped = []
+
+    def drop_table(self, db, table_name):
+        self.dropped.append(table_name)
+        return False
+
+
+def _accumulator(path, options=None):
+    return HandleFileService.build_data_accumulator(path, ".csv", options or DataSummaryOptions())
+
+
+def test_stored_profiles_carry_the_format_version(usage_csv):
+    stored = _dump(_accumulator(usage_csv))
+    assert profile_format_version(stored) == PROFILE_FORMAT_VERSION
+    assert _load("usage", stored).total_records == 200
+
+
+def test_profiles_in_another_format_are_rejected(usage_csv):
+    accumulator = _accumulator(usage_csv)
+    with pytest.raises(DatasetProfileFormatError):
+        _load("usage", pickle.dumps(accumulator))
+    future = _dump(accumulator).replace(
+        PROFILE_FORMAT_VERSION.to_bytes(2, "big"), (PROFILE_FORMAT_VERSION + 1).to_bytes(2, "big"), 1)
+    with pytest.raises(DatasetProfileFormatError):
+        _load("usage", future)
+
+
+def test_uploads_merge_into_one_dataset_profile(sync_db, usage_csv):
+    service = DatasetProfileService(dataset_table_repository=DroppedTables())
+    options = DataSummaryOptions()
+
+    asyncio.run(service.append_to_dataset(sync_db, "usage", _accumulator(usage_csv), options))
+    merged = asyncio.run(service.append_to_dataset(sync_db, "usage", _accumulator(usage_csv), options))
+    assert merged.total_records == 400
+
+    stored = asyncio.run(service.get_dataset_profile(sync_db, "usage"))
+    profile = stored.finalize()
+    assert profile.total_records == 400
+    assert profile.column("offerName").value_counts.to_dict() == {f"offer{index}": 100 for index in range(4)}
+    assert service.dataset_profile_repository.get_by_name(sync_db, "usage").upload_count == 2
+
+
+def test_uploads_with_other_sketch_options_conflict(sync_db, usage_csv):
+    service = DatasetProfileService(dataset_table_repository=DroppedTables())
+    asyncio.run(service.append_to_dataset(sync_db, "usage", _accumulator(usage_csv), DataSummaryOptions()))
+
+    approximate = DataSummaryOptions(mode="approximate")
+    with pytest.raises(DatasetProfileConflictError):
+        asyncio.run(service.ensure_compatible(sync_db, "usage", approximate))
+    with pytest.raises(DatasetProfileConflictError):
+        asyncio.run(service.append_to_dataset(sync_db, "usage", _accumulator(usage_csv, approximate), approximate))
+    # A profile of other columns holds other accumulators, so it cannot merge either
+    with pytest.raises(DatasetProfileConflictError):
+        asyncio.run(service.ensure_compatible(sync_db, "usage", DataSummaryOptions(columns=["imsi"])))
+
+
+def test_delete_drops_the_profile_and_its_table(sync_db, usage_csv):
+    tables = DroppedTables()
+    service = DatasetProfileService(dataset_table_repository=tables)
+    asyncio.run(service.append_to_dataset(sync_db, "usage", _accumulator(usage_csv), DataSummaryOptions()))
+
+    assert asyncio.run(service.delete_dataset_profile(sync_db, "usage")) is True
+    assert tables.dropped == [dataset_table_name("usage")]
+    assert asyncio.run(service.get_dataset_profile(sync_db, "usage")) is None
+    assert asyncio.run(service.delete_dataset_profile(sync_db, "usage")) is False
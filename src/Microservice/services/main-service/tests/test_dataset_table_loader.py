@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy import BigInteger, Boolean, Double, Text
+
+from app.repository.dataset_table_repository import MAX_IDENTIFIER_LENGTH, DatasetTableRepository, dataset_table_name
+from app.services.dataset_table_loader import (
+    DatasetTableConflictError,
+    DatasetTableLoader,
+    DatasetTableLoadError,
+    sql_type_for,
+)
+
+
+class RecordingTableRepository(DatasetTableRepository):
+    """Creates and reflects real tables but records COPY payloads and index requests, which need Postgres"""
+
+    def __init__(self):
+        self.copied = []
+        self.indexed = []
+        self.calls = []
+
+    def lock_table(self, db, name):
+        self.calls.append(("lock", name))
+        super().lock_table(db, name)
+
+    def get_table(self, db, name):
+        self.calls.append(("get", name))
+        return super().get_table(db, name)
+
+    def copy_rows(self, db, table, columns, rows):
+        self.copied.append((list(columns), rows.getvalue()))
+
+    def create_indexes(self, db, table, columns):
+        self.indexed.extend(columns)
+        return [f"ix_{column}" for column in columns]
+
+
+def usage_chunk(start, rows, **overrides):
+    chunk = pd.DataFrame({
+        "imsi": range(start, start + rows),
+        "zone": [f"zone{index % 3}" for index in range(rows)],
+        "eventTime": pd.date_range("2024-01-01", periods=rows, freq="h"),
+        "chargedAmount": [index * 0.5 for index in range(rows)],
+    })
+    for name, values in overrides.items():
+        chunk[name] = values
+    return chunk
+
+
+def test_sql_types_follow_the_inferred_dtypes():
+    assert isinstance(sql_type_for(pd.Series([True, False])), Boolean)
+    assert isinstance(sql_type_for(pd.Series([1, 2], dtype="uint8")), BigInteger)
+    assert isinstance(sql_type_for(pd.Series([1.5])), Double)
+    assert sql_type_for(pd.Series(pd.to_datetime(["2024-01-01"]).tz_localize("UTC"))).timezone
+    assert isinstance(sql_type_for(pd.Series(["a"], dtype="category")), Text)
+
+
+def test_table_names_are_bounded_and_distinct():
+    long_name = "usage " * 30
+
+    assert len(dataset_table_name(long_name)) <= MAX_IDENTIFIER_LENGTH
+    assert dataset_table_name("Usage-2024") != dataset_table_name("usage 2024")
+    assert dataset_table_name("usage") == dataset_table_name("usage")
+
+
+def test_chunks_are_copied_into_a_table_typed_from_the_first_chunk(sync_db):
+    repository = RecordingTableRepository()
+    loader = DatasetTableLoader(sync_db, "usage", repository)
+
+    loader.update(usage_chunk(0, 3))
+    # Blank integers make later chunks floats; they still load into the BIGINT column
+    loader.update(usage_chunk(3, 2, imsi=[3.0, None]))
+    stats = loader.finish()
+
+    table = repository.get_table(sync_db, dataset_table_name("usage"))
+    assert {column.name: type(column.type).__name__ for column in table.c} == {
+        "imsi": "BIGINT", "zone": "TEXT", "eventTime": "DATETIME", "chargedAmount": "DOUBLE"}
+    assert (stats.rows, stats.created) == (5, True)
+    assert repository.copied[1][1].splitlines()[0].startswith("3,zone0,")
+    assert repository.copied[1][1].splitlines()[1].startswith(",zone1,")
+    assert sorted(repository.indexed) == ["eventTime", "imsi", "zone"]
+    assert stats.bytes == sum(len(rows) for _, rows in repository.copied)
+
+
+def test_second_upload_appends_without_reindexing(sync_db):
+    repository = RecordingTableRepository()
+    first = DatasetTableLoader(sync_db, "usage", repository)
+    first.update(usage_chunk(0, 3))
+    first.finish()
+
+    second = DatasetTableLoader(sync_db, "usage", repository)
+    second.update(usage_chunk(3, 3))
+    stats = second.finish()
+
+    assert not stats.created and stats.indexes == []
+    assert sorted(repository.indexed) == ["eventTime", "imsi", "zone"]
+
+
+def test_table_is_locked_before_it_is_looked_up_or_created(sync_db):
+    repository = RecordingTableRepository()
+    loader = DatasetTableLoader(sync_db, "usage", repository)
+
+    loader.update(usage_chunk(0, 3))
+    loader.update(usage_chunk(3, 3))
+
+    name = dataset_table_name("usage")
+    assert repository.calls == [("lock", name), ("get", name)]
+
+
+def test_table_lock_is_a_transaction_scoped_advisory_lock():
+    executed = []
+    postgres = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+        execute=lambda statement, params: executed.append((str(statement), params)))
+    sqlite = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="sqlite")))
+
+    DatasetTableRepository().lock_table(postgres, "dataset_usage")
+    DatasetTableRepository().lock_table(postgres, "dataset_usage")
+    DatasetTableRepository().lock_table(sqlite, "dataset_usage")
+
+    assert [statement for statement, _ in executed] == ["SELECT pg_advisory_xact_lock(:key)"] * 2
+    # The same table always maps to the same signed 64-bit key
+    assert executed[0][1] == executed[1][1]
+    assert -2 ** 63 <= executed[0][1]["key"] < 2 ** 63
+
+
+def test_uploads_that_do_not_fit_the_table_are_rejected(sync_db):
+    repository = RecordingTableRepository()
+    loader = DatasetTableLoader(sync_db, "usage", repository)
+    loader.update(usage_chunk(0, 3))
+    with pytest.raises(DatasetTableLoadError):
+        loader.update(usage_chunk(3, 2, imsi=[3.5, 4.0]))
+    loader.finish()
+
+    with pytest.raises(DatasetTableConflictError):
+        DatasetTableLoader(sync_db, "usage", repository).update(usage_chunk(5, 2).drop(columns="zone"))
+
+
+def test_unparseable_datetimes_are_loaded_as_nulls_and_counted(sync_db):
+    repository = RecordingTableRepository()
+    loader = DatasetTableLoader(sync_db, "usage", repository)
+    loader.update(usage_chunk(0, 3))
+
+    loader.update(usage_chunk(3, 2, eventTime=["2024-02-01 10:00:00", "soon"]))
+
+    assert loader.stats.coerced_values == 1
+    assert repository.copied[1][1].splitlines()[1].split(",")[2] == ""
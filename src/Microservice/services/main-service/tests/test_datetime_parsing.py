@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from app.services.column_stats import ColumnAccumulator
+from app.services.datetime_parsing import (
+    DatetimeFormat,
+    DatetimeFormatCache,
+    infer_datetime_format,
+    is_time_like,
+    parse_datetimes,
+)
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["2024-01-31 10:15:00", "2024-02-01 08:00:00"], DatetimeFormat("format", "%Y-%m-%d %H:%M:%S")),
+    (["31/01/2024 10:15", "01/02/2024 08:00"], DatetimeFormat("format", "%d/%m/%Y %H:%M")),
+    ([1706696100, 1706774400], DatetimeFormat("epoch", "s")),
+    ([1706696100000, 1706774400000], DatetimeFormat("epoch", "ms")),
+])
+def test_formats_are_inferred_once_per_column(values, expected):
+    assert infer_datetime_format(pd.Series(values)) == expected
+
+
+@pytest.mark.parametrize("values", [["DATA", "VOICE"], [3, 1500, 42], [None, None]])
+def test_values_that_are_not_timestamps_have_no_format(values):
+    assert infer_datetime_format(pd.Series(values)) is None
+
+
+def test_preferred_format_is_kept_while_it_still_parses():
+    preferred = DatetimeFormat("format", "%m/%d/%Y")
+    # Ambiguous days, so a fresh guess could have picked either order
+    assert infer_datetime_format(["01/02/2024", "03/04/2024"], preferred) == preferred
+    assert infer_datetime_format(["2024-01-02"], preferred) == DatetimeFormat("format", "%Y-%m-%d")
+
+
+def test_parse_reports_failures_but_not_nulls():
+    parsed, failed = parse_datetimes(
+        ["2024-01-31 10:15:00", None, "yesterday"], DatetimeFormat("format", "%Y-%m-%d %H:%M:%S"))
+
+    assert parsed[0] == pd.Timestamp("2024-01-31 10:15:00")
+    assert list(failed) == [False, False, True]
+
+
+def test_accumulator_parses_distinct_values_and_counts_failures():
+    accumulator = ColumnAccumulator("eventTime")
+    days = [f"2024-01-{day:02d} 00:00:00" for day in range(1, 11)]
+    accumulator.update(pd.Series(days * 3 + ["2024-01-31 10:15:00", "n/a", "n/a"]))
+
+    stats = accumulator.finalize()
+
+    assert stats.datetime_min == pd.Timestamp("2024-01-01")
+    assert stats.datetime_max == pd.Timestamp("2024-01-31 10:15:00")
+    assert stats.datetime_format == "%Y-%m-%d %H:%M:%S"
+    assert stats.datetime_failed_count == 2
+    assert not stats.datetime_failed
+
+
+def test_carried_over_format_is_replaced_when_it_parses_nothing():
+    accumulator = ColumnAccumulator("eventTime", DatetimeFormat("format", "%d/%m/%Y"))
+    accumulator.update(pd.Series(["2024-01-31", "2024-02-01"]))
+
+    assert accumulator.datetime_format == DatetimeFormat("format", "%Y-%m-%d")
+    assert accumulator.datetime_failed_count == 0
+
+
+def test_unparseable_time_columns_are_flagged():
+    accumulator = ColumnAccumulator("eventTime")
+    accumulator.update(pd.Series(["soon", "later"]))
+
+    assert accumulator.finalize().datetime_failed
+    assert is_time_like("EventTime") and not is_time_like("zone")
+
+
+def test_format_cache_is_keyed_by_layout_and_bounded():
+    cache = DatetimeFormatCache(max_entries=1)
+    iso = DatetimeFormat("format", "%Y-%m-%d")
+    cache.put([" eventTime", "zone"], {"eventTime": iso})
+
+    assert cache.get(["eventTime", "zone "]) == {"eventTime": iso}
+    assert cache.get(["eventTime"]) == {}
+    cache.put(["startTime"], {"startTime": iso})
+    assert cache.get(["eventTime", "zone"]) == {}
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+
+import pandas as pd
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.repository import dimension_cube_repository
+from app.repository.dimension_cube_repository import DimensionCubeRepository
+from app.services.dimension_cube import DimensionCubeAccumulator
+from app.services.dimension_cube_service import DimensionCubeService
+from shared.database.models import DimensionCubeCell
+
+
+class ThreadRecordingRepository(DimensionCubeRepository):
+    """
+    Records the thread of every repository call; add_cells keeps the cells instead of
+    running the Postgres-only upsert
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+        self.added = []
+
+    def get_by_name(self, db, name):
+        self.threads.add(threading.get_ident())
+        return super().get_by_name(db, name)
+
+    def create_dimension_cube(self, db, name):
+        self.threads.add(threading.get_ident())
+        return super().create_dimension_cube(db, name)
+
+    def add_cells(self, db, cube, cells, total_records):
+        self.threads.add(threading.get_ident())
+        self.added.append((cube.name, cells, total_records))
+
+    def slice_cells(self, db, cube, group_by, filters, limit):
+        self.threads.add(threading.get_ident())
+        return super().slice_cells(db, cube, group_by, filters, limit)
+
+    def delete_dimension_cube_by_name(self, db, name):
+        self.threads.add(threading.get_ident())
+        return super().delete_dimension_cube_by_name(db, name)
+
+
+def _chunk(offers, mccmncs):
+    return pd.DataFrame({"offerName": offers, "zone": ["north"] * len(offers), "mccmnc": mccmncs})
+
+
+def test_accumulator_sums_cells_across_chunks():
+    cube = DimensionCubeAccumulator()
+    cube.update(_chunk(["gold", "gold", "silver"], [310260.0, 310260.0, None]))
+    cube.update(_chunk(["gold"], [310260.0]))
+
+    cells = {(cell["offerName"], cell["mccmnc"]): cell for cell in cube.cells()}
+    assert cube.total_records == 4
+    assert cells[("gold", "310260")]["record_count"] == 3
+    # Blank values and dimensions the file lacks are stored as ''
+    assert cells[("silver", "")]["record_count"] == 1
+    assert cells[("gold", "310260")]["requestType"] == ""
+
+
+def test_cube_operations_run_off_the_event_loop_thread(sync_db):
+    repository = ThreadRecordingRepository()
+    service = DimensionCubeService(repository)
+    cube = DimensionCubeAccumulator()
+    cube.update(_chunk(["gold", "silver"], [310260.0, 310410.0]))
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await service.append_to_cube(sync_db, "usage", cube)
+        await service.slice_cube(sync_db, "usage", ["offerName"], {}, 10)
+        await service.delete_dimension_cube(sync_db, "usage")
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert repository.threads and loop_thread not in repository.threads
+    assert repository.added[0][0] == "usage" and repository.added[0][2] == 2
+
+
+def test_slice_groups_and_filters_cells(sync_db):
+    service = DimensionCubeService()
+    cube = service.dimension_cube_repository.create_dimension_cube(sync_db, "usage")
+    for index, (offer, zone, count) in enumerate([("gold", "north", 5), ("gold", "south", 3), ("silver", "north", 7)]):
+        sync_db.add(DimensionCubeCell(
+            id=index + 1, cube_id=cube.id, offerName=offer, zone=zone, requestType="", mccmnc="", record_count=count))
+    sync_db.commit()
+
+    by_offer = asyncio.run(service.slice_cube(sync_db, "usage", ["offerName"], {}, 10))
+    assert [(cell.dimensions["offerName"], cell.record_count) for cell in by_offer.cells] == [("gold", 8), ("silver", 7)]
+
+    north = asyncio.run(service.slice_cube(sync_db, "usage", ["offerName"], {"zone": ["north"]}, 10))
+    assert [(cell.dimensions["offerName"], cell.record_count) for cell in north.cells] == [("silver", 7), ("gold", 5)]
+
+    assert asyncio.run(service.slice_cube(sync_db, "missing", ["offerName"], {}, 10)) is None
+    assert asyncio.run(service.delete_dimension_cube(sync_db, "usage")) is True
+    assert sync_db.query(DimensionCubeCell).count() == 0
+
+
+def test_cells_are_upserted_in_key_order(sync_db, monkeypatch):
+    monkeypatch.setattr(dimension_cube_repository, "CELL_UPSERT_BATCH_SIZE", 2)
+    repository = DimensionCubeRepository()
+    cube = repository.create_dimension_cube(sync_db, "usage")
+    batches = []
+    execute = sync_db.execute
+
+    def record_upserts(statement, *args, **kwargs):
+        # The upsert needs Postgres, so its rows are recorded instead of run
+        if not isinstance(statement, Insert):
+            return execute(statement, *args, **kwargs)
+        params = statement.compile(dialect=postgresql.dialect()).params
+        batches.append([(params[f"offerName_m{row}"], params[f"zone_m{row}"]) for row in range(2)
+                        if f"offerName_m{row}" in params])
+
+    monkeypatch.setattr(sync_db, "execute", record_upserts)
+    cells = [
+        {"offerName": offer, "zone": zone, "requestType": "", "mccmnc": "", "record_count": 1}
+        for offer, zone in [("silver", "north"), ("gold", "south"), ("silver", "east"), ("gold", "north")]
+    ]
+
+    repository.add_cells(sync_db, cube, cells, 4)
+
+    # Concurrent uploads then lock shared cells in the same order and cannot deadlock
+    assert batches == [[("gold", "north"), ("gold", "south")], [("silver", "east"), ("silver", "north")]]
+    assert cube.total_records == 4
@@ -0,0 +1,70 @@
+import io
+
+import pandas as pd
+
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.dtype_inference import downcast_integers, infer_schema
+from app.services.handle_file_service import HandleFileService
+
+
+def usage_frame(rows=100):
+    return pd.read_csv(io.StringIO("imsi,zone,eventTime,bytesUp\n" + "\n".join(
+        f"{900000000000 + index},zone{index % 3},2024-01-{1 + index % 28:02d} 10:00:00,{index}"
+        for index in range(rows))))
+
+
+def test_low_cardinality_text_becomes_categorical_and_times_parse():
+    schema = infer_schema(usage_frame(), 0.5)
+
+    assert schema.categorical == ["zone"]
+    assert schema.datetime["eventTime"].value == "%Y-%m-%d %H:%M:%S"
+    converted = schema.apply(usage_frame())
+    assert isinstance(converted["zone"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(converted["eventTime"])
+    assert converted["bytesUp"].dtype == "uint8"
+    assert converted["imsi"].dtype == "uint64"
+
+
+def test_high_cardinality_text_stays_text():
+    frame = pd.DataFrame({"msisdn": [f"+3367{index:07d}" for index in range(100)]})
+
+    assert infer_schema(frame, 0.5).categorical == []
+
+
+def test_chunks_that_no_longer_fit_keep_their_values():
+    schema = infer_schema(usage_frame(), 0.5)
+    chunk = usage_frame(3)
+    chunk.loc[1, "eventTime"] = "not a time"
+
+    converted = schema.apply(chunk)
+
+    assert not pd.api.types.is_datetime64_any_dtype(converted["eventTime"])
+    assert converted.loc[1, "eventTime"] == "not a time"
+
+
+def test_downcast_integers_keeps_signed_values():
+    chunk = downcast_integers(pd.DataFrame({"delta": [-5, 100], "count": [0, 70000]}))
+
+    assert (chunk["delta"].dtype, chunk["count"].dtype) == ("int8", "uint32")
+
+
+def test_measured_footprint_shrinks(usage_csv):
+    profile = HandleFileService.build_data_profile(usage_csv, ".csv", DataSummaryOptions())
+
+    footprint = profile.memory_footprint
+    assert footprint.sample_rows == 200
+    assert footprint.optimized_bytes_per_row < footprint.default_bytes_per_row
+    assert set(footprint.categorical_columns) == {"offerName", "zone", "requestType"}
+    assert footprint.datetime_columns == ["eventTime"]
+
+
+def test_inferred_dtypes_do_not_change_the_figures(usage_csv):
+    inferred = HandleFileService.build_data_profile(usage_csv, ".csv", DataSummaryOptions())
+    plain = HandleFileService.build_data_profile(usage_csv, ".csv", DataSummaryOptions(infer_dtypes=False))
+
+    for stats in plain.columns:
+        other = inferred.column(stats.name)
+        assert (other.non_null_count, other.unique_count, other.median_frequency) == (
+            stats.non_null_count, stats.unique_count, stats.median_frequency)
+        assert {str(value): count for value, count in other.top_values(3).items()} == {
+            str(value): count for value, count in stats.top_values(3).items()}
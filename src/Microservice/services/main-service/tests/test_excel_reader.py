@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.excel_reader import UnknownSheetsError, iter_excel_chunks, resolve_sheets
+from app.services.handle_file_service import HandleFileService
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "usage.xlsx")
+    usage = pd.DataFrame({
+        "imsi": range(1000, 1050),
+        "zone": [f"zone{index % 3}" for index in range(50)],
+    })
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        usage.to_excel(writer, sheet_name="January", index=False)
+        usage.head(20).to_excel(writer, sheet_name="February", index=False)
+    return path
+
+
+@pytest.mark.parametrize("engine", ["calamine", "openpyxl"])
+def test_engines_read_the_same_rows(workbook, engine):
+    chunks = list(iter_excel_chunks(workbook, ".xlsx", "January", None, 16, engine))
+
+    frame = pd.concat(chunks)
+    assert list(frame.index) == list(range(50))
+    assert list(frame.columns) == ["imsi", "zone"]
+    assert list(frame["imsi"]) == list(range(1000, 1050))
+    if engine == "openpyxl":
+        # Only the streaming engine yields bounded chunks
+        assert [len(chunk) for chunk in chunks] == [16, 16, 16, 2]
+
+
+def test_openpyxl_projection_and_header_names(tmp_path):
+    path = str(tmp_path / "headers.xlsx")
+    pd.DataFrame([[1, 2, 3, 4]], columns=["zone", None, "zone", "imsi"]).to_excel(path, index=False)
+
+    frame = next(iter_excel_chunks(path, ".xlsx", None, None, 10, "openpyxl"))
+    expected = pd.read_excel(path)
+    assert list(frame.columns) == list(expected.columns)
+
+    projected = next(iter_excel_chunks(path, ".xlsx", None, lambda name: name == "imsi", 10, "openpyxl"))
+    assert list(projected.columns) == ["imsi"]
+
+
+def test_resolve_sheets(workbook):
+    assert resolve_sheets(workbook, ["*"], "calamine") == ["January", "February"]
+    assert resolve_sheets(workbook, ["February", "February"], "calamine") == ["February"]
+    with pytest.raises(UnknownSheetsError):
+        resolve_sheets(workbook, ["March"], "calamine")
+
+
+def test_sheets_are_profiled_separately_in_parallel(workbook, monkeypatch):
+    monkeypatch.setattr(settings, "EXCEL_ENGINE", "openpyxl")
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return await HandleFileService.profile_sheets(
+                workbook, ".xlsx", DataSummaryOptions(sheets=["*"]), executor)
+
+    sheet_profiles = asyncio.run(scenario())
+
+    assert [(sheet.name, sheet.profile.total_records) for sheet in sheet_profiles] == [("January", 50), ("February", 20)]
+    assert sheet_profiles[0].profile.column("imsi").unique_count == 50
+    summary = HandleFileService.render_sheet_summaries(sheet_profiles)
+    assert "January" in summary and "February" in summary
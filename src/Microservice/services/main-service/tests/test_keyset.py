@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, select
+from sqlalchemy.dialects import postgresql
+
+from app.repository.base import BaseRepository
+from app.repository.dimension_cube_repository import DimensionCubeRepository
+from app.repository.keyset import InvalidCursorError, decode_cursor, encode_cursor, keyset_statement, split_page
+from shared.database.models import CrudExample, DimensionCube
+
+COLUMNS = [CrudExample.created_at, CrudExample.id]
+
+
+def test_cursor_round_trips_the_key_types():
+    created_at = datetime(2024, 1, 2, 10, 30, 15, 123456)
+
+    cursor = encode_cursor([created_at, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, COLUMNS) == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    encode_cursor([42]),
+    encode_cursor(["2024-01-02T10:30:15", "forty-two"]),
+    encode_cursor({"created_at": "2024-01-02T10:30:15", "id": 42}),
+])
+def test_foreign_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, COLUMNS)
+
+
+def test_split_page_trims_the_extra_row_and_points_past_the_last_kept_one():
+    rows = [CrudExample(id=index, created_at=datetime(2024, 1, 1) - timedelta(days=index)) for index in range(1, 5)]
+
+    page, next_cursor = split_page(rows, COLUMNS, 3)
+
+    assert page == rows[:3]
+    assert decode_cursor(next_cursor, COLUMNS) == [rows[2].created_at, 3]
+    assert split_page(rows[:3], COLUMNS, 3) == (rows[:3], None)
+
+
+def test_statement_seeks_by_row_comparison_in_the_sort_direction():
+    cursor = encode_cursor([datetime(2024, 1, 1), 7])
+    dialect = postgresql.dialect()
+
+    newest_first = str(keyset_statement(select(CrudExample), COLUMNS, cursor, 10).compile(dialect=dialect))
+    oldest_first = str(keyset_statement(select(CrudExample), COLUMNS, cursor, 10, descending=False)
+                       .compile(dialect=dialect))
+
+    assert '("crudExamples".created_at, "crudExamples".id) < (' in newest_first
+    assert 'ORDER BY "crudExamples".created_at DESC, "crudExamples".id DESC' in newest_first
+    assert '("crudExamples".created_at, "crudExamples".id) > (' in oldest_first
+    assert "LIMIT" in oldest_first
+    assert "WHERE" not in str(keyset_statement(select(CrudExample), COLUMNS, None, 10).compile(dialect=dialect))
+
+
+def test_pages_cover_every_row_once_when_timestamps_tie(sync_db):
+    # Several rows share a timestamp, so the id must break ties for no row to be skipped or repeated
+    for index in range(11):
+        sync_db.add(DimensionCube(name=f"cube{index}", created_at=datetime(2024, 1, 1 + index // 3)))
+    sync_db.commit()
+    repository = DimensionCubeRepository()
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = repository.get_page(sync_db, limit=4, cursor=cursor)
+        seen.extend(cube.name for cube in page)
+        if cursor is None:
+            break
+
+    expected = [cube.name for cube in sync_db.scalars(
+        select(DimensionCube).order_by(DimensionCube.created_at.desc(), DimensionCube.id.desc()))]
+    assert seen == expected
+    assert len(seen) == 11
+
+
+def test_keys_are_not_null_or_left_out():
+    # A NULL created_at would fall out of the row comparison and end pages early
+    assert not CrudExample.created_at.nullable
+    assert [column.key for column in DimensionCubeRepository().keyset_columns()] == ["created_at", "id"]
+
+    legacy = SimpleNamespace(model=SimpleNamespace(created_at=Column(DateTime, nullable=True), id=DimensionCube.id))
+    assert [column.key for column in BaseRepository.keyset_columns(legacy)] == ["id"]
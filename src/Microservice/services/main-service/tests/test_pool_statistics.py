@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from shared.database.dbContext import PoolOptions
+from shared.database.poolStatistics import PoolStatistics, instrumented_pool_class
+from app.schemas.health import DatabasePoolStats
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    statistics = PoolStatistics("sync")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, statistics),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    statistics.attach(engine, 1, 1, 0.05)
+    yield engine, statistics
+    engine.dispose()
+
+
+def test_pool_options_map_to_engine_and_session_settings():
+    options = PoolOptions(pool_size=8, max_overflow=2, pool_timeout=5, statement_timeout_ms=3000)
+
+    assert options.engine_kwargs() == {
+        "pool_size": 8, "max_overflow": 2, "pool_timeout": 5, "pool_pre_ping": True, "pool_recycle": -1}
+    assert options.server_settings() == {"statement_timeout": "3000"}
+    assert PoolOptions().server_settings() == {}
+
+
+def test_checkouts_holds_and_overflow_are_counted(pooled_engine):
+    engine, statistics = pooled_engine
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        busy = statistics.snapshot()
+
+    idle = statistics.snapshot()
+    assert (busy["checked_out"], busy["overflow"]) == (2, 1)
+    assert (idle["checked_out"], idle["checkouts"], idle["peak_checked_out"], idle["peak_overflow"]) == (0, 2, 2, 1)
+    assert idle["pool_class"] == "InstrumentedQueuePool"
+    assert idle["hold_ms_max"] >= idle["hold_ms_mean"] > 0
+    # The snapshot is what the pool statistics endpoint returns
+    DatabasePoolStats(**idle)
+
+
+def test_waits_that_time_out_are_counted(pooled_engine):
+    engine, statistics = pooled_engine
+
+    with engine.connect(), engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    snapshot = statistics.snapshot()
+    assert (snapshot["timeouts"], snapshot["checkouts"]) == (1, 2)
+    assert snapshot["wait_ms_max"] >= 50
+    statistics.reset()
+    assert statistics.snapshot()["timeouts"] == 0
+
+
+def test_health_service_reports_every_initialized_pool(pooled_engine, monkeypatch):
+    from app.services import health_service
+
+    _, statistics = pooled_engine
+    monkeypatch.setattr(health_service, "get_pool_statistics", lambda: [statistics.snapshot()])
+
+    pools = asyncio.run(health_service.HealthService().get_database_pool_stats())
+
+    assert [pool.name for pool in pools] == ["sync"]
@@ -0,0 +1,81 @@
+import datetime
+import decimal
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.column_stats import DataProfileAccumulator, SketchColumnAccumulator
+from app.services.handle_file_service import HandleFileService
+from app.services.profile_serialization import dump_accumulator, load_accumulator
+from app.services.summary_renderers import encode_document, profile_document
+
+
+def _report(accumulator):
+    return json.loads(encode_document(profile_document(accumulator.finalize()), "json"))
+
+
+@pytest.mark.parametrize("options", [
+    DataSummaryOptions(),
+    DataSummaryOptions(mode="approximate", top_k_capacity=10),
+    DataSummaryOptions(exact_max_distinct=50),
+])
+def test_round_trip_keeps_the_report_and_merges_like_the_original(usage_csv, options):
+    original = HandleFileService.build_data_accumulator(usage_csv, ".csv", options)
+    loaded = load_accumulator(dump_accumulator(original))
+
+    assert _report(loaded) == _report(original)
+    assert [type(column) for column in loaded.columns.values()] == [type(column) for column in original.columns.values()]
+
+    # Both keep folding uploads the same way, e.g. sketches stay mergeable
+    for accumulator in (original, loaded):
+        accumulator.merge(HandleFileService.build_data_accumulator(usage_csv, ".csv", options))
+    assert _report(loaded) == _report(original)
+
+
+def test_sketches_and_counts_are_stored_as_plain_arrays(usage_csv):
+    accumulator = HandleFileService.build_data_accumulator(usage_csv, ".csv", DataSummaryOptions(mode="approximate"))
+
+    with np.load(io.BytesIO(dump_accumulator(accumulator)), allow_pickle=False) as archive:
+        dtypes = {archive[name].dtype.kind for name in archive.files}
+
+    assert "O" not in dtypes
+    loaded = load_accumulator(dump_accumulator(accumulator))
+    sketch = loaded.columns["imsi"]
+    assert isinstance(sketch, SketchColumnAccumulator)
+    assert np.array_equal(sketch.distinct.registers, accumulator.columns["imsi"].distinct.registers)
+    assert sketch.top_values.counts.equals(accumulator.columns["imsi"].top_values.counts)
+
+
+def test_cell_values_keep_their_types():
+    frame = pd.DataFrame({
+        "amount": [decimal.Decimal("1.10"), decimal.Decimal("2.25"), None],
+        "day": [datetime.date(2024, 1, 1), datetime.date(2024, 1, 2), None],
+        "eventTime": pd.to_datetime(["2024-03-31 01:30", "2024-03-31 03:30", None]).tz_localize("Europe/Paris"),
+        "ratio": np.array([0.5, 0.25, 0.125], dtype=np.float32),
+    })
+    accumulator = DataProfileAccumulator()
+    accumulator.update(frame)
+
+    loaded = load_accumulator(dump_accumulator(accumulator))
+
+    # NaN never equals itself, so rows are compared by their repr
+    assert repr(loaded.preview_rows) == repr(accumulator.preview_rows)
+    for name, column in accumulator.columns.items():
+        restored = loaded.columns[name]
+        assert restored.dtype == column.dtype
+        assert restored.value_counts.index.equals(column.value_counts.index)
+        assert repr(restored.minimum) == repr(column.minimum)
+        assert repr(restored.datetime_max) == repr(column.datetime_max)
+    assert str(loaded.columns["eventTime"].datetime_max.tz) == "Europe/Paris"
+
+
+def test_values_without_a_stored_form_are_rejected():
+    accumulator = DataProfileAccumulator()
+    accumulator.update(pd.DataFrame({"blob": [b"\x00", b"\x01"]}))
+
+    with pytest.raises(TypeError):
+        dump_accumulator(accumulator)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.sketches import DistinctValueSample, HyperLogLog, SpaceSavingSketch, TDigest, hash_values
+
+
+def zipf_counts(distinct=5000, seed=7):
+    generator = np.random.default_rng(seed)
+    values = generator.zipf(1.3, size=50000) % distinct
+    return pd.Series(values).value_counts(sort=False)
+
+
+@pytest.mark.parametrize("distinct", [100, 10000, 200000])
+def test_hyperloglog_estimate_is_within_three_standard_errors(distinct):
+    sketch = HyperLogLog(12)
+    sketch.update_hashes(hash_values(np.arange(distinct)))
+
+    assert abs(sketch.estimate() - distinct) <= 3 * sketch.relative_error * distinct
+
+
+def test_hyperloglog_merge_equals_one_sketch_over_the_union():
+    whole, left, right = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    whole.update_hashes(hash_values(np.arange(50000)))
+    left.update_hashes(hash_values(np.arange(0, 30000)))
+    right.update_hashes(hash_values(np.arange(20000, 50000)))
+
+    left.merge(right)
+
+    assert left.estimate() == whole.estimate()
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_downcast_integers_hash_like_int64():
+    values = np.arange(100)
+    assert (hash_values(values.astype("int8")) == hash_values(values.astype("int64"))).all()
+
+
+def test_space_saving_counts_are_bounded_overestimates():
+    counts = zipf_counts()
+    sketch = SpaceSavingSketch(100)
+    for batch in np.array_split(np.arange(len(counts)), 10):
+        sketch.update_counts(counts.iloc[batch])
+
+    assert sketch.is_saturated
+    assert sketch.error_bound <= sketch.total / sketch.capacity
+    for value, count in sketch.counts.items():
+        assert counts[value] <= count <= counts[value] + sketch.errors[value]
+    # Every value more frequent than total / capacity is guaranteed to be kept
+    heavy = counts[counts > sketch.total / sketch.capacity]
+    assert set(heavy.index) <= set(sketch.counts.index)
+
+
+def test_space_saving_merge_keeps_the_bounds():
+    counts = zipf_counts()
+    left, right = SpaceSavingSketch(100), SpaceSavingSketch(100)
+    left.update_counts(counts.iloc[::2])
+    right.update_counts(counts.iloc[1::2])
+
+    left.merge(right)
+
+    assert left.total == counts.sum()
+    for value, count in left.counts.items():
+        assert counts[value] <= count <= counts[value] + left.errors[value]
+    assert list(left.top(5).index) == list(counts.sort_values(ascending=False).head(5).index)
+
+
+def test_space_saving_is_exact_until_saturated():
+    sketch = SpaceSavingSketch(10)
+    sketch.update_counts(pd.Series({"DATA": 5, "VOICE": 3, "SMS": 1}))
+
+    assert not sketch.is_saturated
+    assert sketch.error_bound == 0
+    assert sketch.top(3).to_dict() == {"DATA": 5, "VOICE": 3, "SMS": 1}
+
+
+def test_tdigest_quantiles_are_within_the_rank_error():
+    values = np.random.default_rng(3).normal(size=100000)
+    digest, left, right = TDigest(100), TDigest(100), TDigest(100)
+    for batch in np.array_split(values, 20):
+        digest.update(batch)
+    left.update(values[:30000])
+    right.update(values[30000:])
+    left.merge(right)
+
+    for sketch in (digest, left):
+        for q in (0.25, 0.5, 0.75):
+            rank = (values <= sketch.quantile(q)).mean()
+            assert abs(rank - q) <= sketch.median_rank_error
+        assert sketch.count == len(values)
+        assert sketch.quantile(0) == values.min()
+        assert sketch.quantile(1) == values.max()
+
+
+def test_distinct_value_sample_keeps_exact_frequencies():
+    values = np.arange(5000)
+    counts = (values % 4) + 1
+    sample, left, right = DistinctValueSample(256), DistinctValueSample(256), DistinctValueSample(256)
+    sample.update(hash_values(values), counts)
+    left.update(hash_values(values[:2500]), counts[:2500])
+    right.update(hash_values(values[2500:]), counts[2500:])
+
+    left.merge(right)
+
+    assert left.frequencies.equals(sample.frequencies)
+    assert len(sample.frequencies) == 256
+    assert set(sample.frequencies.unique()) <= {1, 2, 3, 4}
+    assert sample.median_frequency() in (2.0, 2.5, 3.0)
+
+
+def test_approximate_profile_reports_estimates_within_bounds(usage_csv):
+    from app.schemas.dataSummary import DataSummaryOptions
+    from app.services.handle_file_service import HandleFileService
+
+    profile = HandleFileService.build_data_profile(
+        usage_csv, ".csv", DataSummaryOptions(mode="approximate", top_k_capacity=10))
+
+    imsi = profile.column("imsi")
+    assert imsi.approximate
+    assert abs(imsi.unique_count - 200) <= 3 * imsi.distinct_error * 200
+    # Low-cardinality columns fit in the summary and are reported exactly
+    zone = profile.column("zone")
+    assert not zone.approximate
+    assert zone.unique_count == 3
+    assert profile.error_bounds
@@ -0,0 +1,32 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services.handle_file_service import HandleFileService, UploadTooLargeError
+
+
+def test_upload_is_spooled_with_its_digest(make_upload, usage_csv, tmp_path):
+    with open(usage_csv, "rb") as source:
+        content = source.read()
+    upload = make_upload("usage.csv", content)
+
+    path, digest = asyncio.run(HandleFileService().spool_upload(upload, ".csv", str(tmp_path)))
+
+    assert os.path.dirname(path) == str(tmp_path) and path.endswith(".csv")
+    with open(path, "rb") as spooled:
+        assert spooled.read() == content
+    assert digest == hashlib.sha256(content).hexdigest()
+    # The framework's own copy is released as soon as the spool is written
+    assert upload.file.closed
+
+
+def test_oversized_upload_is_rejected_and_its_spool_removed(make_upload, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 10)
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(HandleFileService().spool_upload(make_upload("usage.csv", b"x" * 11), ".csv", str(tmp_path)))
+
+    assert os.listdir(tmp_path) == []
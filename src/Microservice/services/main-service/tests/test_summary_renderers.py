@@ -0,0 +1,42 @@
+import msgpack
+import numpy as np
+import orjson
+
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services.handle_file_service import HandleFileService
+from app.services.summary_renderers import _plain
+
+
+def _profile(path, mode="exact"):
+    return HandleFileService.build_data_accumulator(path, ".csv", DataSummaryOptions(mode=mode)).finalize()
+
+
+def test_plain_converts_numpy_floats_to_builtin_floats():
+    value = _plain(np.float64(1.5))
+    assert value == 1.5 and type(value) is float
+    assert _plain(np.float64("nan")) is None
+    assert _plain(np.int64(3)) == 3 and type(_plain(np.int64(3))) is int
+    assert _plain(np.bool_(True)) is True
+
+
+def test_json_document_encodes_a_real_profile(usage_csv):
+    profile = _profile(usage_csv)
+    document = orjson.loads(HandleFileService.render_profile(profile, "json"))
+
+    assert document["total_records"] == 200
+    columns = {column["name"]: column for column in document["columns"]}
+    assert isinstance(columns["bytesUp"]["median_frequency"], float)
+    assert columns["bytesUp"]["minimum"] == 0
+    assert columns["chargedAmount"]["maximum"] == 49.75
+    assert columns["imsi"]["unique"] is True
+
+
+def test_json_document_encodes_an_approximate_profile(usage_csv):
+    document = orjson.loads(HandleFileService.render_profile(_profile(usage_csv, "approximate"), "json"))
+    assert document["total_records"] == 200
+
+
+def test_msgpack_document_matches_json(usage_csv):
+    profile = _profile(usage_csv)
+    assert msgpack.unpackb(HandleFileService.render_profile(profile, "msgpack")) == orjson.loads(
+        HandleFileService.render_profile(profile, "json"))
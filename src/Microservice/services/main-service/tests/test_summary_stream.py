@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.schemas.dataSummary import DataSummaryOptions
+from app.services import summary_stream
+from app.services.data_summary_job_service import DataSummaryJobManager
+from app.services.summary_stream import SummaryStream
+
+
+def spooled_copy(usage_csv, tmp_path):
+    path = str(tmp_path / "spooled.csv")
+    shutil.copy(usage_csv, path)
+    return path
+
+
+def job_manager(**kwargs):
+    # Threads instead of worker processes; events still go through a manager queue
+    manager = DataSummaryJobManager(max_workers=2, **kwargs)
+    manager._executor = ThreadPoolExecutor(max_workers=2)
+    return manager
+
+
+def collect(path, file_type, options, stream_format="text", limit=None, manager=None):
+    manager = manager or job_manager()
+
+    async def scenario():
+        stream = SummaryStream(path, file_type, options, stream_format, manager)
+        stream.start()
+        events = []
+        iterator = stream.iterate()
+        async for event in iterator:
+            events.append(event)
+            if limit is not None and len(events) >= limit:
+                await iterator.aclose()
+                break
+        return events
+
+    try:
+        return asyncio.run(scenario())
+    finally:
+        manager.shutdown()
+
+
+def parse_sse(events):
+    parsed = []
+    for event in events:
+        name, data = event.decode("utf-8").rstrip("\n").split("\n", 1)
+        parsed.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return parsed
+
+
+def test_sse_stream_sends_preview_progress_then_sections(usage_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CSV_CHUNK_SIZE", 50)
+    path = spooled_copy(usage_csv, tmp_path)
+
+    events = parse_sse(collect(path, ".csv", DataSummaryOptions(infer_dtypes=False), "sse"))
+
+    names = [name for name, _ in events]
+    assert names[0] == "preview"
+    assert names[1:5] == ["progress"] * 4
+    assert [data["records"] for _, data in events[1:5]] == [50, 100, 150, 200]
+    assert events[4][1]["percent"] == 100.0
+    assert names[5] == "overview" and events[5][1]["total_records"] == 200
+    assert names[6:-2] == ["column"] * 7
+    assert names[-2:] == ["distributions", "done"]
+    assert not os.path.exists(path)
+
+
+def test_text_stream_ends_with_the_report(usage_csv, tmp_path):
+    path = spooled_copy(usage_csv, tmp_path)
+
+    text = b"".join(collect(path, ".csv", DataSummaryOptions())).decode("utf-8")
+
+    assert "Schema:" in text and "Progress:" in text
+    assert "Total Records: 200" in text
+    assert text.index("Schema:") < text.index("Total Records: 200")
+
+
+def test_closed_stream_stops_the_worker_and_removes_the_file(usage_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CSV_CHUNK_SIZE", 1)
+    path = spooled_copy(usage_csv, tmp_path)
+
+    events = collect(path, ".csv", DataSummaryOptions(infer_dtypes=False), "sse", limit=1)
+
+    assert parse_sse(events)[0][0] == "preview"
+    deadline = time.monotonic() + 10
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(path)
+
+
+def test_errors_are_sent_as_an_event(tmp_path):
+    path = str(tmp_path / "broken.parquet")
+    with open(path, "wb") as broken:
+        broken.write(b"not parquet")
+
+    events = parse_sse(collect(path, ".parquet", DataSummaryOptions(), "sse"))
+
+    assert [name for name, _ in events] == ["error"]
+    assert events[0][1]["detail"]
+    assert not os.path.exists(path)
+
+
+def test_stream_waits_for_a_job_slot_with_keep_alives(usage_csv, tmp_path, monkeypatch):
+    monkeypatch.setattr(summary_stream, "KEEPALIVE_SECONDS", 0.05)
+    path = spooled_copy(usage_csv, tmp_path)
+    manager = job_manager(max_concurrent_jobs=1)
+
+    async def scenario():
+        stream = SummaryStream(path, ".csv", DataSummaryOptions(), "sse", manager)
+        async with manager.slot():
+            # Every slot is taken, so the stream only keeps the connection alive
+            stream.start()
+            iterator = stream.iterate()
+            waiting = [await iterator.__anext__() for _ in range(2)]
+        return waiting + [event async for event in iterator]
+
+    try:
+        events = asyncio.run(scenario())
+    finally:
+        manager.shutdown()
+
+    assert events[:2] == [b": keep-alive\n\n"] * 2
+    named = [event for event in events if not event.startswith(b":")]
+    assert [name for name, _ in parse_sse(named)][-1] == "done"
+    assert not os.path.exists(path)
@@ -0,0 +1,100 @@
+import asyncio
+
+from fastapi import FastAPI, File, UploadFile
+
+from app.core.upload_limit import MaxUploadSizeMiddleware
+
+BOUNDARY = "limit-test"
+
+
+def upload_app(received):
+    app = FastAPI()
+
+    @app.post("/process-data/")
+    async def process_data(file: UploadFile = File(...)):
+        received.append(len(await file.read()))
+        return {"bytes": received[-1]}
+
+    @app.post("/other/")
+    async def other(file: UploadFile = File(...)):
+        received.append(len(await file.read()))
+        return {"bytes": received[-1]}
+
+    return MaxUploadSizeMiddleware(app, max_bytes=1024, path_prefix="/process-data")
+
+
+def multipart_body(size):
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"usage.csv\"\r\n"
+        f"Content-Type: text/csv\r\n\r\n"
+    ).encode("utf-8") + b"x" * size + f"\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+
+def post(app, path, body, chunk_size=None):
+    """
+    Send a request straight through the ASGI interface, with a Content-Length or, given a
+    chunk size, as a chunked body without one; returns the status and how much body was read
+    """
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode("utf-8"))]
+    if chunk_size is None:
+        headers.append((b"content-length", str(len(body)).encode("utf-8")))
+        chunks = [body]
+    else:
+        chunks = [body[start:start + chunk_size] for start in range(0, len(body), chunk_size)]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode("utf-8"), "root_path": "",
+        "query_string": b"", "headers": headers, "client": ("test", 1), "server": ("test", 80),
+    }
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    sent, read = [], []
+
+    async def receive():
+        if messages:
+            message = messages.pop(0)
+            read.append(len(message["body"]))
+            return message
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    starts = [message for message in sent if message["type"] == "http.response.start"]
+    assert len(starts) == 1
+    return starts[0]["status"], sum(read)
+
+
+def test_declared_content_length_over_the_limit_is_rejected_unread():
+    received = []
+
+    status, read = post(upload_app(received), "/process-data/", multipart_body(4096))
+
+    assert status == 413
+    assert read == 0
+    assert received == []
+
+
+def test_chunked_body_is_cut_off_once_it_crosses_the_limit():
+    received = []
+    body = multipart_body(64 * 1024)
+
+    status, read = post(upload_app(received), "/process-data/", body, chunk_size=256)
+
+    assert status == 413
+    # Reading stops at the first chunk past the limit instead of draining the whole body
+    assert 1024 < read <= 1024 + 256
+    assert received == []
+
+
+def test_bodies_within_the_limit_or_outside_the_prefix_pass():
+    received = []
+    app = upload_app(received)
+
+    assert post(app, "/process-data/", multipart_body(512))[0] == 200
+    assert post(app, "/process-data/", multipart_body(512), chunk_size=128)[0] == 200
+    assert post(app, "/other/", multipart_body(4096), chunk_size=256)[0] == 200
+    assert received == [512, 512, 4096]
@@ -1 +1,22 @@
-VALID_FILE_TYPES = ['.csv', '.xlsx', '.xls']
\ No newline at end of file
+VALID_FILE_TYPES = ['.csv', '.csv.gz', '.csv.zst', '.csv.bz2', '.csv.xz', '.xlsx', '.xls', '.parquet', '.feather', '.arrow']
+
+# Columnar formats that are profiled from a memory-mapped file on disk
+COLUMNAR_FILE_TYPES = ['.parquet', '.feather', '.arrow']
+
+# Compressed CSV exports, decompressed while they are parsed; compound suffixes are matched whole
+COMPRESSED_CSV_FILE_TYPES = ['.csv.gz', '.csv.zst', '.csv.bz2', '.csv.xz']
+
+# Archives accepted by the batch endpoint; compound suffixes come first so they match whole
+ARCHIVE_FILE_TYPES = ['.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar', '.zip']
+
+# Telecom usage dimensions that get a dedicated distribution section in data summaries
+KNOWN_DIMENSIONS = ['imsi', 'subscriptionId', 'offerName', 'zone', 'requestType', 'mccmnc']
+
+# Dimensions aggregated into dimension cubes; per-subscriber identifiers would make a cube as large as the raw file
+CUBE_DIMENSIONS = ['offerName', 'zone', 'requestType', 'mccmnc']
+
+# Prefix of the per-dataset tables that uploads are bulk-loaded into; they are created at runtime, not by migrations
+DATASET_TABLE_PREFIX = 'datasetRows_'
+
+# Text search configuration of the crud example search vector; queries must use the same one to hit its index
+CRUD_EXAMPLE_SEARCH_CONFIG = 'english'
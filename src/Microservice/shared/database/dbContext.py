@@ -1,6 +1,12 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from shared.database.poolStatistics import PoolStatistics, instrumented_pool_class
 
 # Create base class for models
 Base = declarative_base()
@@ -8,8 +14,45 @@ Base = declarative_base()
 # Global variables that will be set by initialize_database() or use legacy defaults
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
 
-def initialize_database(database_url: str = None, echo: bool = True):
+# Each engine has its own pool, and its own counters
+pool_statistics = PoolStatistics("sync")
+async_pool_statistics = PoolStatistics("async")
+
+@dataclass
+class PoolOptions:
+    """
+    Connection pool and per-connection settings, applied to the sync and async engines alike
+    """
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = True
+    pool_recycle: int = -1
+    statement_timeout_ms: int = 0
+    lock_timeout_ms: int = 0
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_recycle": self.pool_recycle,
+        }
+
+    def server_settings(self) -> Dict[str, str]:
+        # Postgres session settings sent on connect; 0 leaves the server default
+        settings = {}
+        if self.statement_timeout_ms:
+            settings["statement_timeout"] = str(self.statement_timeout_ms)
+        if self.lock_timeout_ms:
+            settings["lock_timeout"] = str(self.lock_timeout_ms)
+        return settings
+
+def initialize_database(database_url: str = None, echo: bool = False, pool_options: PoolOptions = None):
     """
     Initialize the database with a specific DATABASE_URL
     This should be called by each service with their specific settings
@@ -19,7 +62,20 @@ def initialize_database(database_url: str = None, echo: bool = True):
     if database_url is None:
         raise ValueError("database_url is required and cannot be None")
     
-    engine = create_engine(database_url, echo=echo)
+    pool_options = pool_options or PoolOptions()
+    server_settings = pool_options.server_settings()
+    connect_args = {}
+    if server_settings:
+        # libpq takes session settings as -c options
+        connect_args["options"] = " ".join(f"-c {name}={value}" for name, value in server_settings.items())
+    engine = create_engine(
+        database_url,
+        echo=echo,
+        poolclass=instrumented_pool_class(QueuePool, pool_statistics),
+        connect_args=connect_args,
+        **pool_options.engine_kwargs(),
+    )
+    pool_statistics.attach(engine, pool_options.pool_size, pool_options.max_overflow, pool_options.pool_timeout)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
     return engine, SessionLocal
@@ -35,4 +91,63 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def to_async_database_url(database_url: str) -> str:
+    """
+    Swap a sync Postgres URL's driver for asyncpg, keeping credentials, host and database
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+def initialize_async_database(database_url: str = None, echo: bool = False, pool_options: PoolOptions = None):
+    """
+    Initialize the async engine and session factory next to the sync ones
+    Sync callers such as Alembic and worker threads keep using initialize_database()
+    """
+    global async_engine, AsyncSessionLocal
+
+    if database_url is None:
+        raise ValueError("database_url is required and cannot be None")
+
+    pool_options = pool_options or PoolOptions()
+    server_settings = pool_options.server_settings()
+    async_engine = create_async_engine(
+        to_async_database_url(database_url),
+        echo=echo,
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_statistics),
+        connect_args={"server_settings": server_settings} if server_settings else {},
+        **pool_options.engine_kwargs(),
+    )
+    async_pool_statistics.attach(
+        async_engine.sync_engine, pool_options.pool_size, pool_options.max_overflow, pool_options.pool_timeout)
+    # Objects stay readable after commit; lazy refreshes would need I/O outside an await
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    return async_engine, AsyncSessionLocal
+
+async def get_async_db():
+    """
+    Async database dependency for FastAPI
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database not initialized. Call initialize_async_database() first.")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_database():
+    """
+    Close the async engine's pooled connections on shutdown
+    """
+    if async_engine is not None:
+        await async_engine.dispose()
+
+def get_pool_statistics() -> List[Dict[str, Any]]:
+    """
+    Snapshot of every initialized engine's pool
+    """
+    return [statistics.snapshot() for statistics in (pool_statistics, async_pool_statistics) if statistics.engine is not None]
@@ -1,20 +1,97 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import BigInteger, Column, Computed, ForeignKey, Index, Integer, LargeBinary, String, Boolean, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from shared.database.dbContext import Base
+from shared.constants.constants import CRUD_EXAMPLE_SEARCH_CONFIG
 
 class CrudExample(Base):
     """
     CrudExample database model
     """
     __tablename__ = "crudExamples"
+    __table_args__ = (
+        # Keyset pages seek on (created_at, id) instead of scanning skipped rows
+        Index("ix_crudExamples_created_at_id", "created_at", "id"),
+        # Trigram indexes serve substring ILIKE searches; they need the pg_trgm extension
+        Index("ix_crudExamples_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_crudExamples_description_trgm", "description", postgresql_using="gin",
+              postgresql_ops={"description": "gin_trgm_ops"}),
+        Index("ix_crudExamples_search_vector", "search_vector", postgresql_using="gin"),
+        # Natural key of imported records that bulk upserts resolve conflicts on; NULLs never conflict
+        UniqueConstraint("externalId", name="uq_crudExamples_externalId"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     isActive = Column(Boolean, default=False, nullable=False)
     status = Column(Integer, default=0, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    externalId = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Maintained by Postgres; name words outrank description words in relevance searches
+    search_vector = Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('{CRUD_EXAMPLE_SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{CRUD_EXAMPLE_SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+        persisted=True))
     
     def __repr__(self):
-        return f"<CrudExample(id={self.id}, name='{self.name}')>"
\ No newline at end of file
+        return f"<CrudExample(id={self.id}, name='{self.name}')>"
+
+class DatasetProfile(Base):
+    """
+    Cumulative, mergeable profile of a named dataset that grows with each uploaded increment
+    """
+    __tablename__ = "datasetProfiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    options = Column(String, nullable=False)
+    profile = Column(LargeBinary, nullable=False)
+    total_records = Column(BigInteger, default=0, nullable=False)
+    upload_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DatasetProfile(id={self.id}, name='{self.name}')>"
+
+class DimensionCube(Base):
+    """
+    Named cube of record counts over the known telecom dimensions, grown upload by upload
+    """
+    __tablename__ = "dimensionCubes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    total_records = Column(BigInteger, default=0, nullable=False)
+    upload_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DimensionCube(id={self.id}, name='{self.name}')>"
+
+class DimensionCubeCell(Base):
+    """
+    Record count of one combination of dimension values in a cube; blank or absent values are stored as ''
+    """
+    __tablename__ = "dimensionCubeCells"
+    __table_args__ = (
+        UniqueConstraint("cube_id", "offerName", "zone", "requestType", "mccmnc", name="uq_dimensionCubeCells_cell"),
+        # Slices filtered on any dimension use an index; offerName is covered by the unique key's prefix
+        Index("ix_dimensionCubeCells_zone", "cube_id", "zone"),
+        Index("ix_dimensionCubeCells_requestType", "cube_id", "requestType"),
+        Index("ix_dimensionCubeCells_mccmnc", "cube_id", "mccmnc"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    cube_id = Column(Integer, ForeignKey("dimensionCubes.id", ondelete="CASCADE"), nullable=False)
+    offerName = Column(String, default="", nullable=False)
+    zone = Column(String, default="", nullable=False)
+    requestType = Column(String, default="", nullable=False)
+    mccmnc = Column(String, default="", nullable=False)
+    record_count = Column(BigInteger, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<DimensionCubeCell(cube_id={self.cube_id}, record_count={self.record_count})>"
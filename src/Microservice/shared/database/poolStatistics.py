@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+
+class PoolStatistics:
+    """
+    Live counters for one engine's connection pool
+    Checkout/checkin events measure how long connections are held; the pool's
+    connect() is timed to measure how long callers wait for one
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self.pool_size = 0
+        self.max_overflow = 0
+        self.timeout = 0.0
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.hold_seconds_total = 0.0
+            self.hold_seconds_max = 0.0
+            self.checkins = 0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+
+    def attach(self, engine: Engine, pool_size: int, max_overflow: int, timeout: float):
+        """
+        Start counting for an engine built with instrumented_pool_class(..., self)
+        """
+        self.engine = engine
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        # Listeners on the engine follow its pool when dispose() replaces it
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def record_wait(self, pool: Pool, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is None:
+            return
+        held = time.perf_counter() - checked_out_at
+        with self._lock:
+            self.checkins += 1
+            self.hold_seconds_total += held
+            self.hold_seconds_max = max(self.hold_seconds_max, held)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current pool occupancy plus the counters since start or the last reset
+        """
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "timeout_seconds": self.timeout,
+                "checked_out": pool.checkedout() if pool is not None else 0,
+                "checked_in": pool.checkedin() if pool is not None else 0,
+                # QueuePool counts overflow from -pool_size until the pool is full
+                "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": max(self.peak_overflow, 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_mean": round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "hold_ms_mean": round(self.hold_seconds_total / self.checkins * 1000, 3) if self.checkins else 0.0,
+                "hold_ms_max": round(self.hold_seconds_max * 1000, 3),
+            }
+
+
+def instrumented_pool_class(base: Type[Pool], statistics: PoolStatistics) -> Type[Pool]:
+    """
+    Subclass a pool class so every connect() is timed
+    Engines rebuild their pool from its class on dispose(), so the timing survives that
+    """
+    class InstrumentedPool(base):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except PoolTimeoutError:
+                statistics.record_wait(self, time.perf_counter() - started, timed_out=True)
+                raise
+            statistics.record_wait(self, time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool